@@ -1,5 +1,10 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class TasksConfig(AppConfig):
     name = 'tasks'
+
+    def ready(self):
+        from common.logger import configure_logging
+        configure_logging(settings.LOG_SETTINGS)
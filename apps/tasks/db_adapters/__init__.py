@@ -1,3 +1,11 @@
 from .task_db import TaskDB
 
-__all__ = ["TaskDB"]
\ No newline at end of file
+__all__ = ["TaskDB", "AsyncTaskDB"]
+
+
+def __getattr__(name):
+    # The asyncio adapter pulls in sqlalchemy.ext.asyncio; only import it once the ASGI path asks for it
+    if name == "AsyncTaskDB":
+        from .async_task_db import AsyncTaskDB
+        return AsyncTaskDB
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,127 @@
+from common.db_adapters.async_sql_db import AsyncSQLDB
+from .task_db import TaskDB, VERSION_COLUMNS
+from .tables import tasks_table
+
+
+class AsyncTaskDB(AsyncSQLDB):
+    # Same keyset orderings as the synchronous adapter, so cursors work on both request paths
+    ORDERINGS = TaskDB.ORDERINGS
+    SEARCH_COLUMNS = TaskDB.SEARCH_COLUMNS
+
+    def __init__(self):
+        super().__init__()
+        self.table_name = tasks_table.name
+
+    async def create_task(self, task_data):
+        """
+        Creates a new task in the database.
+
+        Parameters:
+            task_data (dict): A dictionary containing the task details such as title, description, etc.
+
+        Returns:
+            Row: The inserted task, including its ID and timestamps.
+        """
+        return await self.insert(self.table_name, task_data)
+
+    async def update_task(self, task_id, data, version=None, fetch=True):
+        """
+        Updates an existing task in the database by task ID and increments its version.
+
+        Parameters:
+            task_id (int): The ID of the task to be updated.
+            data (dict): A dictionary containing updated task details.
+            version (int, optional): Only update the task if it still has this version.
+            fetch (bool): Read the updated task back. Defaults to True.
+
+        Returns:
+            Row or bool: The updated task, or None if it does not exist or its version changed;
+                without fetch whether the task was updated.
+        """
+        where_clause = {'id': task_id, "deleted": False}
+        if version is not None:
+            where_clause["version"] = version
+        return await self.update(self.table_name, data, where_clause, increment=VERSION_COLUMNS, fetch=fetch)
+
+    async def delete_task(self, task_id):
+        """
+        Marks a task as deleted by task ID and increments its version.
+
+        Parameters:
+            task_id (int): The ID of the task to delete.
+
+        Returns:
+            bool: True if the task was marked as deleted.
+        """
+        where_clause = {'id': task_id, "deleted": False}
+        return await self.soft_delete(self.table_name, where_clause, increment=VERSION_COLUMNS)
+
+    async def get_task(self, task_id):
+        """
+        Retrieves a single task from the database by its ID.
+
+        Parameters:
+            task_id (int): The ID of the task to fetch.
+
+        Returns:
+            Row: The task, or None if it does not exist.
+        """
+        where_clause = {'id': task_id, "deleted": False}
+        return await self.fetch_one(self.table_name, where_clause)
+
+    async def get_task_version(self, task_id):
+        """
+        Retrieves only the ID, update time and version of a task, for answering conditional requests cheaply.
+
+        Parameters:
+            task_id (int): The ID of the task.
+
+        Returns:
+            Row: The id, updated_at and version of the task, or None if it does not exist.
+        """
+        where_clause = {'id': task_id, "deleted": False}
+        return await self.fetch_one(self.table_name, where_clause, columns=['id', 'updated_at', 'version'])
+
+    async def get_tasks(self, page=1, limit=10):
+        """
+        Retrieves a paginated list of tasks from the database.
+
+        Parameters:
+            page (int): The page number for pagination. Defaults to 1.
+            limit (int): The maximum number of tasks to retrieve per page. Defaults to 10.
+
+        Returns:
+            list: A list of tasks that are not marked as deleted.
+        """
+        where_clause = {"deleted": False}
+        return await self.fetch_all(self.table_name, where_clause, page=page, limit=limit, order_by=self.ORDERINGS["id"])
+
+    async def get_tasks_after(self, after=None, limit=10, ordering="id"):
+        """
+        Retrieves the tasks following a position in the given ordering (keyset pagination).
+
+        Parameters:
+            after (list): The ordering column values of the last task already seen, None for the first page.
+            limit (int): The maximum number of tasks to retrieve. Defaults to 10.
+            ordering (str): One of ORDERINGS. Defaults to "id".
+
+        Returns:
+            list: A list of tasks that are not marked as deleted.
+        """
+        where_clause = {"deleted": False}
+        return await self.fetch_keyset(self.table_name, where_clause, self.ORDERINGS[ordering], after=after, limit=limit)
+
+    async def search_tasks(self, query, after=None, limit=10):
+        """
+        Retrieves the tasks whose title or description match a search query, most relevant first.
+
+        Parameters:
+            query (str): The search query.
+            after (list): The relevance and ID of the last task already seen, None for the first page.
+            limit (int): The maximum number of tasks to retrieve. Defaults to 10.
+
+        Returns:
+            list: Matching tasks that are not marked as deleted, each with its relevance.
+        """
+        where_clause = {"deleted": False}
+        return await self.fetch_search(self.table_name, where_clause, self.SEARCH_COLUMNS, query, after=after, limit=limit)
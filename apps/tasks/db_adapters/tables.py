@@ -0,0 +1,33 @@
+from sqlalchemy import Table, Column, Integer, String, Text, DateTime, Boolean, func
+
+from common.db_adapters.statement_cache import statement_cache
+
+# Declared mirror of migrations/tasks/0000_create_tasks_table.*.sql and the later versioned migrations.
+# The DB adapters build their statements from it and reject identifiers that are not listed here.
+tasks_table = Table(
+    "tasks",
+    statement_cache.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("title", String(255), nullable=False),
+    Column("description", Text),
+    Column("created_at", DateTime, server_default=func.current_timestamp()),
+    Column("updated_at", DateTime, server_default=func.current_timestamp()),
+    Column("deleted", Boolean, server_default="0"),
+    # Incremented by every update, see migrations/tasks/0004_add_tasks_version.sql
+    Column("version", Integer, nullable=False, server_default="1"),
+)
+
+# Soft-deleted tasks moved out of the hot tasks table by TaskDB.archive_deleted_tasks,
+# see migrations/tasks/0003_create_tasks_archive_table.sql
+tasks_archive_table = Table(
+    "tasks_archive",
+    statement_cache.metadata,
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("title", String(255), nullable=False),
+    Column("description", Text),
+    Column("created_at", DateTime),
+    Column("updated_at", DateTime),
+    Column("deleted", Boolean),
+    Column("version", Integer, nullable=False, server_default="1"),
+    Column("archived_at", DateTime, server_default=func.current_timestamp()),
+)
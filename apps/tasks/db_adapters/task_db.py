@@ -1,10 +1,41 @@
 from common.db_adapters.sql_db import SQLDB
+from .tables import tasks_table, tasks_archive_table
+
+# Columns incremented by every update of a task
+VERSION_COLUMNS = ("version",)
 
 
 class TaskDB(SQLDB):
+    # Keyset orderings available for cursor pagination, each ending in the unique id column
+    ORDERINGS = {
+        "id": [("id", False)],
+        "-id": [("id", True)],
+        "created_at": [("created_at", False), ("id", False)],
+        "-created_at": [("created_at", True), ("id", True)],
+    }
+
+    # Order of the change feed: every write sets updated_at, the id breaks ties between equal times
+    CHANGES_ORDERING = [("updated_at", False), ("id", False)]
+
+    # Columns covered by the FULLTEXT index searched by search_tasks
+    SEARCH_COLUMNS = ["title", "description"]
+
     def __init__(self):
         super().__init__()
-        self.table_name = "tasks"
+        self.table_name = tasks_table.name
+        self.archive_table_name = tasks_archive_table.name
+
+    def cursor_types(self, order_by):
+        """
+        Returns the Python types of the values a cursor in the given ordering holds.
+
+        Args:
+            order_by (list): (column, descending) pairs of the ordering; "relevance" is the score of a search.
+
+        Returns:
+            list: The type of every ordering column, e.g. [datetime, int].
+        """
+        return [float if column == "relevance" else tasks_table.c[column].type.python_type for column, _ in order_by]
 
     def create_task(self, task_data):
         """
@@ -21,38 +52,40 @@ class TaskDB(SQLDB):
         """
         return self.insert(self.table_name, task_data)
 
-    def update_task(self, task_id, data):
+    def update_task(self, task_id, data, version=None, fetch=True):
         """
-        Updates an existing task in the database by task ID.
+        Updates an existing task in the database by task ID and increments its version.
 
         Parameters:
             task_id (int): The ID of the task to be updated.
             data (dict): A dictionary containing updated task details.
+            version (int, optional): Only update the task if it still has this version.
+            fetch (bool): Read the updated task back. Defaults to True.
 
         Returns:
-            int: The number of rows affected by the update operation.
-
-        Raises:
-            Exception: Raises an exception if the task ID does not exist or the update fails.
+            Row or bool: The updated task, or None if it does not exist or its version changed;
+                without fetch whether the task was updated.
         """
         where_clause = {'id': task_id, "deleted": False}
-        return self.update(self.table_name, data, where_clause)
+        if version is not None:
+            where_clause["version"] = version
+        return self.update(self.table_name, data, where_clause, increment=VERSION_COLUMNS, fetch=fetch)
 
     def delete_task(self, task_id):
         """
-        Marks a task as deleted in the database by task ID.
+        Marks a task as deleted in the database by task ID and increments its version.
 
         Parameters:
             task_id (int): The ID of the task to delete.
 
         Returns:
-            int: The number of rows affected by the delete operation.
+            bool: True if the task was marked as deleted.
 
         Raises:
             Exception: Raises an exception if the task ID does not exist or deletion fails.
         """
         where_clause = {'id': task_id, "deleted": False}
-        return self.delete(self.table_name, where_clause)
+        return self.soft_delete(self.table_name, where_clause, increment=VERSION_COLUMNS)
 
     def get_task(self, task_id):
         """
@@ -70,6 +103,19 @@ class TaskDB(SQLDB):
         where_clause = {'id': task_id, "deleted": False}
         return self.fetch_one(self.table_name, where_clause)
 
+    def get_task_version(self, task_id):
+        """
+        Retrieves only the ID, update time and version of a task, for answering conditional requests cheaply.
+
+        Parameters:
+            task_id (int): The ID of the task.
+
+        Returns:
+            Row: The id, updated_at and version of the task, or None if it does not exist.
+        """
+        where_clause = {'id': task_id, "deleted": False}
+        return self.fetch_one(self.table_name, where_clause, columns=['id', 'updated_at', 'version'])
+
     def get_tasks(self, page=1, limit=10):
         """
         Retrieves a paginated list of tasks from the database.
@@ -85,4 +131,136 @@ class TaskDB(SQLDB):
             Exception: Raises an exception if the task retrieval fails due to operational errors.
         """
         where_clause = {"deleted": False}
-        return self.fetch_all(self.table_name, where_clause, page=page, limit=limit)
+        return self.fetch_all(self.table_name, where_clause, page=page, limit=limit, order_by=self.ORDERINGS["id"])
+
+    def get_tasks_after(self, after=None, limit=10, ordering="id"):
+        """
+        Retrieves the tasks following a position in the given ordering (keyset pagination).
+
+        Parameters:
+            after (list): The ordering column values of the last task already seen, None for the first page.
+            limit (int): The maximum number of tasks to retrieve. Defaults to 10.
+            ordering (str): One of ORDERINGS. Defaults to "id".
+
+        Returns:
+            list: A list of tasks that are not marked as deleted.
+
+        Raises:
+            Exception: Raises an exception if the task retrieval fails due to operational errors.
+        """
+        where_clause = {"deleted": False}
+        return self.fetch_keyset(self.table_name, where_clause, self.ORDERINGS[ordering], after=after, limit=limit)
+
+    def search_tasks(self, query, after=None, limit=10):
+        """
+        Retrieves the tasks whose title or description match a search query, most relevant first.
+
+        Parameters:
+            query (str): The search query.
+            after (list): The relevance and ID of the last task already seen, None for the first page.
+            limit (int): The maximum number of tasks to retrieve. Defaults to 10.
+
+        Returns:
+            list: Matching tasks that are not marked as deleted, each with its relevance.
+        """
+        where_clause = {"deleted": False}
+        return self.fetch_search(self.table_name, where_clause, self.SEARCH_COLUMNS, query, after=after, limit=limit)
+
+    def get_task_changes(self, after=None, until=None, limit=100):
+        """
+        Retrieves the tasks created, updated or deleted after a position of the change feed.
+
+        Parameters:
+            after (list): The updated_at and ID of the last change already seen, None to start from the beginning.
+            until (datetime): Only changes made before this time are retrieved.
+            limit (int): The maximum number of tasks to retrieve. Defaults to 100.
+
+        Returns:
+            list: The changed tasks in CHANGES_ORDERING, including the ones marked as deleted.
+        """
+        return self.fetch_keyset(self.table_name, {}, self.CHANGES_ORDERING, after=after, limit=limit, until=until)
+
+    def get_tasks_by_ids(self, task_ids):
+        """
+        Retrieves the tasks with the given IDs in a single query.
+
+        Parameters:
+            task_ids (list): The IDs of the tasks to fetch.
+
+        Returns:
+            list: The tasks that exist and are not marked as deleted, ordered by ID.
+        """
+        return self.fetch_in(self.table_name, 'id', task_ids, {"deleted": False})
+
+    def create_tasks(self, tasks_data):
+        """
+        Creates many tasks with multi-row inserts in one transaction.
+
+        Parameters:
+            tasks_data (list): Dictionaries containing the task details.
+
+        Returns:
+            list: The inserted tasks, including their IDs and timestamps.
+
+        Raises:
+            Exception: Raises an exception if the task creation fails due to operational errors.
+        """
+        return self.bulk_insert(self.table_name, tasks_data)
+
+    def update_tasks(self, tasks_data):
+        """
+        Updates many tasks in one transaction.
+
+        Parameters:
+            tasks_data (list): Dictionaries containing the task ID and the fields to update.
+
+        Returns:
+            list: The updated tasks; IDs that do not exist or are deleted are missing.
+
+        Raises:
+            Exception: Raises an exception if the update fails due to operational errors.
+        """
+        return self.bulk_update(self.table_name, tasks_data, {"deleted": False}, increment=VERSION_COLUMNS)
+
+    def delete_tasks(self, task_ids):
+        """
+        Marks many tasks as deleted by ID in a single statement and increments their versions.
+
+        Parameters:
+            task_ids (list): The IDs of the tasks to delete.
+
+        Returns:
+            list: The IDs of the tasks this call marked as deleted; IDs that do not exist or were already
+                deleted are missing.
+
+        Raises:
+            Exception: Raises an exception if the deletion fails due to operational errors.
+        """
+        return self.soft_delete_in(self.table_name, 'id', task_ids, {"deleted": False}, increment=VERSION_COLUMNS)
+
+    def stream_tasks(self, chunk_size=1000):
+        """
+        Streams all tasks ordered by ID in chunks, through a server-side cursor.
+
+        Parameters:
+            chunk_size (int): The number of tasks per chunk. Defaults to 1000.
+
+        Returns:
+            generator: Yields lists of tasks that are not marked as deleted.
+        """
+        where_clause = {"deleted": False}
+        return self.stream_all(self.table_name, where_clause, order_by=self.ORDERINGS["id"], chunk_size=chunk_size)
+
+    def archive_deleted_tasks(self, before, batch_size=500):
+        """
+        Moves one batch of tasks deleted before the given time into the tasks_archive table.
+
+        Parameters:
+            before (datetime): Only tasks deleted (last updated) before this time are moved.
+            batch_size (int): The maximum number of tasks to move. Defaults to 500.
+
+        Returns:
+            int: The number of archived tasks; fewer than batch_size once none are left.
+        """
+        where_clause = {"deleted": True}
+        return self.archive_batch(self.table_name, self.archive_table_name, where_clause, before, batch_size)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from common.db_adapters.sql_db import SQLDB
+from migrations.migrator import Migrator, MigrationError
+
+
+class Command(BaseCommand):
+    help = "Applies the pending versioned SQL migrations under migrations/ and records them in schema_version."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--list", action="store_true", help="Only list the pending migrations.")
+
+    def handle(self, *args, **options):
+        migrator = Migrator(SQLDB().engine)
+        try:
+            if options["list"]:
+                for migration in migrator.pending():
+                    self.stdout.write(str(migration))
+                return
+            applied = migrator.migrate()
+        except MigrationError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f"Applied {len(applied)} migration(s)."))
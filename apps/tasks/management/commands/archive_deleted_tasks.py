@@ -0,0 +1,39 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.db_adapters import TaskDB
+
+
+class Command(BaseCommand):
+    help = ("Moves tasks soft-deleted more than --days ago from the tasks table into tasks_archive, in "
+            "bounded batches with a pause in between. Meant to run periodically, e.g. from cron.")
+
+    def add_arguments(self, parser):
+        archive = settings.TASKS_ARCHIVE
+        parser.add_argument("--days", type=int, default=archive['AFTER_DAYS'],
+                            help="Archive tasks deleted more than this many days ago.")
+        parser.add_argument("--batch-size", type=int, default=archive['BATCH_SIZE'],
+                            help="Tasks moved per transaction.")
+        parser.add_argument("--sleep", type=float, default=archive['SLEEP'],
+                            help="Seconds to pause between batches.")
+        parser.add_argument("--max-batches", type=int, default=None,
+                            help="Stop after this many batches, e.g. to bound a run to a maintenance window.")
+
+    def handle(self, *args, **options):
+        task_db = TaskDB()
+        # fixed for the whole run, so that tasks deleted while it runs do not keep it going
+        before = datetime.now(timezone.utc) - timedelta(days=options["days"])
+        archived = batches = 0
+        while options["max_batches"] is None or batches < options["max_batches"]:
+            moved = task_db.archive_deleted_tasks(before, batch_size=options["batch_size"])
+            archived += moved
+            batches += 1
+            if moved < options["batch_size"]:
+                break
+            time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {archived} task(s) deleted before {before:%Y-%m-%d %H:%M} in {batches} batch(es)."
+        ))
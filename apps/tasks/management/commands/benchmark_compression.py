@@ -0,0 +1,88 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from common.compression import CODECS, DEFAULT_LEVELS
+from common.renderers import UJSONRenderer
+
+# Levels measured per encoding, from the fastest to the densest
+LEVELS = {
+    "gzip": [1, 4, 6, 9],
+    "br": [1, 4, 5, 6, 9, 11],
+    "zstd": [1, 3, 6, 9, 12, 19],
+}
+
+# Vocabulary of the generated task descriptions
+WORDS = (
+    "deploy review release fix bug customer report update migrate database index query cache page "
+    "api client mobile sync retry timeout server config test build pipeline docs design meeting "
+    "follow up with the team before friday check logs and metrics for the new endpoint"
+).split()
+
+
+def task_page(count, description_words, seed=0):
+    """Returns the JSON body of a page of generated tasks, as GET /api/tasks/ renders it."""
+    rng = random.Random(seed)
+    created_at = datetime(2024, 1, 1)
+    tasks = []
+    for task_id in range(1, count + 1):
+        created_at += timedelta(minutes=rng.randint(1, 600))
+        tasks.append({
+            "id": task_id,
+            "title": " ".join(rng.choices(WORDS, k=rng.randint(3, 8))).capitalize(),
+            "description": " ".join(rng.choices(WORDS, k=rng.randint(description_words // 2, description_words))),
+            "deleted": False,
+            "created_at": created_at.isoformat(),
+            "updated_at": (created_at + timedelta(hours=rng.randint(0, 48))).isoformat(),
+            "version": rng.randint(1, 5),
+        })
+    return UJSONRenderer().render({"data": tasks})
+
+
+class Command(BaseCommand):
+    help = ("Compares the CPU time and the bytes saved of every installed response encoding at "
+            "different levels, on generated pages of tasks.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limits", default="10,100,1000", help="Comma separated page sizes to measure.")
+        parser.add_argument("--description-words", type=int, default=60,
+                            help="Maximum number of words of a generated task description.")
+        parser.add_argument("--duration", type=float, default=0.2,
+                            help="Seconds spent compressing each page per encoding and level.")
+
+    def handle(self, *args, **options):
+        try:
+            limits = [int(limit) for limit in options["limits"].split(",")]
+        except ValueError:
+            raise CommandError("--limits must be a comma separated list of integers")
+
+        for limit in limits:
+            body = task_page(limit, options["description_words"])
+            self.stdout.write(f"\nPage of {limit} tasks: {len(body)} bytes")
+            self.stdout.write(f"{'encoding':<9}{'level':>6}{'bytes':>10}{'saved':>8}{'us/page':>10}{'MB/s':>9}")
+            for name, (codec_class, available) in CODECS.items():
+                if not available:
+                    self.stdout.write(f"{name:<9} not installed")
+                    continue
+                for level in LEVELS[name]:
+                    codec = codec_class(level)
+                    size, seconds = self.measure(codec, body, options["duration"])
+                    marker = " (default)" if level == DEFAULT_LEVELS[name] else ""
+                    self.stdout.write(
+                        f"{name:<9}{level:>6}{size:>10}{1 - size / len(body):>8.1%}"
+                        f"{seconds * 1e6:>10.1f}{len(body) / seconds / 1e6:>9.1f}{marker}"
+                    )
+
+    def measure(self, codec, body, duration):
+        """Compresses the body repeatedly for about duration seconds; returns its size and the seconds per run."""
+        size = len(codec.compress(body))
+        runs = 0
+        started_at = time.perf_counter()
+        while True:
+            codec.compress(body)
+            runs += 1
+            elapsed = time.perf_counter() - started_at
+            if elapsed >= duration:
+                return size, elapsed / runs
@@ -0,0 +1,89 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import path
+from loguru import logger
+
+# Imported by a fresh interpreter to measure the boot of a uWSGI worker
+BOOT_SCRIPT = "import server.uwsgi.wsgi"
+
+
+def empty_view(request):
+    return HttpResponse(b"{}", content_type="application/json")
+
+
+class BenchmarkURLConf:
+    """URLconf with a single view that does no work, so that only the request handling is measured."""
+    urlpatterns = [path("benchmark/", empty_view)]
+
+
+class Command(BaseCommand):
+    help = ("Measures the boot time of a worker and the per-request overhead of the middleware chain "
+            "for the active settings; run it with app_env=PROD to measure the production settings.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--boots", type=int, default=5, help="Number of worker boots to time.")
+        parser.add_argument("--requests", type=int, default=2000, help="Number of requests to time.")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Settings: app_env={os.environ.get('app_env', 'DEV')}, "
+                          f"{len(settings.INSTALLED_APPS)} installed apps, {len(settings.MIDDLEWARE)} middlewares")
+
+        boots = self.time_boots(options["boots"])
+        self.stdout.write(f"Worker boot: median {statistics.median(boots) * 1000:.1f} ms, "
+                          f"min {min(boots) * 1000:.1f} ms over {len(boots)} runs")
+
+        overhead = self.time_requests(options["requests"])
+        self.stdout.write(f"Request handling overhead: {overhead * 1e6:.1f} us per request "
+                          f"over {options['requests']} requests (log output disabled)")
+
+    def time_boots(self, runs):
+        """Times fresh interpreters loading the WSGI application, as uWSGI does for every new worker."""
+        durations = []
+        for _ in range(runs):
+            started_at = time.perf_counter()
+            subprocess.run([sys.executable, "-c", BOOT_SCRIPT], cwd=settings.BASE_DIR, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            durations.append(time.perf_counter() - started_at)
+        return durations
+
+    def time_requests(self, count):
+        """
+        Times requests to a view that does no work through the full handler (URL resolution and
+        the configured MIDDLEWARE) and subtracts the time of calling the view directly.
+        """
+        handler = BaseHandler()
+        handler.load_middleware()
+        factory = RequestFactory()
+
+        def build_requests():
+            requests = [factory.get("/benchmark/") for _ in range(count)]
+            for request in requests:
+                request.urlconf = BenchmarkURLConf
+            return requests
+
+        handler.get_response(build_requests()[0])  # warm up the resolver and lazy imports
+        logger.disable("")
+        try:
+            requests = build_requests()
+            started_at = time.perf_counter()
+            for request in requests:
+                handler.get_response(request)
+            handled = time.perf_counter() - started_at
+
+            requests = build_requests()
+            started_at = time.perf_counter()
+            for request in requests:
+                empty_view(request)
+            direct = time.perf_counter() - started_at
+        finally:
+            logger.enable("")
+        return (handled - direct) / count
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from common.db_adapters.sql_db import SQLDB
+from migrations.query_plans import check_query_plans
+
+# The hot queries issued by TaskDB, written out as plain SQL with the same WHERE and ORDER BY as SQLDB generates
+HOT_QUERIES = {
+    "get_task": (
+        "SELECT * FROM tasks WHERE id = :id AND deleted = :deleted",
+        {"id": 1, "deleted": False},
+    ),
+    "get_tasks": (
+        "SELECT * FROM tasks WHERE deleted = :deleted ORDER BY id ASC LIMIT 10 OFFSET 0",
+        {"deleted": False},
+    ),
+    "get_tasks_after_id": (
+        "SELECT * FROM tasks WHERE deleted = :deleted AND ((id > :after_id)) ORDER BY id ASC LIMIT :limit",
+        {"deleted": False, "after_id": 1, "limit": 11},
+    ),
+    "get_tasks_after_created_at": (
+        "SELECT * FROM tasks WHERE deleted = :deleted AND ((created_at < :after_created_at) OR "
+        "(created_at = :after_created_at AND id < :after_id)) ORDER BY created_at DESC, id DESC LIMIT :limit",
+        {"deleted": False, "after_created_at": "2024-01-01 00:00:00", "after_id": 1, "limit": 11},
+    ),
+    "get_task_changes": (
+        "SELECT * FROM tasks WHERE updated_at < :until AND ((updated_at > :after_updated_at) OR "
+        "(updated_at = :after_updated_at AND id > :after_id)) ORDER BY updated_at ASC, id ASC LIMIT :limit",
+        {"until": "2024-01-02 00:00:00", "after_updated_at": "2024-01-01 00:00:00", "after_id": 1, "limit": 101},
+    ),
+}
+
+
+class Command(BaseCommand):
+    help = "Runs EXPLAIN on the hot task queries and fails if any of them is not served by an index."
+
+    def handle(self, *args, **options):
+        failures = check_query_plans(SQLDB().engine, HOT_QUERIES)
+        if failures:
+            for name, plan in failures.items():
+                self.stderr.write(f"{name} does not use an index: {plan}")
+            raise CommandError(f"{len(failures)} hot query(s) without an index.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(HOT_QUERIES)} hot queries use an index."))
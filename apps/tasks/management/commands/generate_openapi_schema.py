@@ -0,0 +1,34 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ("Generates the OpenAPI schema of the API views once and writes swagger.json and swagger.yaml "
+            "to OPENAPI_SCHEMA['DIR'], from where /swagger.json/ serves it. Run it whenever the views change.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--check", action="store_true",
+                            help="Only fail if the written schema files differ from the views.")
+
+    def handle(self, *args, **options):
+        from swagger import render_schema_files, write_schema_files
+
+        if not options["check"]:
+            for path in write_schema_files():
+                self.stdout.write(f"Wrote {path}")
+            return
+
+        stale = []
+        for file_format, content in render_schema_files().items():
+            path = os.path.join(settings.OPENAPI_SCHEMA['DIR'], f"swagger.{file_format}")
+            if not os.path.exists(path):
+                stale.append(path)
+                continue
+            with open(path, "rb") as schema_file:
+                if schema_file.read() != content:
+                    stale.append(path)
+        if stale:
+            raise CommandError(f"Outdated OpenAPI schema: {', '.join(stale)}; run manage.py generate_openapi_schema.")
+        self.stdout.write(self.style.SUCCESS("The OpenAPI schema files are up to date."))
@@ -0,0 +1,129 @@
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import path
+from loguru import logger
+
+# Share of the requests that read a single task; the others list tasks
+READ_SHARE = 0.8
+
+
+class LoadTestDatabase:
+    """Stands in for the database: a fixed number of connections, each serving one query at a time."""
+
+    def __init__(self, connections, read_ms, list_ms):
+        self.connections = threading.BoundedSemaphore(connections)
+        self.read_seconds = read_ms / 1000
+        self.list_seconds = list_ms / 1000
+
+    def query(self, seconds):
+        with self.connections:
+            time.sleep(seconds)
+
+
+class LoadTestURLConf:
+    """URLconf with the routes of the tasks API, served by views that only run a query of a fixed duration."""
+    database = None
+
+    def get_task(request, task_id):
+        LoadTestURLConf.database.query(LoadTestURLConf.database.read_seconds)
+        return HttpResponse(b"{}", content_type="application/json")
+
+    def get_tasks(request):
+        LoadTestURLConf.database.query(LoadTestURLConf.database.list_seconds)
+        return HttpResponse(b"{}", content_type="application/json")
+
+    urlpatterns = [path("api/tasks/<int:task_id>/", get_task), path("api/tasks/", get_tasks)]
+
+
+class Command(BaseCommand):
+    help = ("Offers a worker more requests than it can serve, with and without admission control, and "
+            "reports the goodput: the requests answered successfully before the client timed out.")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--overload", type=float, default=3.0, help="Offered load as a multiple of the capacity.")
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load per scenario.")
+        parser.add_argument("--connections", type=int, default=4, help="Queries the database serves at once.")
+        parser.add_argument("--threads", type=int, default=64, help="Requests the worker handles at once.")
+        parser.add_argument("--read-ms", type=float, default=5.0, help="Query time of a single task read.")
+        parser.add_argument("--list-ms", type=float, default=50.0, help="Query time of a task list.")
+        parser.add_argument("--client-timeout", type=float, default=3.0, help="Seconds after which clients give up.")
+
+    def handle(self, *args, **options):
+        database = LoadTestURLConf.database = LoadTestDatabase(
+            options["connections"], options["read_ms"], options["list_ms"]
+        )
+        mean_seconds = READ_SHARE * database.read_seconds + (1 - READ_SHARE) * database.list_seconds
+        capacity = options["connections"] / mean_seconds
+        self.stdout.write(f"Capacity: {capacity:.0f} requests/s ({options['connections']} connections, "
+                          f"{READ_SHARE:.0%} reads of {options['read_ms']:g} ms, lists of {options['list_ms']:g} ms), "
+                          f"client timeout {options['client_timeout']:g} s")
+
+        scenarios = [(1.0, True), (options["overload"], False), (options["overload"], True)]
+        logger.disable("")
+        try:
+            for load, admission in scenarios:
+                results = self.run_scenario(load * capacity, admission, options)
+                self.report(load, admission, results, options)
+        finally:
+            logger.enable("")
+
+    def run_scenario(self, rate, admission, options):
+        """
+        Sends requests at the given rate (Poisson arrivals) to a handler with the configured MIDDLEWARE for
+        the duration. Requests wait for a free thread as in the listen backlog, and carry their arrival time
+        in X-Request-Start as a proxy would set it.
+
+        Returns:
+            list: (kind, status, seconds from arrival to response) of every request, None for the status
+                of the requests still queued when the load stops.
+        """
+        config = {**settings.ADMISSION_CONTROL, 'ENABLED': admission, 'PARALLELISM': options["connections"]}
+        with override_settings(ADMISSION_CONTROL=config):
+            handler = BaseHandler()
+            handler.load_middleware()
+        factory = RequestFactory()
+        rng = random.Random(0)
+        results = []
+
+        def send(kind, request, arrived_at):
+            response = handler.get_response(request)
+            results.append((kind, response.status_code, time.time() - arrived_at))
+
+        pool = ThreadPoolExecutor(max_workers=options["threads"])
+        started_at = next_at = time.time()
+        while next_at < started_at + options["duration"]:
+            time.sleep(max(next_at - time.time(), 0))
+            kind = "read" if rng.random() < READ_SHARE else "list"
+            request = factory.get(f"/api/tasks/{rng.randint(1, 1000)}/" if kind == "read" else "/api/tasks/",
+                                  HTTP_X_REQUEST_START=f"t={next_at:.6f}")
+            request.urlconf = LoadTestURLConf
+            pool.submit(send, kind, request, next_at)
+            next_at += rng.expovariate(rate)
+        # Clients of the requests still in the backlog have given up by now
+        pool.shutdown(wait=True, cancel_futures=True)
+        sent = int(rate * options["duration"])
+        return results + [(None, None, None)] * max(sent - len(results), 0)
+
+    def report(self, load, admission, results, options):
+        timeout, duration = options["client_timeout"], options["duration"]
+        good = [(kind, seconds) for kind, status, seconds in results if status == 200 and seconds <= timeout]
+        rejected = sum(1 for _, status, _ in results if status == 503)
+        latencies = sorted(seconds for _, seconds in good)
+        reads = sum(1 for kind, _ in good if kind == "read")
+        p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0
+        self.stdout.write(
+            f"{load:.1f}x load, admission control {'on ' if admission else 'off'}: "
+            f"offered {len(results) / duration:.0f}/s, goodput {len(good) / duration:.0f}/s "
+            f"({reads / duration:.0f} reads, {(len(good) - reads) / duration:.0f} lists), "
+            f"rejected {rejected / max(len(results), 1):.0%}, "
+            f"latency p50 {statistics.median(latencies) * 1000 if latencies else 0:.0f} ms p99 {p99 * 1000:.0f} ms"
+        )
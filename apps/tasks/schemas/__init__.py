@@ -1,5 +1,9 @@
-from .task_schema import TaskSchema
+from .task_schema import TaskSchema, TaskPatchSchema, TaskBulkPatchSchema, TaskBulkDeleteSchema, READ_ONLY_FIELDS
 
 __all__ = [
     "TaskSchema",
+    "TaskPatchSchema",
+    "TaskBulkPatchSchema",
+    "TaskBulkDeleteSchema",
+    "READ_ONLY_FIELDS",
 ]
\ No newline at end of file
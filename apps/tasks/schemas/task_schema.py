@@ -1,8 +1,12 @@
-from pydantic import BaseModel, Field, validator, ValidationError
+from pydantic import BaseModel, Field, conlist, validator, ValidationError
 from datetime import datetime
 from typing import Optional
 from loguru import logger
 
+# Fields set by the database that clients cannot write
+READ_ONLY_FIELDS = {"version"}
+
+
 class TaskSchema(BaseModel):
     id: Optional[int] = None
     title: str = Field(..., max_length=255)
@@ -10,6 +14,8 @@ class TaskSchema(BaseModel):
     deleted: bool = False
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set by the database and incremented by every update; clients send it back in If-Match
+    version: int = 1
 
     class Config:
         orm_mode = True
@@ -45,4 +51,23 @@ class TaskSchema(BaseModel):
         return value
 
 
+class TaskPatchSchema(TaskSchema):
+    """
+    Partial task update: every field is optional, the title rules of TaskSchema still apply
+    to a title that is sent.
+    """
+    title: Optional[str] = Field(None, max_length=255)
+
+
+class TaskBulkPatchSchema(TaskPatchSchema):
+    """
+    One item of a bulk partial update, identified by its task ID.
+    """
+    id: int
+
 
+class TaskBulkDeleteSchema(BaseModel):
+    """
+    Body of a bulk delete: the IDs of the tasks to delete.
+    """
+    ids: conlist(int, min_items=1)
@@ -14,10 +14,17 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.urls import path
-from .views import TaskView
+from .views import TaskView, AsyncTaskView, TaskBulkView, TaskExportView, TaskChangesView
+
+# The CRUD routes are served by the asyncio views when deployed behind an ASGI server
+task_view = AsyncTaskView.as_view() if settings.ASYNC_API else TaskView.as_view()
 
 urlpatterns = [
-    path('tasks/', TaskView.as_view()),
-    path('tasks/<int:task_id>/', TaskView.as_view()),
+    path('tasks/', task_view),
+    path('tasks/bulk/', TaskBulkView.as_view()),
+    path('tasks/export/', TaskExportView.as_view()),
+    path('tasks/changes/', TaskChangesView.as_view()),
+    path('tasks/<int:task_id>/', task_view),
 ]
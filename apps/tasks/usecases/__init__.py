@@ -1,5 +1,6 @@
-from .task_usecase import TaskUsecase
+from .task_usecase import TaskUsecase, task_events
 
 __all__ = [
     "TaskUsecase",
+    "task_events",
 ]
\ No newline at end of file
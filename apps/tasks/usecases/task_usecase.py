@@ -1,30 +1,252 @@
+import csv
+import io
+from datetime import datetime, timedelta, timezone
+
+import ujson
+from django.conf import settings
 from loguru import logger
 
+from common.cache import build_cache, SingleFlight
+from common.events import build_broker
+from common.db_adapters.sql_db import on_commit, SEARCH_ORDER_BY
+from common.serializers import RowSerializer
+from common.utils import encode_cursor, decode_cursor, check_cursor_values, InvalidCursorError, compute_etag, to_timestamp, version_etag
 from ..db_adapters import TaskDB
 from ..schemas import TaskSchema
 
+# Read-through cache of serialized tasks keyed by ID, shared by all requests of the worker
+task_cache = build_cache(settings.TASKS_CACHE, name="tasks")
+
+# Concurrent identical reads of the worker share one DB call, across threads and coroutines:
+# single task reads by ID, list reads by page or cursor
+task_reads = SingleFlight(name="task_reads")
+task_page_reads = SingleFlight(name="task_page_reads")
+
+# Task change events pushed to the Server-Sent Events streams of the ASGI entry point (server/asgi.py)
+task_events = build_broker(settings.TASKS_EVENTS)
+
+TASK_CREATED = "task.created"
+TASK_UPDATED = "task.updated"
+TASK_DELETED = "task.deleted"
+
+# Output path for task rows read from the DB; request data is validated with TaskSchema instead
+task_serializer = RowSerializer(TaskSchema)
+
+
+# Name of the ordering recorded in search cursors
+SEARCH_ORDERING = "relevance"
+
+# Name of the ordering recorded in change feed cursors
+CHANGES_ORDERING = "changes"
+
+
+def task_cache_key(task_id):
+    return f"task:{task_id}"
+
+
+def page_key(after, limit, ordering):
+    """Key of a keyset page read in task_page_reads."""
+    return ("after", ordering, tuple(after or ()), limit)
+
+
+def change_entry(task_dict):
+    """A change feed entry: the task, or a tombstone with only its ID and deletion time if it was deleted."""
+    if task_dict["deleted"]:
+        return {"id": task_dict["id"], "deleted": True, "updated_at": task_dict["updated_at"]}
+    return task_dict
+
+
 class TaskUsecase():
     def __init__(self):
         self.task_db = TaskDB()
-        logger.info("TaskUsecase initialized.")
+        self._async_task_db = None
+        self.task_cache = task_cache
+        self.task_reads = task_reads
+        self.task_page_reads = task_page_reads
+        self.task_events = task_events
+        logger.debug("TaskUsecase initialized.")
+
+    @property
+    def async_task_db(self):
+        """The asyncio adapter of the ASGI request path, created on first use."""
+        if self._async_task_db is None:
+            from ..db_adapters import AsyncTaskDB
+            self._async_task_db = AsyncTaskDB()
+        return self._async_task_db
+
+    def write_tasks(self, tasks_list):
+        """Write the given serialized tasks to the cache."""
+        for task_dict in tasks_list:
+            self.task_cache.set(task_cache_key(task_dict["id"]), task_dict)
+        self.forget_reads([task_dict["id"] for task_dict in tasks_list])
+
+    def drop_tasks(self, task_ids):
+        """Drop the given tasks from the cache."""
+        for task_id in task_ids:
+            self.task_cache.delete(task_cache_key(task_id))
+        self.forget_reads(task_ids)
+
+    def forget_reads(self, task_ids):
+        """Keep reads starting after a write from sharing the result of a read made before it."""
+        for task_id in task_ids:
+            self.task_reads.forget(task_id)
+        self.task_page_reads.forget()
+
+    def cache_tasks(self, tasks_list):
+        """Write the given serialized tasks through to the cache once the transaction has committed."""
+        on_commit(lambda: self.write_tasks(tasks_list))
+
+    def invalidate_tasks(self, task_ids):
+        """Drop the given tasks from the cache once the transaction has committed."""
+        on_commit(lambda: self.drop_tasks(task_ids))
+
+    def emit_tasks(self, event_type, tasks_list):
+        """Publish an event for each of the given tasks (serialized, or dicts with only the id)."""
+        for task_dict in tasks_list:
+            self.task_events.publish(event_type, task_dict)
+
+    def publish_tasks(self, event_type, tasks_list):
+        """Publish an event for each of the given tasks once the transaction has committed."""
+        on_commit(lambda: self.emit_tasks(event_type, tasks_list))
 
     def get_tasks(self, page=1, limit=10):
         """Retrieve a paginated list of tasks."""
-        task_objs = self.task_db.get_tasks(page=page, limit=limit)
+        task_objs = self.task_page_reads.do(
+            ("page", page, limit), lambda: self.task_db.get_tasks(page=page, limit=limit)
+        )
         if not task_objs:
             logger.error("No tasks found.")
             return {"error": "No tasks found"}, 404
-        tasks_list = [TaskSchema.from_orm(task).dict() for task in task_objs]
+        tasks_list = task_serializer.to_dicts(task_objs)
         return {"data": tasks_list}, 200
 
+    def get_tasks_by_cursor(self, cursor=None, limit=10, ordering="id"):
+        """Retrieve a page of tasks after the given cursor, with the cursor of the next page."""
+        after, error = self.decode_task_cursor(cursor, ordering)
+        if error:
+            return error
+        # Fetch one extra row to find out whether there is a next page
+        task_objs = self.task_page_reads.do(
+            page_key(after, limit, ordering),
+            lambda: self.task_db.get_tasks_after(after=after, limit=limit + 1, ordering=ordering),
+        )
+        return self.cursor_page(task_objs, limit, ordering)
+
+    def decode_task_cursor(self, cursor, ordering, order_by=None):
+        """
+        Return the ordering values to continue after and None, or None and the error response for a bad cursor.
+        The values must match the columns of order_by, by default those of the named ordering in TaskDB.ORDERINGS.
+        """
+        if not cursor:
+            return None, None
+        try:
+            cursor_ordering, after = decode_cursor(cursor)
+        except InvalidCursorError as e:
+            logger.error(str(e))
+            return None, ({"error": "Invalid cursor"}, 400)
+        if cursor_ordering != ordering:
+            logger.error("Cursor ordering {} does not match requested ordering {}.", cursor_ordering, ordering)
+            return None, ({"error": "Cursor does not match ordering {}".format(ordering)}, 400)
+        order_by = order_by or TaskDB.ORDERINGS.get(ordering)
+        try:
+            if order_by is not None:
+                check_cursor_values(after, self.task_db.cursor_types(order_by))
+        except InvalidCursorError as e:
+            logger.error(str(e))
+            return None, ({"error": "Invalid cursor"}, 400)
+        return after, None
+
+    def cursor_page(self, task_objs, limit, ordering, order_by=None):
+        """Shape up to limit + 1 fetched tasks into a page and the cursor of the next page."""
+        next_cursor = None
+        if len(task_objs) > limit:
+            task_objs = task_objs[:limit]
+            last_task = task_objs[-1]
+            columns = [column for column, _ in order_by or TaskDB.ORDERINGS[ordering]]
+            next_cursor = encode_cursor(ordering, [getattr(last_task, column) for column in columns])
+        tasks_list = task_serializer.to_dicts(task_objs)
+        return {"data": tasks_list, "next_cursor": next_cursor}, 200
+
+    def search_tasks(self, q, cursor=None, limit=10):
+        """Search tasks by title and description, most relevant first, with the cursor of the next page."""
+        after, error = self.decode_task_cursor(cursor, SEARCH_ORDERING, order_by=SEARCH_ORDER_BY)
+        if error:
+            return error
+        task_objs = self.task_db.search_tasks(q, after=after, limit=limit + 1)
+        return self.cursor_page(task_objs, limit, SEARCH_ORDERING, order_by=SEARCH_ORDER_BY)
+
+    def get_task_changes(self, since=None, limit=100):
+        """
+        Retrieve the tasks created, updated or deleted after the since cursor, in the order of the
+        changes, deleted tasks as tombstones. The response always carries the cursor to poll with next.
+        """
+        after, error = self.decode_task_cursor(since, CHANGES_ORDERING, order_by=TaskDB.CHANGES_ORDERING)
+        if error:
+            return error
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if after and to_timestamp(after[0]) < to_timestamp(now - timedelta(days=settings.TASKS_ARCHIVE['AFTER_DAYS'])):
+            # Tombstones older than this may have been archived, so the client could miss deletions
+            logger.error("Change feed cursor {} is older than the archive horizon.", since)
+            return {"error": "Cursor is too old, list all tasks again"}, 410
+        until = now - timedelta(seconds=settings.TASKS_CHANGES['SETTLE_SECONDS'])
+        task_objs = self.task_db.get_task_changes(after=after, until=until, limit=limit + 1)
+        has_more = len(task_objs) > limit
+        task_objs = task_objs[:limit]
+        if has_more:
+            position = [task_objs[-1].updated_at, task_objs[-1].id]
+        elif after and to_timestamp(after[0]) >= to_timestamp(until):
+            position = after
+        else:
+            # Every change before until has been returned; the next poll starts there
+            position = [until, 0]
+        changes = [change_entry(task_dict) for task_dict in task_serializer.to_dicts(task_objs)]
+        return {"data": changes, "next_cursor": encode_cursor(CHANGES_ORDERING, position), "has_more": has_more}, 200
+
+    def task_validators(self, data):
+        """
+        Return the ETag and Last-Modified timestamp in seconds of a representation of a task or a list of
+        tasks (dicts with id, updated_at and version). A single task gets its version ETag, which If-Match
+        accepts. A list has no Last-Modified: a task deleted from it leaves the newest updated_at of the
+        remaining tasks unchanged, so If-Modified-Since would answer 304. Its ETag covers the IDs instead.
+        """
+        if isinstance(data, dict):
+            return version_etag(data["id"], data["version"]), int(to_timestamp(data["updated_at"]))
+        return compute_etag(*[f"{task['id']}-{task['version']}" for task in data]), None
+
+    def get_task_validators(self, task_id=None):
+        """
+        Return the ETag and Last-Modified timestamp of a task from the cache or a lightweight
+        id/updated_at query instead of the whole row, or None if the task does not exist.
+        """
+        task_dict = self.task_cache.get(task_cache_key(task_id))
+        if task_dict is None:
+            task_version = self.task_db.get_task_version(task_id=task_id)
+            if not task_version:
+                return None
+            task_dict = task_version._asdict()
+        return self.task_validators(task_dict)
+
     def get_task(self, task_id=None):
-        """Retrieve a specific task by its ID."""
+        """Retrieve a specific task by its ID, from the cache when possible."""
+        task_dict = self.task_cache.get(task_cache_key(task_id))
+        if task_dict is None:
+            task_dict = self.task_reads.do(task_id, lambda: self.load_task(task_id))
+        if task_dict is None:
+            logger.error("Task with task_id:{} not found.", task_id)
+            return {"error": "Task with task_id:{} not found".format(task_id)}, 404
+        return {"data": dict(task_dict)}, 200
+
+    def load_task(self, task_id):
+        """
+        Read a task from the DB into the cache and return it serialized, or None if it does not exist.
+        The cache is only filled if empty: a write committed while the row was read has stored the newer task.
+        """
         task_obj = self.task_db.get_task(task_id=task_id)
         if not task_obj:
-            logger.error(f"Task with task_id:{task_id} not found.")
-            return {"error": "Task with task_id:{} not found".format(task_id)}, 404
-        task_dict = TaskSchema.from_orm(task_obj).dict()
-        return {"data": task_dict}, 200
+            return None
+        task_dict = task_serializer.to_dict(task_obj)
+        self.task_cache.add(task_cache_key(task_id), task_dict)
+        return task_dict
 
     def create_task(self, data=None):
         """Create a new task with the provided data."""
@@ -32,22 +254,196 @@ class TaskUsecase():
         if not inserted_task_obj:
             logger.error("Task cannot be created.")
             return {"error": "Task cannot be created"}, 404
-        inserted_task_dict = TaskSchema.from_orm(inserted_task_obj).dict()
-        return {"data": inserted_task_dict}, 201
+        inserted_task_dict = task_serializer.to_dict(inserted_task_obj)
+        self.cache_tasks([inserted_task_dict])
+        self.publish_tasks(TASK_CREATED, [inserted_task_dict])
+        return {"data": dict(inserted_task_dict)}, 201
 
-    def update_task(self, task_id=None, data=None):
-        """Update an existing task with the given ID and data."""
-        updated_task_obj = self.task_db.update_task(task_id=task_id, data=data)
+    def update_task(self, task_id=None, data=None, version=None, minimal=False):
+        """
+        Update an existing task with the given ID and data. With a version the update only applies if
+        the task still has it (412 otherwise); minimal skips reading the updated task back (204).
+        """
+        updated_task_obj = self.task_db.update_task(task_id=task_id, data=data, version=version, fetch=not minimal)
         if not updated_task_obj:
-            logger.error(f"Task with task_id:{task_id} not found for update.")
+            self.invalidate_tasks([task_id])
+            # Tell a conflicting version apart from a missing task only on this failure path
+            if version is not None and self.task_db.get_task_version(task_id=task_id):
+                return self.version_conflict(task_id, version)
+            logger.error("Task with task_id:{} not found for update.", task_id)
             return {"error": "Task with task_id:{} not found".format(task_id)}, 404
-        updated_task_dict = TaskSchema.from_orm(updated_task_obj).dict()
-        return {"data": updated_task_dict}, 200
+        if minimal:
+            self.invalidate_tasks([task_id])
+            self.publish_tasks(TASK_UPDATED, [{"id": task_id}])
+            return None, 204
+        updated_task_dict = task_serializer.to_dict(updated_task_obj)
+        self.cache_tasks([updated_task_dict])
+        self.publish_tasks(TASK_UPDATED, [updated_task_dict])
+        return {"data": dict(updated_task_dict)}, 200
+
+    def version_conflict(self, task_id, version):
+        """The 412 response for an update whose task no longer has the version the client expected."""
+        logger.error("Task with task_id:{} was modified since version {}.", task_id, version)
+        return {"error": "Task with task_id:{} has been modified since version {}".format(task_id, version)}, 412
 
     def delete_task(self, task_id=None):
         """Delete a specific task by its ID."""
         deleted = self.task_db.delete_task(task_id=task_id)
+        self.invalidate_tasks([task_id])
+        if not deleted:
+            logger.error("Task with task_id:{} not found for deletion.", task_id)
+            return {"error": "Task with task_id:{} not found".format(task_id)}, 404
+        self.publish_tasks(TASK_DELETED, [{"id": task_id}])
+        return None, 204
+
+    async def aget_tasks(self, page=1, limit=10):
+        """Retrieve a paginated list of tasks on the asyncio request path."""
+        task_objs = await self.task_page_reads.ado(
+            ("page", page, limit), lambda: self.async_task_db.get_tasks(page=page, limit=limit)
+        )
+        if not task_objs:
+            logger.error("No tasks found.")
+            return {"error": "No tasks found"}, 404
+        return {"data": task_serializer.to_dicts(task_objs)}, 200
+
+    async def aget_tasks_by_cursor(self, cursor=None, limit=10, ordering="id"):
+        """Retrieve a page of tasks after the given cursor on the asyncio request path."""
+        after, error = self.decode_task_cursor(cursor, ordering)
+        if error:
+            return error
+        task_objs = await self.task_page_reads.ado(
+            page_key(after, limit, ordering),
+            lambda: self.async_task_db.get_tasks_after(after=after, limit=limit + 1, ordering=ordering),
+        )
+        return self.cursor_page(task_objs, limit, ordering)
+
+    async def asearch_tasks(self, q, cursor=None, limit=10):
+        """Search tasks by title and description on the asyncio request path, see search_tasks."""
+        after, error = self.decode_task_cursor(cursor, SEARCH_ORDERING, order_by=SEARCH_ORDER_BY)
+        if error:
+            return error
+        task_objs = await self.async_task_db.search_tasks(q, after=after, limit=limit + 1)
+        return self.cursor_page(task_objs, limit, SEARCH_ORDERING, order_by=SEARCH_ORDER_BY)
+
+    async def aget_task_validators(self, task_id=None):
+        """Return the ETag and Last-Modified timestamp of a task on the asyncio request path, see get_task_validators."""
+        task_dict = self.task_cache.get(task_cache_key(task_id))
+        if task_dict is None:
+            task_version = await self.async_task_db.get_task_version(task_id=task_id)
+            if not task_version:
+                return None
+            task_dict = task_version._asdict()
+        return self.task_validators(task_dict)
+
+    async def aget_task(self, task_id=None):
+        """Retrieve a specific task by its ID on the asyncio request path, from the cache when possible."""
+        task_dict = self.task_cache.get(task_cache_key(task_id))
+        if task_dict is None:
+            task_dict = await self.task_reads.ado(task_id, lambda: self.aload_task(task_id))
+        if task_dict is None:
+            logger.error("Task with task_id:{} not found.", task_id)
+            return {"error": "Task with task_id:{} not found".format(task_id)}, 404
+        return {"data": dict(task_dict)}, 200
+
+    async def aload_task(self, task_id):
+        """Read a task from the DB into the cache on the asyncio request path, see load_task."""
+        task_obj = await self.async_task_db.get_task(task_id=task_id)
+        if not task_obj:
+            return None
+        task_dict = task_serializer.to_dict(task_obj)
+        self.task_cache.add(task_cache_key(task_id), task_dict)
+        return task_dict
+
+    # The asyncio adapter commits every write before returning, so the cache is updated right away.
+
+    async def acreate_task(self, data=None):
+        """Create a new task with the provided data on the asyncio request path."""
+        inserted_task_obj = await self.async_task_db.create_task(data)
+        if not inserted_task_obj:
+            logger.error("Task cannot be created.")
+            return {"error": "Task cannot be created"}, 404
+        inserted_task_dict = task_serializer.to_dict(inserted_task_obj)
+        self.write_tasks([inserted_task_dict])
+        self.emit_tasks(TASK_CREATED, [inserted_task_dict])
+        return {"data": dict(inserted_task_dict)}, 201
+
+    async def aupdate_task(self, task_id=None, data=None, version=None, minimal=False):
+        """Update an existing task with the given ID and data on the asyncio request path, see update_task."""
+        updated_task_obj = await self.async_task_db.update_task(task_id=task_id, data=data, version=version,
+                                                                fetch=not minimal)
+        if not updated_task_obj:
+            self.drop_tasks([task_id])
+            if version is not None and await self.async_task_db.get_task_version(task_id=task_id):
+                return self.version_conflict(task_id, version)
+            logger.error("Task with task_id:{} not found for update.", task_id)
+            return {"error": "Task with task_id:{} not found".format(task_id)}, 404
+        if minimal:
+            self.drop_tasks([task_id])
+            self.emit_tasks(TASK_UPDATED, [{"id": task_id}])
+            return None, 204
+        updated_task_dict = task_serializer.to_dict(updated_task_obj)
+        self.write_tasks([updated_task_dict])
+        self.emit_tasks(TASK_UPDATED, [updated_task_dict])
+        return {"data": dict(updated_task_dict)}, 200
+
+    async def adelete_task(self, task_id=None):
+        """Delete a specific task by its ID on the asyncio request path."""
+        deleted = await self.async_task_db.delete_task(task_id=task_id)
+        self.drop_tasks([task_id])
         if not deleted:
-            logger.error(f"Task with task_id:{task_id} not found for deletion.")
+            logger.error("Task with task_id:{} not found for deletion.", task_id)
             return {"error": "Task with task_id:{} not found".format(task_id)}, 404
+        self.emit_tasks(TASK_DELETED, [{"id": task_id}])
         return None, 204
+
+    def create_tasks(self, data_list=None):
+        """Create many tasks in one transaction."""
+        inserted_task_objs = self.task_db.create_tasks(data_list)
+        tasks_list = task_serializer.to_dicts(inserted_task_objs)
+        self.cache_tasks(tasks_list)
+        self.publish_tasks(TASK_CREATED, tasks_list)
+        return {"data": tasks_list}, 201
+
+    def update_tasks(self, data_list=None):
+        """Update many tasks in one transaction, reporting the IDs that were not found."""
+        updated_task_objs = self.task_db.update_tasks(data_list)
+        tasks_list = task_serializer.to_dicts(updated_task_objs)
+        updated_ids = {task["id"] for task in tasks_list}
+        not_found = [data["id"] for data in data_list if data["id"] not in updated_ids]
+        if not_found:
+            logger.error("Tasks with task_ids:{} not found for update.", not_found)
+            self.invalidate_tasks(not_found)
+        self.cache_tasks(tasks_list)
+        self.publish_tasks(TASK_UPDATED, tasks_list)
+        return {"data": tasks_list, "not_found": not_found}, 200
+
+    def delete_tasks(self, task_ids=None):
+        """Delete many tasks by their IDs."""
+        deleted_ids = self.task_db.delete_tasks(task_ids)
+        self.invalidate_tasks(task_ids)
+        if deleted_ids:
+            self.publish_tasks(TASK_DELETED, [{"id": task_id} for task_id in deleted_ids])
+        return {"data": {"deleted": len(deleted_ids)}}, 200
+
+    def export_tasks(self, file_format="ndjson", chunk_size=1000):
+        """Stream all tasks as NDJSON or CSV, one encoded chunk of rows at a time."""
+        chunks = self.task_db.stream_tasks(chunk_size=chunk_size)
+        if file_format == "csv":
+            return self._export_csv(chunks)
+        return self._export_ndjson(chunks)
+
+    def _export_ndjson(self, chunks):
+        for chunk in chunks:
+            yield "".join([ujson.dumps(task, ensure_ascii=False) + "\n" for task in task_serializer.to_dicts(chunk)]).encode()
+
+    def _export_csv(self, chunks):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(TaskSchema.__fields__.keys())
+        for chunk in chunks:
+            writer.writerows([task.values() for task in task_serializer.to_dicts(chunk)])
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
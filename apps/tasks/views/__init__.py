@@ -1,5 +1,13 @@
 from .task_view import TaskView
+from .task_bulk_view import TaskBulkView
+from .task_export_view import TaskExportView
+from .task_changes_view import TaskChangesView
+from .async_task_view import AsyncTaskView
 
 __all__ = [
     "TaskView",
+    "TaskBulkView",
+    "TaskExportView",
+    "TaskChangesView",
+    "AsyncTaskView",
 ]
\ No newline at end of file
@@ -0,0 +1,178 @@
+# Standard library imports
+import ujson
+
+# Third-party imports
+from django.http import HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from loguru import logger
+from pydantic import ValidationError
+
+# Local application/library specific imports
+from ..schemas.task_schema import TaskSchema, TaskPatchSchema, READ_ONLY_FIELDS
+from common.renderers import UJSONRenderer
+from common.instrumentation import timed
+from common.utils import validator_headers
+from ..usecases import TaskUsecase
+from .task_view import is_cursor_request, search_params, cursor_pagination_params, pagination_params
+from .task_view import if_match_version, prefers_minimal, update_headers
+
+renderer = UJSONRenderer()
+
+
+def json_response(data, status=200, headers=None):
+    """
+    Renders the usecase result the same way as the DRF views.
+
+    :param data: The response body, None for an empty body.
+    :param status: The HTTP status code.
+    :param headers: Optional; additional response headers.
+    :return: HttpResponse with the JSON body.
+    """
+    return HttpResponse(renderer.render(data), status=status, content_type="application/json", headers=headers)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncTaskView(View):
+    """
+    asyncio variant of TaskView for deployments behind an ASGI server (see ASYNC_API in the settings).
+
+    The handlers await the database through AsyncTaskDB instead of blocking a worker thread, so one
+    process can keep many slow clients in flight. Requests and responses are the same as TaskView.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.task_usecase = TaskUsecase()
+
+    async def get(self, request, task_id=None):
+        """
+        Handles GET requests to retrieve tasks. If task_id is provided,
+        retrieves a specific task. Otherwise, retrieves a paginated list of tasks.
+
+        :param request: The HTTP request object.
+        :param task_id: Optional; the ID of the specific task to retrieve.
+        :return: Response containing task data or an error message.
+        """
+        logger.debug("Async GET request received with task_id: {}", task_id)
+
+        if not task_id and "q" in request.GET:
+            try:
+                validated_data = search_params(request.GET)
+            except ValidationError as e:
+                logger.error("Search validation error: {}", e.errors())
+                return json_response({'error': e.errors()}, status=400)
+            response, status_code = await self.task_usecase.asearch_tasks(
+                q=validated_data.q, cursor=validated_data.cursor, limit=validated_data.limit
+            )
+        elif not task_id and is_cursor_request(request.GET):
+            try:
+                validated_data = cursor_pagination_params(request.GET)
+            except ValidationError as e:
+                logger.error("Cursor pagination validation error: {}", e.errors())
+                return json_response({'error': e.errors()}, status=400)
+            response, status_code = await self.task_usecase.aget_tasks_by_cursor(
+                cursor=validated_data.cursor, limit=validated_data.limit, ordering=validated_data.ordering
+            )
+        elif not task_id:
+            try:
+                validated_data = pagination_params(request.GET)
+            except ValidationError as e:
+                logger.error("Pagination validation error: {}", e.errors())
+                return json_response({'error': e.errors()}, status=400)
+            response, status_code = await self.task_usecase.aget_tasks(page=validated_data.page, limit=validated_data.limit)
+        else:
+            if "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META:
+                # Answer revalidations from the cache or an id/updated_at probe without loading the task.
+                validators = await self.task_usecase.aget_task_validators(task_id=task_id)
+                if validators:
+                    etag, last_modified = validators
+                    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                    if not_modified is not None:
+                        return not_modified
+            response, status_code = await self.task_usecase.aget_task(task_id=task_id)
+
+        headers = None
+        if status_code == 200 and response["data"]:
+            etag, last_modified = self.task_usecase.task_validators(response["data"])
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return not_modified
+            headers = validator_headers(etag, last_modified)
+        return json_response(response, status=status_code, headers=headers)
+
+    async def post(self, request):
+        """
+        Handles POST requests to create a new task.
+
+        :param request: The HTTP request object containing task data.
+        :return: Response containing created task data or an error message.
+        """
+        try:
+            with timed("validate"):
+                task_data = TaskSchema.parse_raw(request.body)
+        except ValidationError as e:
+            logger.error("Task creation validation error: {}", e.errors())
+            return json_response({'error': e.errors()}, status=400)
+        response, status_code = await self.task_usecase.acreate_task(data=task_data.dict(exclude=READ_ONLY_FIELDS))
+        return json_response(response, status=status_code)
+
+    async def put(self, request, task_id):
+        """
+        Handles PUT requests to update an existing task.
+
+        :param request: The HTTP request object containing updated task data.
+        :param task_id: The ID of the task to update.
+        :return: Response containing updated task data or an error message.
+        """
+        return await self.update(request, task_id, TaskSchema)
+
+    async def patch(self, request, task_id):
+        """
+        Handles PATCH requests to partially update an existing task.
+
+        :param request: The HTTP request object containing the fields to update.
+        :param task_id: The ID of the task to update.
+        :return: Response containing updated task data or an error message.
+        """
+        return await self.update(request, task_id, TaskPatchSchema)
+
+    async def update(self, request, task_id, schema):
+        """
+        Validates the request body with the given schema and updates the task, see TaskView.update.
+
+        :param request: The HTTP request object containing updated task data.
+        :param task_id: The ID of the task to update.
+        :param schema: TaskSchema for PUT, TaskPatchSchema for PATCH.
+        :return: Response containing updated task data or an error message.
+        """
+        try:
+            version = if_match_version(request, task_id)
+        except ValueError as e:
+            logger.error("Task update precondition error: {}", e)
+            return json_response({'error': str(e)}, status=412)
+        try:
+            data = ujson.loads(request.body)
+            data["id"] = task_id
+            with timed("validate"):
+                validated_data = schema(**data).dict(exclude_unset=True, exclude=READ_ONLY_FIELDS)
+        except ValidationError as e:
+            logger.error("Task update validation error: {}", e.errors())
+            return json_response({'error': e.errors()}, status=400)
+        response, status_code = await self.task_usecase.aupdate_task(
+            task_id=task_id, data=validated_data, version=version, minimal=prefers_minimal(request)
+        )
+        return json_response(response, status=status_code, headers=update_headers(task_id, response, status_code, version))
+
+    async def delete(self, request, task_id):
+        """
+        Handles DELETE requests to remove a specific task.
+
+        :param request: The HTTP request object.
+        :param task_id: The ID of the task to delete.
+        :return: Response containing the result of the deletion.
+        """
+        response, status_code = await self.task_usecase.adelete_task(task_id=task_id)
+        return json_response(response, status=status_code)
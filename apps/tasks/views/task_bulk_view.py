@@ -0,0 +1,144 @@
+# Standard library imports
+from typing import List
+
+import ujson
+
+# Third-party imports
+from django.conf import settings
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.decorators import method_decorator
+from loguru import logger
+from pydantic import ValidationError, parse_obj_as
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+# Local application/library specific imports
+from common.instrumentation import timed
+from ..schemas import TaskSchema, TaskBulkPatchSchema, TaskBulkDeleteSchema, READ_ONLY_FIELDS
+from ..usecases import TaskUsecase
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class TaskBulkView(APIView):
+    def __init__(self):
+        # Initialize the TaskUsecase for handling task-related operations.
+        self.task_usecase = TaskUsecase()
+        logger.debug("Initialized TaskBulkView with TaskUsecase.")
+
+    def parse_list(self, request):
+        """
+        Parses the request body as a JSON list of at most TASKS_BULK_MAX_ITEMS items.
+
+        :param request: The HTTP request object.
+        :return: The parsed list, or None and an error response.
+        """
+        try:
+            items = ujson.loads(request.body)
+        except ValueError:
+            return None, Response({'error': 'Request body must be valid JSON'}, status=400)
+        if not isinstance(items, list) or not items:
+            return None, Response({'error': 'Request body must be a non-empty list of tasks'}, status=400)
+        if len(items) > settings.TASKS_BULK_MAX_ITEMS:
+            return None, Response(
+                {'error': 'At most {} tasks are allowed per request'.format(settings.TASKS_BULK_MAX_ITEMS)}, status=400
+            )
+        return items, None
+
+    @swagger_auto_schema(
+        operation_summary="Create many tasks",
+        operation_description="Handles POST requests to create many tasks at once. "
+                              "Requires a list of tasks in the request body. "
+                              "All tasks are written in one transaction; returns the created tasks.",
+        responses={
+            201: "Tasks Created.",
+            400: "Validation error if any item of the request data is invalid."
+        }
+    )
+    def post(self, request):
+        """
+        Handles POST requests to create many tasks.
+
+        :param request: The HTTP request object containing a list of tasks.
+        :return: Response containing the created tasks or an error message.
+        """
+        items, error_response = self.parse_list(request)
+        if error_response:
+            return error_response
+        logger.debug("Bulk POST request received with {} tasks", len(items))
+        try:
+            with timed("validate"):
+                tasks_data = parse_obj_as(List[TaskSchema], items)
+        except ValidationError as e:
+            logger.error("Bulk task creation validation error: {}", e.errors())
+            return Response({'error': e.errors()}, status=400)
+
+        response, status_code = self.task_usecase.create_tasks(data_list=[task.dict(exclude=READ_ONLY_FIELDS) for task in tasks_data])
+        logger.info("Bulk created {} tasks", len(response['data']))
+        return Response(response, status=status_code, content_type="application/json")
+
+    @swagger_auto_schema(
+        operation_summary="Update many tasks",
+        operation_description="Handles PATCH requests to partially update many tasks at once. "
+                              "Requires a list of objects with the task ID and the fields to change. "
+                              "All tasks are updated in one transaction; returns the updated tasks "
+                              "and the IDs that were not found.",
+        responses={
+            200: "Tasks Updated.",
+            400: "Validation error if any item of the request data is invalid."
+        }
+    )
+    def patch(self, request):
+        """
+        Handles PATCH requests to update many tasks.
+
+        :param request: The HTTP request object containing a list of partial tasks with IDs.
+        :return: Response containing the updated tasks or an error message.
+        """
+        items, error_response = self.parse_list(request)
+        if error_response:
+            return error_response
+        logger.debug("Bulk PATCH request received with {} tasks", len(items))
+        try:
+            with timed("validate"):
+                tasks_data = parse_obj_as(List[TaskBulkPatchSchema], items)
+        except ValidationError as e:
+            logger.error("Bulk task update validation error: {}", e.errors())
+            return Response({'error': e.errors()}, status=400)
+
+        data_list = [task.dict(exclude_unset=True, exclude=READ_ONLY_FIELDS) for task in tasks_data]
+        response, status_code = self.task_usecase.update_tasks(data_list=data_list)
+        logger.info("Bulk updated {} tasks", len(response['data']))
+        return Response(response, status=status_code, content_type="application/json")
+
+    @swagger_auto_schema(
+        operation_summary="Delete many tasks",
+        operation_description="Handles DELETE requests to remove many tasks at once. "
+                              "Requires {\"ids\": [...]} in the request body. "
+                              "Returns the number of deleted tasks.",
+        responses={
+            200: "Tasks deleted.",
+            400: "Validation error if the request data is invalid."
+        }
+    )
+    def delete(self, request):
+        """
+        Handles DELETE requests to remove many tasks.
+
+        :param request: The HTTP request object containing the task IDs.
+        :return: Response containing the number of deleted tasks or an error message.
+        """
+        try:
+            with timed("validate"):
+                delete_data = TaskBulkDeleteSchema.parse_raw(request.body)
+        except ValidationError as e:
+            logger.error("Bulk task deletion validation error: {}", e.errors())
+            return Response({'error': e.errors()}, status=400)
+        if len(delete_data.ids) > settings.TASKS_BULK_MAX_ITEMS:
+            return Response(
+                {'error': 'At most {} tasks are allowed per request'.format(settings.TASKS_BULK_MAX_ITEMS)}, status=400
+            )
+
+        response, status_code = self.task_usecase.delete_tasks(task_ids=delete_data.ids)
+        logger.debug("Bulk task deletion response: {}", response)
+        return Response(response, status=status_code, content_type="application/json")
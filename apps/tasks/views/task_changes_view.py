@@ -0,0 +1,71 @@
+# Third-party imports
+from django.conf import settings
+from loguru import logger
+from pydantic import ValidationError
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+# Local application/library specific imports
+from common.schemas import ChangeFeedSchema
+from ..usecases import TaskUsecase
+
+
+def change_feed_params(query):
+    """
+    Validates the change feed query parameters.
+
+    :param query: The request query dict.
+    :return: The validated ChangeFeedSchema; raises ValidationError.
+    """
+    limit = query.get("limit", "100")
+    if not limit or not limit.isdigit():
+        limit = 100
+    return ChangeFeedSchema(since=query.get("since") or None, limit=min(int(limit), settings.TASKS_CHANGES['MAX_LIMIT']))
+
+
+class TaskChangesView(APIView):
+    def __init__(self):
+        # Initialize the TaskUsecase for handling task-related operations.
+        self.task_usecase = TaskUsecase()
+        logger.debug("Initialized TaskChangesView with TaskUsecase.")
+
+    @swagger_auto_schema(
+        operation_summary="Retrieve task changes",
+        operation_description="Handles GET requests to retrieve the tasks created, updated or deleted since the "
+                              "since cursor, oldest change first. Deleted tasks are returned as tombstones "
+                              "with only id, deleted and updated_at. Every response carries next_cursor to pass "
+                              "as since in the next poll; has_more tells whether to poll again right away. "
+                              "Without since the feed starts from the first task.",
+        manual_parameters=[
+            openapi.Parameter('since', openapi.IN_QUERY,
+                              description="Cursor returned as next_cursor by the previous poll",
+                              type=openapi.TYPE_STRING,
+                              required=False),
+            openapi.Parameter('limit', openapi.IN_QUERY,
+                              description="Maximum number of changes to return",
+                              type=openapi.TYPE_INTEGER,
+                              required=False)
+        ],
+        responses={
+            200: "The changes and the cursor to resume from.",
+            400: "Bad Request if the cursor is invalid.",
+            410: "Gone if the cursor is older than the retention of deleted tasks; list all tasks again."
+        }
+    )
+    def get(self, request):
+        """
+        Handles GET requests to retrieve the changes since a cursor.
+
+        :param request: The HTTP request object.
+        :return: Response containing the changes and the next cursor, or an error message.
+        """
+        try:
+            validated_data = change_feed_params(request.GET)
+        except ValidationError as e:
+            logger.error("Change feed validation error: {}", e.errors())
+            return Response({'error': e.errors()}, status=400)
+
+        response, status_code = self.task_usecase.get_task_changes(since=validated_data.since, limit=validated_data.limit)
+        return Response(response, status=status_code, content_type="application/json")
@@ -0,0 +1,59 @@
+# Third-party imports
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from loguru import logger
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+from rest_framework.views import APIView
+from rest_framework.response import Response
+
+# Local application/library specific imports
+from ..usecases import TaskUsecase
+
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class TaskExportView(APIView):
+    def __init__(self):
+        # Initialize the TaskUsecase for handling task-related operations.
+        self.task_usecase = TaskUsecase()
+        logger.debug("Initialized TaskExportView with TaskUsecase.")
+
+    @swagger_auto_schema(
+        operation_summary="Export all tasks",
+        operation_description="Handles GET requests to export every task as NDJSON (one task per line) or CSV. "
+                              "The tasks are streamed from the database in chunks, so the response can be "
+                              "consumed while it is produced regardless of the number of tasks.",
+        manual_parameters=[
+            openapi.Parameter('file_format', openapi.IN_QUERY,
+                              description="Export format",
+                              type=openapi.TYPE_STRING,
+                              enum=list(EXPORT_CONTENT_TYPES),
+                              required=False)
+        ],
+        responses={
+            200: "Stream of all tasks.",
+            400: "Bad Request if the export format is not supported."
+        }
+    )
+    def get(self, request):
+        """
+        Handles GET requests to export all tasks.
+
+        :param request: The HTTP request object.
+        :return: Streaming response containing every task.
+        """
+        file_format = request.GET.get("file_format", "ndjson")
+        if file_format not in EXPORT_CONTENT_TYPES:
+            return Response({'error': 'file_format must be one of {}'.format(", ".join(EXPORT_CONTENT_TYPES))},
+                            status=400)
+        logger.info("Exporting tasks as {}", file_format)
+        response = StreamingHttpResponse(
+            self.task_usecase.export_tasks(file_format=file_format, chunk_size=settings.TASKS_EXPORT_CHUNK_SIZE),
+            content_type=EXPORT_CONTENT_TYPES[file_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="tasks.{file_format}"'
+        return response
@@ -1,9 +1,10 @@
 # Standard library imports
 import ujson
-import sys
 
 # Third-party imports
+from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import method_decorator
 from loguru import logger
 from pydantic import ValidationError
@@ -13,24 +14,146 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 
 # Local application/library specific imports
-from ..schemas.task_schema import TaskSchema
-from common.schemas import PaginationSchema
+from ..schemas.task_schema import TaskSchema, TaskPatchSchema, READ_ONLY_FIELDS
+from common.schemas import PaginationSchema, CursorPaginationSchema, SearchSchema
+from common.instrumentation import timed
+from common.utils import validator_headers, version_etag, parse_version_etag
 from ..usecases import TaskUsecase
 
-logger.add(sys.stderr, format="{time} {level} {message}", level="INFO")
+
+def is_cursor_request(query):
+    """Passing cursor or ordering switches the task list to cursor pagination."""
+    return "cursor" in query or "ordering" in query
+
+
+def search_params(query):
+    """
+    Validates the search query parameters.
+
+    :param query: The request query dict.
+    :return: The validated SearchSchema; raises ValidationError.
+    """
+    limit = query.get("limit", "10")
+    if not limit or not limit.isdigit():
+        limit = 10
+    limit = min(int(limit), settings.TASKS_PAGINATION['MAX_LIMIT'])
+    return SearchSchema(q=query.get("q", ""), cursor=query.get("cursor") or None, limit=limit)
+
+
+def cursor_pagination_params(query):
+    """
+    Validates the cursor pagination query parameters.
+
+    :param query: The request query dict.
+    :return: The validated CursorPaginationSchema; raises ValidationError.
+    """
+    limit = query.get("limit", "10")
+    if not limit or not limit.isdigit():
+        limit = 10
+    query_params = {
+        "cursor": query.get("cursor") or None,
+        "limit": min(int(limit), settings.TASKS_PAGINATION['MAX_LIMIT']),
+        "ordering": query.get("ordering") or "id",
+    }
+    return CursorPaginationSchema(**query_params)
+
+
+def pagination_params(query):
+    """
+    Validates the page and limit query parameters.
+
+    :param query: The request query dict.
+    :return: The validated PaginationSchema; raises ValidationError.
+    """
+    page = query.get("page", "1")
+    limit = query.get("limit", "10")
+
+    logger.debug("Pagination parameters - Page: {}, Limit: {}", page, limit)
+
+    # Validate page and limit parameters.
+    if not page or not page.isdigit():
+        page = 1
+    if not limit or not limit.isdigit():
+        limit = 10
+    query_params = {"page": int(page), "limit": int(limit)}
+    return PaginationSchema(**query_params)
+
+
+# Headers of the conditional and minimal updates, documented on PUT and PATCH
+UPDATE_HEADER_PARAMETERS = [
+    openapi.Parameter('If-Match', openapi.IN_HEADER,
+                      description="ETag of the task as last read; the update fails with 412 if the task changed since",
+                      type=openapi.TYPE_STRING,
+                      required=False),
+    openapi.Parameter('Prefer', openapi.IN_HEADER,
+                      description="return=minimal answers 204 without reading the updated task back",
+                      type=openapi.TYPE_STRING,
+                      required=False),
+]
+
+
+def if_match_version(request, task_id):
+    """
+    Reads the task version a client expects from the If-Match header.
+
+    :param request: The HTTP request object.
+    :param task_id: The ID of the task to update.
+    :return: The expected version, None without If-Match or for "*"; raises ValueError for an ETag
+             that is not a version ETag of this task.
+    """
+    if_match = request.headers.get("If-Match")
+    if if_match is None or if_match.strip() == "*":
+        return None
+    parsed = parse_version_etag(if_match)
+    if parsed is None or parsed[0] != str(task_id):
+        raise ValueError("If-Match does not match the ETag of task_id:{}".format(task_id))
+    return parsed[1]
+
+
+def prefers_minimal(request):
+    """Whether the client sent Prefer: return=minimal and does not need the updated task in the response."""
+    preferences = request.headers.get("Prefer", "").replace(";", ",").split(",")
+    return "return=minimal" in [preference.strip().lower() for preference in preferences]
+
+
+def update_headers(task_id, response, status_code, version):
+    """
+    Returns the headers of an update response: the ETag of the new version of the task and, for a
+    minimal response, the applied preference.
+
+    :param task_id: The ID of the updated task.
+    :param response: The usecase response.
+    :param status_code: The usecase status code.
+    :param version: The version the client sent in If-Match, None if it did not.
+    :return: The headers, None for a failed update.
+    """
+    if status_code == 200:
+        return {"ETag": version_etag(response["data"]["id"], response["data"]["version"])}
+    if status_code == 204:
+        headers = {"Preference-Applied": "return=minimal"}
+        if version is not None:
+            # The conditional update replaced exactly that version
+            headers["ETag"] = version_etag(task_id, version + 1)
+        return headers
+    return None
+
 
 @method_decorator(csrf_exempt, name='dispatch')
 class TaskView(APIView):
     def __init__(self):
         # Initialize the TaskUsecase for handling task-related operations.
         self.task_usecase = TaskUsecase()
-        logger.info("Initialized TaskView with TaskUsecase.")
+        logger.debug("Initialized TaskView with TaskUsecase.")
 
     @swagger_auto_schema(
         operation_summary="Retrieve tasks",
         operation_description="Handles GET requests to retrieve tasks. "
                               "If task_id is provided, retrieves a specific task. "
-                              "Otherwise, retrieves a paginated list of tasks.",
+                              "Otherwise, retrieves a paginated list of tasks. "
+                              "Passing cursor or ordering switches to cursor pagination, "
+                              "which returns next_cursor for fetching the following page. "
+                              "Passing q searches title and description instead, most relevant first, "
+                              "with cursor pagination.",
         manual_parameters=[
             openapi.Parameter('page', openapi.IN_QUERY,
                               description="Page number for pagination",
@@ -39,10 +162,24 @@ class TaskView(APIView):
             openapi.Parameter('limit', openapi.IN_QUERY,
                               description="Limit number of tasks per page",
                               type=openapi.TYPE_INTEGER,
+                              required=False),
+            openapi.Parameter('cursor', openapi.IN_QUERY,
+                              description="Cursor returned as next_cursor by the previous page",
+                              type=openapi.TYPE_STRING,
+                              required=False),
+            openapi.Parameter('q', openapi.IN_QUERY,
+                              description="Search the title and description, most relevant first",
+                              type=openapi.TYPE_STRING,
+                              required=False),
+            openapi.Parameter('ordering', openapi.IN_QUERY,
+                              description="Ordering for cursor pagination",
+                              type=openapi.TYPE_STRING,
+                              enum=["id", "-id", "created_at", "-created_at"],
                               required=False)
         ],
         responses={
             200: "List of tasks or a specific task based on task_id.",
+            304: "Not Modified if the If-None-Match or If-Modified-Since validators still match.",
             400: "Bad Request if pagination parameters are invalid.",
             404: "Task not found if task_id is specified."
         }
@@ -56,34 +193,44 @@ class TaskView(APIView):
         :param task_id: Optional; the ID of the specific task to retrieve.
         :return: Response containing task data or an error message.
         """
-        logger.debug(f"GET request received with task_id: {task_id}")
+        logger.debug("GET request received with task_id: {}", task_id)
 
-        if not task_id:
-            # If no task_id is specified, handle pagination for the task list.
-            page = request.GET.get("page", "1")
-            limit = request.GET.get("limit", "10")
-
-            logger.debug(f"Pagination parameters - Page: {page}, Limit: {limit}")
+        if not task_id and "q" in request.GET:
+            # Search is served by the FULLTEXT index instead of clients paging through all tasks.
+            try:
+                validated_data = search_params(request.GET)
+                logger.debug("Validated search data: {}", validated_data)
+            except ValidationError as e:
+                logger.error("Search validation error: {}", e.errors())
+                return Response({'error': e.errors()}, status=400)
 
-            # Validate page and limit parameters.
-            if not page or not page.isdigit():
-                page = 1
-            if not limit or not limit.isdigit():
-                limit = 10
-            page = int(page)
-            limit = int(limit)
+            response, status_code = self.task_usecase.search_tasks(
+                q=validated_data.q, cursor=validated_data.cursor, limit=validated_data.limit
+            )
+        elif not task_id and is_cursor_request(request.GET):
+            # Cursor pagination seeks straight to the next page instead of skipping OFFSET rows.
+            try:
+                validated_data = cursor_pagination_params(request.GET)
+                logger.debug("Validated cursor pagination data: {}", validated_data)
+            except ValidationError as e:
+                logger.error("Cursor pagination validation error: {}", e.errors())
+                return Response({'error': e.errors()}, status=400)
 
-            query_params = {"page": page, "limit": limit}
+            response, status_code = self.task_usecase.get_tasks_by_cursor(
+                cursor=validated_data.cursor, limit=validated_data.limit, ordering=validated_data.ordering
+            )
+        elif not task_id:
+            # If no task_id is specified, handle pagination for the task list.
             try:
                 # Validate pagination parameters using Pydantic schema.
-                validated_data = PaginationSchema(**query_params)
-                logger.info(f"Validated pagination data: {validated_data}")
+                validated_data = pagination_params(request.GET)
+                logger.debug("Validated pagination data: {}", validated_data)
             except ValidationError as e:
                 # Return error response if validation fails.
-                logger.error(f"Pagination validation error: {e.errors()}")
+                logger.error("Pagination validation error: {}", e.errors())
                 return Response({'error': e.errors()}, status=400)
 
-            logger.info(f"Fetching all tasks with pagination: Page {validated_data.page}, Limit {validated_data.limit}")
+            logger.info("Fetching all tasks with pagination: Page {}, Limit {}", validated_data.page, validated_data.limit)
             # Fetch tasks using the validated page and limit.
             response, status_code = self.task_usecase.get_tasks(page=validated_data.page, limit=validated_data.limit)
         else:
@@ -92,11 +239,28 @@ class TaskView(APIView):
                 task_id = int(task_id)  # Convert to int; raises ValueError if not possible
             except ValueError:
                 return Response({'error': 'task_id must be an integer'}, status=400)
-            logger.info(f"Fetching task with ID: {task_id}")
+            if "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META:
+                # Answer revalidations from the cache or an id/updated_at probe without loading the task.
+                validators = self.task_usecase.get_task_validators(task_id=task_id)
+                if validators:
+                    etag, last_modified = validators
+                    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+                    if not_modified is not None:
+                        logger.info("Task with ID: {} not modified", task_id)
+                        return not_modified
+            logger.info("Fetching task with ID: {}", task_id)
             response, status_code = self.task_usecase.get_task(task_id=task_id)
 
-        logger.debug(f"Response for GET request: {response}")
-        return Response(response, status=status_code, content_type="application/json")
+        logger.debug("Response for GET request: {}", response)
+        headers = None
+        if status_code == 200 and response["data"]:
+            # Strong validators so that polling clients can revalidate with If-None-Match / If-Modified-Since
+            etag, last_modified = self.task_usecase.task_validators(response["data"])
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is not None:
+                return not_modified
+            headers = validator_headers(etag, last_modified)
+        return Response(response, status=status_code, content_type="application/json", headers=headers)
 
     @swagger_auto_schema(
         operation_summary="Create a new task",
@@ -115,30 +279,36 @@ class TaskView(APIView):
         :param request: The HTTP request object containing task data.
         :return: Response containing created task data or an error message.
         """
-        logger.debug(f"POST request received with body: {request.body}")
+        logger.debug("POST request received with body: {}", request.body)
         try:
             # Parse the request body into TaskSchema.
-            task_data = TaskSchema.parse_raw(request.body)
-            logger.info(f"Parsed task data: {task_data}")
+            with timed("validate"):
+                task_data = TaskSchema.parse_raw(request.body)
+            logger.debug("Parsed task data: {}", task_data)
 
             # Create a new task using the task_usecase.
-            response, status_code = self.task_usecase.create_task(data=task_data.dict())
-            logger.info(f"Task created successfully: {response}")
+            response, status_code = self.task_usecase.create_task(data=task_data.dict(exclude=READ_ONLY_FIELDS))
+            logger.debug("Task created successfully: {}", response)
             return Response(response, status=status_code, content_type="application/json")
         except ValidationError as e:
             # Return error response if validation fails.
-            logger.error(f"Task creation validation error: {e.errors()}")
+            logger.error("Task creation validation error: {}", e.errors())
             return Response({'error': e.errors()}, status=400)
 
     @swagger_auto_schema(
         operation_summary="Update an existing task",
         operation_description="Handles PUT requests to update an existing task. "
                               "Requires task ID in the URL and updated task data in the request body. "
-                              "Returns the updated task details.",
+                              "Returns the updated task details with its new ETag. "
+                              "With If-Match the update only applies if the task did not change since; "
+                              "with Prefer: return=minimal the response has no body.",
+        manual_parameters=UPDATE_HEADER_PARAMETERS,
         responses={
             200: "Task Updated.",
+            204: "Task Updated, with Prefer: return=minimal.",
             400: "Validation error if the request data is invalid.",
-            404: "Task not found if the task_id does not exist."
+            404: "Task not found if the task_id does not exist.",
+            412: "Precondition Failed if the task changed since the If-Match ETag."
         }
     )
     def put(self, request, task_id):
@@ -149,25 +319,70 @@ class TaskView(APIView):
         :param task_id: The ID of the task to update.
         :return: Response containing updated task data or an error message.
         """
-        logger.debug(f"PUT request received for task_id: {task_id} with body: {request.body}")
+        logger.debug("PUT request received for task_id: {} with body: {}", task_id, request.body)
+        return self.update(request, task_id, TaskSchema)
+
+    @swagger_auto_schema(
+        operation_summary="Partially update an existing task",
+        operation_description="Handles PATCH requests to update only the fields sent in the request body. "
+                              "If-Match and Prefer: return=minimal work as for PUT.",
+        manual_parameters=UPDATE_HEADER_PARAMETERS,
+        responses={
+            200: "Task Updated.",
+            204: "Task Updated, with Prefer: return=minimal.",
+            400: "Validation error if the request data is invalid.",
+            404: "Task not found if the task_id does not exist.",
+            412: "Precondition Failed if the task changed since the If-Match ETag."
+        }
+    )
+    def patch(self, request, task_id):
+        """
+        Handles PATCH requests to partially update an existing task.
+
+        :param request: The HTTP request object containing the fields to update.
+        :param task_id: The ID of the task to update.
+        :return: Response containing updated task data or an error message.
+        """
+        logger.debug("PATCH request received for task_id: {} with body: {}", task_id, request.body)
+        return self.update(request, task_id, TaskPatchSchema)
+
+    def update(self, request, task_id, schema):
+        """
+        Validates the request body with the given schema and updates the task, as a conditional
+        update when If-Match is sent.
+
+        :param request: The HTTP request object containing updated task data.
+        :param task_id: The ID of the task to update.
+        :param schema: TaskSchema for PUT, TaskPatchSchema for PATCH.
+        :return: Response containing updated task data or an error message.
+        """
+        try:
+            version = if_match_version(request, task_id)
+        except ValueError as e:
+            logger.error("Task update precondition error: {}", e)
+            return Response({'error': str(e)}, status=412)
         try:
             # Load request body data using ujson for performance.
             data = ujson.loads(request.body)
             data["id"] = task_id
 
-            # Validate the data against TaskSchema, excluding unset fields.
-            validated_data = TaskSchema(**data).dict(exclude_unset=True)
-            logger.info(f"Validated data for update: {validated_data}")
-
-            # Update the task using the task_usecase.
-            response, status_code = self.task_usecase.update_task(task_id=task_id, data=validated_data)
-            logger.info(f"Task updated successfully: {response}")
-            return Response(response, status=status_code, content_type="application/json")
+            # Validate the data against the schema, excluding unset fields.
+            with timed("validate"):
+                validated_data = schema(**data).dict(exclude_unset=True, exclude=READ_ONLY_FIELDS)
+            logger.debug("Validated data for update: {}", validated_data)
         except ValidationError as e:
             # Return error response if validation fails.
-            logger.error(f"Task update validation error: {e.errors()}")
+            logger.error("Task update validation error: {}", e.errors())
             return Response({'error': e.errors()}, status=400)
 
+        # Update the task using the task_usecase.
+        response, status_code = self.task_usecase.update_task(
+            task_id=task_id, data=validated_data, version=version, minimal=prefers_minimal(request)
+        )
+        logger.debug("Task update response: {}", response)
+        headers = update_headers(task_id, response, status_code, version)
+        return Response(response, status=status_code, content_type="application/json", headers=headers)
+
     @swagger_auto_schema(
         operation_summary="Delete a specific task",
         operation_description="Handles DELETE requests to remove a specific task by ID. "
@@ -185,7 +400,7 @@ class TaskView(APIView):
         :param task_id: The ID of the task to delete.
         :return: Response containing the result of the deletion.
         """
-        logger.debug(f"DELETE request received for task_id: {task_id}")
+        logger.debug("DELETE request received for task_id: {}", task_id)
         response, status_code = self.task_usecase.delete_task(task_id=task_id)
-        logger.info(f"Task deletion response: {response}")
+        logger.debug("Task deletion response: {}", response)
         return Response(response, status=status_code, content_type="application/json")
@@ -0,0 +1,41 @@
+from .base_cache import BaseCache, NullCache
+from .lru_cache import LRUCache
+from .django_cache import DjangoCacheAdapter
+from .single_flight import SingleFlight
+
+
+def build_cache(config, name=None):
+    """
+    Builds a cache from a settings dictionary.
+
+    Args:
+        config (dict): BACKEND ("lru", "django" or "none"), TTL in seconds, and MAX_SIZE for "lru"
+            or ALIAS and KEY_PREFIX for "django".
+        name (str, optional): Name under which the cache statistics are exported as metrics.
+
+    Returns:
+        BaseCache: The configured cache.
+    """
+    backend = config.get("BACKEND", "lru")
+    if backend == "lru":
+        cache = LRUCache(max_size=config.get("MAX_SIZE", 10000), ttl=config.get("TTL", 5))
+    elif backend == "django":
+        cache = DjangoCacheAdapter(
+            alias=config.get("ALIAS", "default"), ttl=config.get("TTL", 5), key_prefix=config.get("KEY_PREFIX", "tasks")
+        )
+    elif backend == "none":
+        cache = NullCache()
+    else:
+        raise ValueError(f"Unknown cache backend: {backend}")
+    cache.name = name
+    return cache
+
+
+__all__ = [
+    "BaseCache",
+    "NullCache",
+    "LRUCache",
+    "DjangoCacheAdapter",
+    "SingleFlight",
+    "build_cache",
+]
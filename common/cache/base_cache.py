@@ -0,0 +1,135 @@
+import threading
+
+from common.instrumentation import cache_events, cache_size
+
+
+class BaseCache:
+    """
+    Interface of the read-through caches used by the usecases, with hit/miss/eviction counters.
+
+    Subclasses implement _get, _set, _add, _delete and clear. A cached value of None is not supported;
+    get returns None on a miss. Caches given a name also export the counters and their size as
+    Prometheus metrics (cache_events_total, cache_size), aggregated over all worker processes.
+    """
+
+    def __init__(self):
+        # Value of the cache label of the exported metrics; unnamed caches are not exported
+        self.name = None
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def record(self, counter, amount=1):
+        """Increments one of the counters."""
+        with self._stats_lock:
+            self._stats[counter] += amount
+        if self.name:
+            cache_events.labels(self.name, counter).inc(amount)
+
+    def record_size(self):
+        """Exports the current size of a named cache."""
+        if self.name:
+            size = self.size()
+            if size is not None:
+                cache_size.labels(self.name).set(size)
+
+    def stats(self):
+        """
+        Returns a snapshot of the counters and the current size of the cache.
+
+        Returns:
+            dict: hits, misses, evictions (dropped to respect the size bound), expirations and size.
+        """
+        with self._stats_lock:
+            return {**self._stats, "size": self.size()}
+
+    def get(self, key):
+        """
+        Returns the cached value for the key, or None on a miss.
+
+        Args:
+            key (str): The cache key.
+        """
+        value = self._get(key)
+        self.record("misses" if value is None else "hits")
+        return value
+
+    def set(self, key, value):
+        """
+        Stores the value for the key.
+
+        Args:
+            key (str): The cache key.
+            value: The value to cache, not None.
+        """
+        self._set(key, value)
+        self.record_size()
+
+    def add(self, key, value):
+        """
+        Stores the value for the key unless the key holds a value already. Read-through fills use it,
+        so that a row read before a concurrent write never replaces the entry that write stored.
+
+        Args:
+            key (str): The cache key.
+            value: The value to cache, not None.
+
+        Returns:
+            bool: True if the value was stored.
+        """
+        added = self._add(key, value)
+        if added:
+            self.record_size()
+        return added
+
+    def delete(self, key):
+        """
+        Removes the key from the cache if present.
+
+        Args:
+            key (str): The cache key.
+        """
+        self._delete(key)
+        self.record_size()
+
+    def size(self):
+        """Returns the number of cached entries, or None if the backend cannot tell."""
+        return None
+
+    def clear(self):
+        raise NotImplementedError
+
+    def _get(self, key):
+        raise NotImplementedError
+
+    def _set(self, key, value):
+        raise NotImplementedError
+
+    def _add(self, key, value):
+        raise NotImplementedError
+
+    def _delete(self, key):
+        raise NotImplementedError
+
+
+class NullCache(BaseCache):
+    """
+    Cache that stores nothing, used when caching is disabled.
+    """
+
+    def _get(self, key):
+        return None
+
+    def _set(self, key, value):
+        pass
+
+    def _add(self, key, value):
+        return False
+
+    def _delete(self, key):
+        pass
+
+    def size(self):
+        return 0
+
+    def clear(self):
+        pass
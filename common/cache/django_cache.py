@@ -0,0 +1,46 @@
+from django.core.cache import caches
+
+from .base_cache import BaseCache
+
+
+class DjangoCacheAdapter(BaseCache):
+    """
+    Cache backed by one of the Django cache backends configured in CACHES (locmem, file based,
+    memcached, redis...). A shared backend keeps all worker processes consistent.
+    """
+
+    def __init__(self, alias="default", ttl=5, key_prefix="tasks"):
+        """
+        Initializes the adapter.
+
+        Args:
+            alias (str): The CACHES alias to use.
+            ttl (float): Seconds an entry stays valid after it was set.
+            key_prefix (str): Prefix added to every key to share the backend with other users.
+        """
+        super().__init__()
+        self.alias = alias
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    def make_key(self, key):
+        return f"{self.key_prefix}:{key}"
+
+    def _get(self, key):
+        return self.backend.get(self.make_key(key))
+
+    def _set(self, key, value):
+        self.backend.set(self.make_key(key), value, timeout=self.ttl)
+
+    def _add(self, key, value):
+        return self.backend.add(self.make_key(key), value, timeout=self.ttl)
+
+    def _delete(self, key):
+        self.backend.delete(self.make_key(key))
+
+    def clear(self):
+        self.backend.clear()
@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import OrderedDict
+
+from .base_cache import BaseCache
+
+
+class LRUCache(BaseCache):
+    """
+    In-process, thread-safe LRU cache with a size bound and a time to live per entry.
+
+    Each worker process holds its own copy, so entries written by another worker are only seen
+    after the local entry expires; the TTL bounds how stale a read can be.
+    """
+
+    def __init__(self, max_size=10000, ttl=5):
+        """
+        Initializes the cache.
+
+        Args:
+            max_size (int): Maximum number of entries; the least recently used one is evicted beyond it.
+            ttl (float): Seconds an entry stays valid after it was set.
+        """
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.record("expirations")
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def _set(self, key, value):
+        with self._lock:
+            self._store(key, value)
+
+    def _add(self, key, value):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return False
+            self._store(key, value)
+            return True
+
+    def _store(self, key, value):
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.record("evictions")
+
+    def _delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def size(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
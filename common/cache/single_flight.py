@@ -0,0 +1,124 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from common.instrumentation import coalesced_requests
+
+
+class SingleFlight:
+    """
+    Collapses concurrent identical calls onto one in-flight call and shares its result.
+
+    The first caller of a key runs the call; callers of the same key arriving before it returns wait
+    for it and get the same result, or the same exception. Threads (do) and coroutines (ado) share
+    the in-flight calls, so a coroutine can wait for a call made by a thread and the reverse. A call
+    is forgotten as soon as it returns: the next caller of the key runs a new one.
+
+    Results are shared, not copied; callers must not modify them.
+    """
+
+    def __init__(self, name=None):
+        """
+        Initializes the group.
+
+        Args:
+            name (str, optional): Name under which the coalesced calls are exported as a metric.
+        """
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "coalesced": 0}
+
+    def do(self, key, func):
+        """
+        Runs func, or waits for the in-flight call of the same key.
+
+        Args:
+            key (hashable): Identifies the calls returning the same result.
+            func (callable): Called without arguments.
+
+        Returns:
+            The result of func.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = func()
+        except BaseException as error:
+            self._settle(key, future, error=error)
+            raise
+        self._settle(key, future, result=result)
+        return result
+
+    async def ado(self, key, func):
+        """
+        Awaits func(), or the in-flight call of the same key, see do.
+
+        The call runs in a task of its own, so a cancelled caller does not cancel it for the others.
+
+        Args:
+            key (hashable): Identifies the calls returning the same result.
+            func (callable): Returns the awaitable to run.
+
+        Returns:
+            The result of the awaitable.
+        """
+        future, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(func())
+            task.add_done_callback(lambda task: self._settle_task(key, future, task))
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def forget(self, key=None):
+        """
+        Lets the next callers of the key (of every key without one) run a new call instead of waiting
+        for the in-flight one, e.g. after a write that call may not see.
+
+        Args:
+            key (hashable, optional): The key to forget.
+        """
+        with self._lock:
+            if key is None:
+                self._calls.clear()
+            else:
+                self._calls.pop(key, None)
+
+    def stats(self):
+        """
+        Returns a snapshot of the counters.
+
+        Returns:
+            dict: calls made, calls coalesced onto an in-flight one and calls in flight.
+        """
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
+
+    def _join(self, key):
+        """Returns the future of the in-flight call of the key and whether the caller has to make the call."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            self._stats["calls" if leader else "coalesced"] += 1
+        if not leader and self.name:
+            coalesced_requests.labels(self.name).inc()
+        return future, leader
+
+    def _settle(self, key, future, result=None, error=None):
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _settle_task(self, key, future, task):
+        if task.cancelled():
+            self._settle(key, future, error=asyncio.CancelledError())
+        elif task.exception() is not None:
+            self._settle(key, future, error=task.exception())
+        else:
+            self._settle(key, future, result=task.result())
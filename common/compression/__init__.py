@@ -0,0 +1,46 @@
+from loguru import logger
+
+from .codecs import (
+    Codec, Compressor, GzipCodec, BrotliCodec, ZstdCodec, CODECS, parse_accept_encoding, negotiate,
+)
+
+# Default compression level per codec: fast levels with most of the size reduction, see benchmark_compression
+DEFAULT_LEVELS = {"gzip": 6, "br": 5, "zstd": 3}
+
+
+def build_codecs(config):
+    """
+    Builds the enabled codecs from a settings dictionary.
+
+    Args:
+        config (dict): ENCODINGS, the Content-Encoding tokens in order of preference, and LEVELS,
+            the compression level by token. Encodings whose library is not installed are skipped.
+
+    Returns:
+        list: The codecs, most preferred first.
+    """
+    levels = {**DEFAULT_LEVELS, **config.get("LEVELS", {})}
+    codecs = []
+    for name in config.get("ENCODINGS", ["gzip"]):
+        if name not in CODECS:
+            raise ValueError(f"Unknown content encoding: {name}")
+        codec_class, available = CODECS[name]
+        if not available:
+            logger.warning("Content encoding {} is disabled, its library is not installed", name)
+            continue
+        codecs.append(codec_class(levels[name]))
+    return codecs
+
+
+__all__ = [
+    "Codec",
+    "Compressor",
+    "GzipCodec",
+    "BrotliCodec",
+    "ZstdCodec",
+    "CODECS",
+    "DEFAULT_LEVELS",
+    "parse_accept_encoding",
+    "negotiate",
+    "build_codecs",
+]
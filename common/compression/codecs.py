@@ -0,0 +1,222 @@
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, responses fall back to the other encodings
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, responses fall back to the other encodings
+    zstandard = None
+
+
+class Codec:
+    """
+    A content coding (RFC 9110 section 8.4.1) compressing whole bodies or streams of chunks.
+
+    Streams are compressed incrementally: every chunk is flushed so that the client can decode
+    it as soon as it arrives, instead of the compressor holding data back until the stream ends.
+    """
+    # Content-Encoding token of the codec
+    name = None
+
+    def __init__(self, level):
+        """
+        Initializes the codec.
+
+        Args:
+            level (int): The compression level, in the range of the underlying library.
+        """
+        self.level = level
+
+    def compress(self, data):
+        """
+        Compresses a whole body.
+
+        Args:
+            data (bytes): The body.
+
+        Returns:
+            bytes: The encoded body.
+        """
+        raise NotImplementedError
+
+    def compressor(self):
+        """Returns a new incremental compressor, see Compressor."""
+        raise NotImplementedError
+
+    def stream(self, chunks):
+        """
+        Compresses an iterable of chunks incrementally.
+
+        Args:
+            chunks (iterable): The chunks of the body, as bytes.
+
+        Returns:
+            generator: Yields the encoded chunks.
+        """
+        compressor = self.compressor()
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+
+    async def astream(self, chunks):
+        """
+        Compresses an asynchronous iterable of chunks incrementally, see stream.
+
+        Args:
+            chunks (async iterable): The chunks of the body, as bytes.
+
+        Returns:
+            async generator: Yields the encoded chunks.
+        """
+        compressor = self.compressor()
+        async for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+
+
+class Compressor:
+    """Incremental compressor of a Codec; compress() returns the flushed output of every chunk."""
+
+    def compress(self, chunk):
+        raise NotImplementedError
+
+    def finish(self):
+        """Returns the end of the stream."""
+        raise NotImplementedError
+
+
+class ZlibCompressor(Compressor):
+    def __init__(self, level, wbits):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, chunk):
+        if not chunk:
+            return b""
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class GzipCodec(Codec):
+    name = "gzip"
+    # zlib window bits selecting the gzip container
+    WBITS = 16 + zlib.MAX_WBITS
+
+    def compress(self, data):
+        return zlib.compress(data, self.level, self.WBITS)
+
+    def compressor(self):
+        return ZlibCompressor(self.level, self.WBITS)
+
+
+class BrotliCompressor(Compressor):
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk):
+        if not chunk:
+            return b""
+        return self._compressor.process(chunk) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class BrotliCodec(Codec):
+    name = "br"
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.level)
+
+    def compressor(self):
+        return BrotliCompressor(self.level)
+
+
+class ZstdCompressor(Compressor):
+    def __init__(self, compressor):
+        self._compressor = compressor.compressobj()
+
+    def compress(self, chunk):
+        if not chunk:
+            return b""
+        return self._compressor.compress(chunk) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+class ZstdCodec(Codec):
+    name = "zstd"
+
+    # ZstdCompressor instances are not thread safe, so every compression creates its own
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def compressor(self):
+        return ZstdCompressor(zstandard.ZstdCompressor(level=self.level))
+
+
+# The codecs by Content-Encoding token, with whether their library is installed
+CODECS = {
+    GzipCodec.name: (GzipCodec, True),
+    BrotliCodec.name: (BrotliCodec, brotli is not None),
+    ZstdCodec.name: (ZstdCodec, zstandard is not None),
+}
+
+
+def parse_accept_encoding(header):
+    """
+    Parses an Accept-Encoding header.
+
+    Args:
+        header (str): The header value, e.g. "gzip, br;q=0.9, *;q=0".
+
+    Returns:
+        dict: The quality value of every listed coding, lower case.
+    """
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate(header, codecs):
+    """
+    Picks the codec for a request: the coding the client prefers (highest q), ties going to the
+    order of the given codecs.
+
+    Args:
+        header (str): The Accept-Encoding header of the request.
+        codecs (list): The enabled codecs, most preferred first.
+
+    Returns:
+        Codec: The codec to encode the response with, or None to send it unencoded.
+    """
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for codec in codecs:
+        quality = accepted.get(codec.name, wildcard)
+        if quality > best_quality:
+            best, best_quality = codec, quality
+    return best
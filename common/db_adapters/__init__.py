@@ -0,0 +1,17 @@
+from common.db_adapters.errors import (
+    DatabaseError, QueryError, DeadlockError, DatabaseConnectionError, QueryTimeoutError, DatabaseUnavailableError,
+)
+from common.db_adapters.sql_db import SQLDB
+
+__all__ = [
+    "SQLDB", "AsyncSQLDB", "DatabaseError", "QueryError", "DeadlockError", "DatabaseConnectionError",
+    "QueryTimeoutError", "DatabaseUnavailableError",
+]
+
+
+def __getattr__(name):
+    # The asyncio adapter pulls in sqlalchemy.ext.asyncio; only import it once the ASGI path asks for it
+    if name == "AsyncSQLDB":
+        from common.db_adapters.async_sql_db import AsyncSQLDB
+        return AsyncSQLDB
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
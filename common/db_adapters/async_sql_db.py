@@ -0,0 +1,458 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+import threading
+import weakref
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from datetime import datetime, timezone
+from loguru import logger
+
+from common.instrumentation import install_query_timing, install_pool_metrics, pool_checkout, db_errors
+from common.logger import query_log_sampler
+from server.settings import SQL_DETAILS, SQL_POOL, SQL_TIMEOUTS
+from .errors import DatabaseError, DeadlockError, translate_error
+from .sql_db import SQLClauseBuilder, EngineRegistry, build_db_url, circuit_breaker, retry_policy, SEARCH_ORDER_BY
+
+# asyncio drivers replacing the blocking DBAPI driver of each supported backend
+ASYNC_DRIVERS = {
+    "mysql": "aiomysql",
+    "sqlite": "aiosqlite",
+}
+
+
+def build_async_db_url(details):
+    """
+    Builds the SQLAlchemy connection URL from the SQL_DETAILS settings with the asyncio driver of the backend.
+
+    Args:
+        details (dict): The SQL_DETAILS settings dictionary.
+
+    Returns:
+        URL: SQLAlchemy URL object, e.g. mysql+aiomysql://...
+    """
+    db_url = build_db_url(details)
+    backend = db_url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for the {backend} backend")
+    return db_url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+class AsyncEngineRegistry(EngineRegistry):
+    """
+    Registry of SQLAlchemy async engines keyed by the event loop and the connection URL.
+
+    Connections of an async pool belong to the event loop that opened them, so every loop gets
+    its own engine. Under an ASGI server that is one loop and therefore one shared pool per
+    worker process; the engines of a loop are dropped together with the loop.
+    """
+
+    def __init__(self, pool_settings=None, timeouts=None):
+        """
+        Initializes the registry.
+
+        Args:
+            pool_settings (dict, optional): Pool configuration, see SQL_POOL in the settings.
+            timeouts (dict, optional): Connection timeouts, see SQL_TIMEOUTS in the settings.
+        """
+        super().__init__(pool_settings, timeouts)
+        self._engines = weakref.WeakKeyDictionary()
+
+    def engine_options(self, db_url=None):
+        """
+        Translates the pool settings into keyword arguments for create_async_engine. The queue pool
+        is requested explicitly, as some async dialects (e.g. aiosqlite) default to no pooling.
+
+        Args:
+            db_url (URL or str, optional): The database connection URL.
+
+        Returns:
+            dict: Keyword arguments for create_async_engine.
+        """
+        return {**super().engine_options(db_url), "poolclass": AsyncAdaptedQueuePool}
+
+    def connect_args(self):
+        """
+        Returns the timeouts passed to aiomysql when a connection is opened. aiomysql has no socket read
+        and write timeouts; AsyncSQLDB bounds every statement with asyncio.timeout instead.
+
+        Returns:
+            dict: The connect arguments.
+        """
+        args = super().connect_args()
+        del args["read_timeout"], args["write_timeout"]
+        return args
+
+    def get_engine(self, db_url):
+        """
+        Returns the async engine for the given URL on the running event loop, creating it on first use.
+
+        Args:
+            db_url (URL or str): The database connection URL with an asyncio driver.
+
+        Returns:
+            AsyncEngine: The shared SQLAlchemy async engine for the URL.
+        """
+        loop = asyncio.get_running_loop()
+        key = make_url(db_url).render_as_string(hide_password=False)
+        engine = self._engines.get(loop, {}).get(key)
+        if engine is None:
+            with self._lock:
+                engines = self._engines.setdefault(loop, {})
+                engine = engines.get(key)
+                if engine is None:
+                    logger.info("Creating async database engine for {}", make_url(key))
+                    engine = create_async_engine(key, **self.engine_options(key))
+                    install_query_timing(engine.sync_engine)
+                    install_pool_metrics(engine.sync_engine, "async")
+                    engines[key] = engine
+        return engine
+
+    def reset_after_fork(self):
+        """
+        Forgets the engines inherited from the parent process; their event loops do not run in the child.
+        """
+        self._lock = threading.Lock()
+        self._engines = weakref.WeakKeyDictionary()
+
+    async def dispose_all(self):
+        """
+        Closes all pooled connections of the running event loop and forgets its engines.
+        """
+        engines = self._engines.pop(asyncio.get_running_loop(), {})
+        for engine in engines.values():
+            await engine.dispose()
+
+
+async_engine_registry = AsyncEngineRegistry(SQL_POOL, SQL_TIMEOUTS)
+os.register_at_fork(after_in_child=async_engine_registry.reset_after_fork)
+
+
+class AsyncSQLDB(SQLClauseBuilder):
+    """
+    asyncio counterpart of SQLDB for the ASGI request path, built on SQLAlchemy's async engine.
+
+    Statements are awaited instead of blocking a worker thread, so one process can serve many
+    concurrent requests while they wait on the database. Every operation runs in its own
+    transaction; a write and the read-back of the written row share one connection.
+    """
+
+    def __init__(self):
+        """
+        Initializes the AsyncSQLDB class with the configured database URL. The engine is created
+        lazily, as it belongs to the event loop it is first used on.
+        """
+        self.db_url = build_async_db_url(SQL_DETAILS)
+        logger.debug("Async database URL: {}", self.db_url)
+
+    @property
+    def engine(self):
+        """The shared async engine of the running event loop."""
+        return async_engine_registry.get_engine(self.db_url)
+
+    @asynccontextmanager
+    async def connection(self, begin=False):
+        """
+        Checks out a connection from the pool for the block and returns it afterwards.
+
+        Args:
+            begin (bool): Run the block in a transaction that is committed when it ends (rolled back on an exception).
+
+        Yields:
+            AsyncConnection: The connection.
+        """
+        with pool_checkout():
+            connection = await self.engine.connect().start()
+        try:
+            if begin:
+                async with connection.begin():
+                    yield connection
+            else:
+                yield connection
+        finally:
+            await connection.close()
+
+    async def execute_query(self, query, params=None, connection=None, idempotent=False):
+        """
+        Executes a given SQL query with parameters. Without a connection one is checked out from the
+        pool and the statement is committed on its own.
+
+        Statements on a connection of their own are retried like in SQLDB.execute_query; a statement
+        of an enclosing transaction is not, as the transaction is rolled back when it fails.
+
+        Args:
+            query (str or Executable): The SQL query or the Core statement to execute.
+            params (dict, optional): The parameters to bind to the query.
+            connection (AsyncConnection, optional): The connection of an enclosing transaction.
+            idempotent (bool): Whether the statement may run twice, e.g. a read.
+
+        Returns:
+            result: The buffered result of the query execution.
+
+        Raises:
+            DatabaseError: The typed error of the statement, see common.db_adapters.errors.
+        """
+        if query_log_sampler.sample():
+            logger.debug("Executing async query: {} with params: {}", query, params)
+        statement = text(query) if isinstance(query, str) else query
+        attempt = 1
+        while True:
+            try:
+                return await self.run_statement(statement, params, connection)
+            except DatabaseError as error:
+                if connection is not None or not retry_policy.should_retry(error, attempt, idempotent):
+                    raise
+            await asyncio.sleep(retry_policy.delay(attempt))
+            attempt += 1
+
+    async def run_statement(self, statement, params, connection=None):
+        """Runs one attempt of a statement, raising the typed error on failure."""
+        if connection is not None:
+            # Guarded by the circuit breaker of the transaction owning the connection, see transaction
+            try:
+                return await self.execute_bounded(connection, statement, params)
+            except (SQLAlchemyError, asyncio.TimeoutError) as e:
+                raise self.database_error(e) from e
+
+        async def autocommit():
+            async with self.connection() as own_connection:
+                result = await self.execute_bounded(own_connection, statement, params)
+                if result.rowcount > 0:
+                    logger.debug("Query executed successfully; committing changes.")
+                    await own_connection.commit()
+                return result
+
+        return await self.guarded(autocommit)
+
+    async def transaction(self, work):
+        """
+        Awaits work(connection) in a transaction on a connection of its own and returns its result.
+
+        The checkout, the statements and the commit all go through the circuit breaker and raise
+        typed errors. A transaction that loses a deadlock is rolled back and run again as a whole.
+
+        Args:
+            work (callable): Coroutine function running the statements of the transaction on the connection.
+
+        Returns:
+            The result of work.
+        """
+        async def run():
+            async with self.connection(begin=True) as connection:
+                return await work(connection)
+
+        attempt = 1
+        while True:
+            try:
+                return await self.guarded(run)
+            except DeadlockError as error:
+                if not retry_policy.should_retry(error, attempt, idempotent=False):
+                    raise
+            await asyncio.sleep(retry_policy.delay(attempt))
+            attempt += 1
+
+    async def guarded(self, operation):
+        """Awaits operation() through the circuit breaker, raising the typed error of a failure."""
+        circuit_breaker.before_call()
+        try:
+            result = await operation()
+        except DatabaseError as error:  # Raised by a statement of the operation
+            circuit_breaker.record(error)
+            raise
+        except (SQLAlchemyError, asyncio.TimeoutError) as e:
+            error = self.database_error(e)
+            circuit_breaker.record(error)
+            raise error from e
+        except BaseException:
+            # Cancelled or failed outside the database: it must not close a half-open circuit
+            circuit_breaker.release()
+            raise
+        circuit_breaker.record()
+        return result
+
+    def database_error(self, error):
+        """Counts and logs a failed statement, checkout or commit and returns its typed error."""
+        db_errors.labels(type(error).__name__).inc()
+        logger.error("SQLAlchemy error occurred: {}", str(error) or type(error).__name__)
+        return translate_error(error)
+
+    async def execute_bounded(self, connection, statement, params):
+        """
+        Executes a statement, giving up after SQL_TIMEOUTS['SOCKET_S'] like the read timeout of the
+        blocking driver does.
+        """
+        try:
+            async with asyncio.timeout(SQL_TIMEOUTS['SOCKET_S']):
+                return await connection.execute(statement, params)
+        except asyncio.TimeoutError:
+            # The driver may still receive the abandoned result, so the connection cannot be reused
+            await connection.invalidate()
+            raise
+
+    async def insert(self, table, data):
+        """Inserts a record into the specified table.
+
+        Args:
+            table (str): The name of the table.
+            data (dict): The data to insert.
+
+        Returns:
+            Row: The inserted row.
+        """
+        logger.debug("Inserting data into {}: {}", table, data)
+        data['created_at'] = datetime.now(timezone.utc)
+        data['updated_at'] = datetime.now(timezone.utc)
+
+        statement = self.insert_statement(table, data.keys())
+
+        # The insert and the read-back share one connection and one transaction
+        async def insert_row(connection):
+            result = await self.execute_query(statement, data, connection=connection)
+            inserted_id = result.inserted_primary_key[0]
+            logger.debug("Fetching the inserted row with ID: {}", inserted_id)
+            return await self.fetch_one(table, {'id': inserted_id}, connection=connection)
+
+        return await self.transaction(insert_row)
+
+    async def update(self, table, data, where, increment=(), fetch=True):
+        """Updates a record in the specified table, see SQLDB.update.
+
+        Args:
+            table (str): The name of the table.
+            data (dict): The data to update.
+            where (dict): The condition for the update.
+            increment (tuple, optional): Columns incremented by one, e.g. ("version",).
+            fetch (bool): Read the updated row back. Without it only the UPDATE is sent.
+
+        Returns:
+            Row or bool: The updated row, or None if no row matches the condition; without fetch
+                whether a row was updated.
+        """
+        logger.debug("Update data: {}, where condition: {}", data, where)
+        data['updated_at'] = datetime.now(timezone.utc)
+        statement = self.update_statement(table, data.keys(), where.keys(), increment=increment)
+        params = {**data, **self.where_params(where)}
+
+        # The update and the read-back share one connection and one transaction
+        async def update_row(connection):
+            result = await self.execute_query(statement, params, connection=connection)
+            if not fetch:
+                return result.rowcount > 0
+            if result.rowcount == 0:
+                return None
+            fetch_where = {column: value for column, value in where.items() if column not in increment}
+            return await self.fetch_one(table, fetch_where, connection=connection)
+
+        return await self.transaction(update_row)
+
+    async def delete(self, table, where):
+        """Deletes a record in the specified table.
+
+        Args:
+            table (str): The name of the table.
+            where (dict): The condition for the deletion.
+
+        Returns:
+            bool: True if a row was deleted.
+        """
+        statement = self.delete_statement(table, where.keys())
+        result = await self.execute_query(statement, self.where_params(where))
+        return result.rowcount > 0
+
+    async def soft_delete(self, table, where, increment=()):
+        """Marks a record as deleted by setting its deleted flag, instead of removing the row.
+
+        Args:
+            table (str): The name of the table.
+            where (dict): The condition for the deletion.
+            increment (tuple, optional): Columns incremented by one, e.g. ("version",).
+
+        Returns:
+            bool: True if a row was marked as deleted.
+        """
+        statement = self.update_statement(table, ("deleted", "updated_at"), where.keys(), increment=increment)
+        params = {"deleted": True, "updated_at": datetime.now(timezone.utc), **self.where_params(where)}
+        result = await self.execute_query(statement, params)
+        return result.rowcount > 0
+
+    async def fetch_one(self, table, where, columns=None, connection=None):
+        """Fetches a single record from the specified table.
+
+        Args:
+            table (str): The name of the table.
+            where (dict): The condition for fetching.
+            columns (list, optional): The columns to fetch. Defaults to all columns.
+            connection (AsyncConnection, optional): The connection of an enclosing transaction.
+
+        Returns:
+            Row: The fetched row, or None.
+        """
+        statement = self.select_statement(table, where.keys(), columns=columns, timeout_ms=SQL_TIMEOUTS['READ_MS'])
+        result = await self.execute_query(statement, self.where_params(where), connection=connection, idempotent=True)
+        return result.fetchone()
+
+    async def fetch_all(self, table, where, page=1, limit=10, order_by=None):
+        """Fetches a page of records from the specified table.
+
+        Args:
+            table (str): The name of the table.
+            where (dict): The condition for fetching.
+            page (int): The page number.
+            limit (int): The number of rows per page.
+            order_by (list, optional): (column, descending) pairs giving the pages a deterministic order.
+
+        Returns:
+            list: The list of fetched rows.
+        """
+        statement = self.select_statement(table, where.keys(), order_by=order_by, paging="offset",
+                                          timeout_ms=SQL_TIMEOUTS['READ_MS'])
+        params = {**self.where_params(where), 'limit': limit, 'offset': (page - 1) * limit}
+        result = await self.execute_query(statement, params, idempotent=True)
+        return result.fetchall()
+
+    async def fetch_keyset(self, table, where, order_by, after=None, limit=10, until=None):
+        """Fetches the records following a position in a deterministic ordering (keyset pagination).
+
+        Args:
+            table (str): The name of the table.
+            where (dict): The condition for fetching.
+            order_by (list): (column, descending) pairs; the last column must be unique (e.g. id).
+            after (list, optional): The order_by values of the last row of the previous page.
+            limit (int): The maximum number of rows to fetch.
+            until (optional): Only fetch records whose first order_by column is below this value.
+
+        Returns:
+            list: The list of fetched rows.
+        """
+        statement = self.select_statement(table, where.keys(), order_by=order_by, paging="keyset" if after else "limit",
+                                          bounded=until is not None, timeout_ms=SQL_TIMEOUTS['READ_MS'])
+        params = {**self.where_params(where), **self.keyset_params(order_by, after or []), 'limit': limit}
+        if until is not None:
+            params['until'] = until
+        result = await self.execute_query(statement, params, idempotent=True)
+        return result.fetchall()
+
+    async def fetch_search(self, table, where, columns, query, after=None, limit=10):
+        """Fetches the records matching a search query, most relevant first (see search_statement).
+
+        Args:
+            table (str): The name of the table.
+            where (dict): The condition for fetching.
+            columns (list): The searched columns.
+            query (str): The search query.
+            after (list, optional): The relevance and id of the last row of the previous page.
+            limit (int): The maximum number of rows to fetch.
+
+        Returns:
+            list: The fetched rows, each with an additional relevance column.
+        """
+        statement = self.search_statement(table, where.keys(), columns, query, seek=bool(after),
+                                          timeout_ms=SQL_TIMEOUTS['SEARCH_MS'])
+        params = {**self.where_params(where), **self.search_params(query),
+                  **self.keyset_params(SEARCH_ORDER_BY, after or []), 'limit': limit}
+        result = await self.execute_query(statement, params, idempotent=True)
+        return result.fetchall()
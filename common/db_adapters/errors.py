@@ -0,0 +1,75 @@
+import asyncio
+
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+
+# MySQL error codes of a deadlock victim, whose transaction the server rolled back
+DEADLOCK_CODES = {1213}
+# MySQL error codes of a statement that exceeded a timeout: innodb_lock_wait_timeout, MAX_EXECUTION_TIME
+# and an interrupted query (e.g. killed by a timeout)
+TIMEOUT_CODES = {1205, 3024, 1317}
+# Client error codes of a connection that could not be opened or broke
+CONNECTION_CODES = {2002, 2003, 2006, 2013, 2055}
+
+
+class DatabaseError(Exception):
+    """Base of the errors raised by the DB adapters; the SQLAlchemy error is chained as __cause__."""
+
+
+class QueryError(DatabaseError):
+    """The statement failed (bad SQL, constraint violation, ...); retrying it gives the same error."""
+
+
+class DeadlockError(DatabaseError):
+    """The statement lost a lock conflict and was rolled back by the server; it can be retried as a whole."""
+
+
+class DatabaseConnectionError(DatabaseError):
+    """The connection could not be opened or broke during the statement, which may or may not have run."""
+
+
+class QueryTimeoutError(DatabaseError):
+    """The statement exceeded its statement, lock wait or driver timeout, or no pooled connection was free in time."""
+
+
+class DatabaseUnavailableError(DatabaseError):
+    """
+    The circuit breaker is open: the database failed repeatedly and is not called until retry_after seconds passed.
+    """
+
+    def __init__(self, message, retry_after=0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def error_code(error):
+    """The error code of the DBAPI error wrapped by a SQLAlchemy error, e.g. 1213 for a MySQL deadlock, or None."""
+    args = getattr(getattr(error, "orig", None), "args", ())
+    return args[0] if args and isinstance(args[0], int) else None
+
+
+def translate_error(error):
+    """
+    Returns the typed DatabaseError for an error raised while running a statement.
+
+    Args:
+        error (Exception): The SQLAlchemy error, or asyncio.TimeoutError of an async statement that ran too long.
+
+    Returns:
+        DatabaseError: The error to raise, with error as its cause.
+    """
+    message = str(error)
+    code = error_code(error)
+    if isinstance(error, (PoolTimeoutError, asyncio.TimeoutError)) or code in TIMEOUT_CODES:
+        typed = QueryTimeoutError(message)
+    elif code in DEADLOCK_CODES or "database is locked" in message:
+        # SQLite reports a write conflict as a locked database; the statement did not run either
+        typed = DeadlockError(message)
+    elif code in CONNECTION_CODES and "timed out" in message:
+        # The driver read or write timeout expired while waiting for the server
+        typed = QueryTimeoutError(message)
+    elif code in CONNECTION_CODES or (isinstance(error, DBAPIError) and error.connection_invalidated):
+        typed = DatabaseConnectionError(message)
+    else:
+        typed = QueryError(message)
+    typed.__cause__ = error
+    return typed
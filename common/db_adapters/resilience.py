@@ -0,0 +1,147 @@
+import random
+import threading
+import time
+
+from loguru import logger
+
+from common.instrumentation import db_circuit_state, db_retries
+from .errors import DatabaseConnectionError, DatabaseUnavailableError, DeadlockError, QueryTimeoutError
+
+# Errors telling that the database is unhealthy, as opposed to errors of a single statement
+FAILURES = (DatabaseConnectionError, QueryTimeoutError)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fails fast while the database is unhealthy instead of letting every request wait for its timeout.
+
+    After FAILURE_THRESHOLD consecutive connection errors or timeouts the circuit opens and statements
+    raise DatabaseUnavailableError without touching the database. After RESET_SECONDS one statement is
+    let through as a probe (half-open): its success closes the circuit, its failure opens it again.
+    The state is per worker process and shared by the sync and async adapters.
+    """
+
+    def __init__(self, failure_threshold=5, reset_seconds=10, clock=time.monotonic):
+        """
+        Initializes the breaker, closed.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit; 0 disables the breaker.
+            reset_seconds (float): Seconds the circuit stays open before a probe is let through.
+            clock (callable): Returns the current time in seconds.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        Checks that a statement may run.
+
+        Raises:
+            DatabaseUnavailableError: While the circuit is open, or half-open with its probe in flight.
+        """
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            remaining = self.opened_at + self.reset_seconds - self.clock()
+            if self.state == OPEN and remaining <= 0:
+                self._set_state(HALF_OPEN)
+                logger.info("Database circuit half-open, probing")
+                return
+        raise DatabaseUnavailableError("Database circuit is open", retry_after=max(remaining, 0))
+
+    def record(self, error=None):
+        """
+        Records the outcome of a statement that was let through.
+
+        Args:
+            error (DatabaseError, optional): The error of the statement, None if it succeeded.
+        """
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            if not isinstance(error, FAILURES):
+                # Any answer of the database, even an error of the statement itself, shows it is up
+                self.failures = 0
+                if self.state != CLOSED:
+                    logger.info("Database circuit closed")
+                    self._set_state(CLOSED)
+                return
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.error("Database circuit opened after {} failures: {}", self.failures, error)
+                self._set_state(OPEN)
+                self.opened_at = self.clock()
+
+    def release(self):
+        """
+        Ends a statement that was let through without an answer of the database, e.g. one that was
+        cancelled or failed in the code around it. A probe neither closes nor extends the open
+        circuit, so the next statement is let through as a new probe.
+        """
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._set_state(OPEN)
+
+    def _set_state(self, state):
+        self.state = state
+        db_circuit_state.set({CLOSED: 0, HALF_OPEN: 1, OPEN: 2}[state])
+
+
+class RetryPolicy:
+    """
+    Bounded retries with exponential backoff and full jitter, so that clients failing together do
+    not retry together.
+
+    Deadlocks are retried for every statement: the server rolled the statement back. Broken connections
+    are only retried for idempotent statements (reads), as a write may have been applied before the
+    connection broke. Timeouts are never retried; the database is already too slow.
+    """
+
+    def __init__(self, attempts=3, base_delay_ms=20, max_delay_ms=500):
+        """
+        Initializes the policy.
+
+        Args:
+            attempts (int): Maximum number of attempts, including the first one.
+            base_delay_ms (float): Upper bound of the delay before the first retry; doubled for every further one.
+            max_delay_ms (float): Upper bound of every delay.
+        """
+        self.attempts = attempts
+        self.base_delay = base_delay_ms / 1000
+        self.max_delay = max_delay_ms / 1000
+
+    def should_retry(self, error, attempt, idempotent):
+        """
+        Tells whether a statement that failed with error on the given attempt (1 for the first) is retried.
+
+        Args:
+            error (DatabaseError): The error of the attempt.
+            attempt (int): The number of the failed attempt.
+            idempotent (bool): Whether running the statement twice is harmless.
+        """
+        if attempt >= self.attempts:
+            return False
+        retried = isinstance(error, DeadlockError) or (idempotent and isinstance(error, DatabaseConnectionError))
+        if retried:
+            db_retries.labels(type(error).__name__).inc()
+            logger.warning("Retrying statement after attempt {} failed: {}", attempt, error)
+        return retried
+
+    def delay(self, attempt):
+        """Seconds to wait before the retry following the given attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
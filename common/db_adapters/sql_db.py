@@ -1,12 +1,597 @@
-from sqlalchemy import create_engine, text
-from sqlalchemy.exc import SQLAlchemyError, NoResultFound, OperationalError
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import create_engine, text, and_, or_, bindparam, case, literal, select, insert, update, delete
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, timezone
 from loguru import logger
 
-from server.settings import SQL_DETAILS
+from common.instrumentation import install_query_timing, install_pool_metrics, pool_checkout, db_errors
+from common.logger import query_log_sampler
+from .errors import DatabaseError, DeadlockError, translate_error
+from .resilience import CircuitBreaker, RetryPolicy
+from .statement_cache import statement_cache
+from server.settings import (
+    SQL_DETAILS, SQL_POOL, SQL_BULK_CHUNK_SIZE, SQL_TIMEOUTS, SQL_RETRY, SQL_CIRCUIT_BREAKER,
+)
+
+
+def build_db_url(details):
+    """
+    Builds the SQLAlchemy connection URL from the SQL_DETAILS settings.
+
+    An explicit ``URL`` entry takes precedence over the individual MySQL credentials, which
+    allows pointing the service at another database (e.g. a local stand-in) without code changes.
+
+    Args:
+        details (dict): The SQL_DETAILS settings dictionary.
+
+    Returns:
+        URL: SQLAlchemy URL object.
+    """
+    if details.get("URL"):
+        return make_url(details["URL"])
+    port = details.get("PORT")
+    return URL.create(
+        "mysql+pymysql",
+        username=details.get("USER"),
+        password=details.get("PASSWORD"),
+        host=details.get("HOST"),
+        port=int(port) if port else None,
+        database=details.get("DB_NAME"),
+    )
+
+
+class EngineRegistry:
+    """
+    Process wide registry of SQLAlchemy engines keyed by the connection URL.
+
+    Every SQLDB instance asks the registry for its engine, so all adapters that talk to the same
+    database share one connection pool per worker process instead of building a new engine
+    (and an empty pool) for every request.
+    """
+
+    def __init__(self, pool_settings=None, timeouts=None):
+        """
+        Initializes the registry.
+
+        Args:
+            pool_settings (dict, optional): Pool configuration, see SQL_POOL in the settings.
+            timeouts (dict, optional): Connection timeouts, see SQL_TIMEOUTS in the settings.
+        """
+        self.pool_settings = pool_settings or {}
+        self.timeouts = timeouts or {}
+        self._engines = {}
+        self._lock = threading.Lock()
+
+    def engine_options(self, db_url=None):
+        """
+        Translates the pool settings into keyword arguments for create_engine, and the timeouts into
+        the connect arguments of the MySQL driver.
+
+        Args:
+            db_url (URL or str, optional): The database connection URL.
+
+        Returns:
+            dict: Keyword arguments for create_engine.
+        """
+        options = {
+            "pool_size": self.pool_settings.get("POOL_SIZE", 5),
+            "max_overflow": self.pool_settings.get("MAX_OVERFLOW", 10),
+            "pool_timeout": self.pool_settings.get("POOL_TIMEOUT", 30),
+            "pool_recycle": self.pool_settings.get("POOL_RECYCLE", 1800),
+            "pool_pre_ping": self.pool_settings.get("POOL_PRE_PING", True),
+        }
+        if db_url is not None and make_url(db_url).get_backend_name() == "mysql":
+            options["connect_args"] = self.connect_args()
+        return options
+
+    def connect_args(self):
+        """
+        Returns the timeouts passed to PyMySQL when a connection is opened.
+
+        Returns:
+            dict: The connect arguments.
+        """
+        return {
+            "connect_timeout": self.timeouts.get("CONNECT_S", 5),
+            # Every socket read and write, so a server that stopped answering fails the statement
+            "read_timeout": self.timeouts.get("SOCKET_S", 30),
+            "write_timeout": self.timeouts.get("SOCKET_S", 30),
+            "init_command": f"SET SESSION innodb_lock_wait_timeout = {self.timeouts.get('LOCK_WAIT_S', 5)}",
+        }
+
+    def get_engine(self, db_url):
+        """
+        Returns the engine for the given URL, creating it on first use.
+
+        Args:
+            db_url (URL or str): The database connection URL.
+
+        Returns:
+            Engine: The shared SQLAlchemy engine for the URL.
+        """
+        key = make_url(db_url).render_as_string(hide_password=False)
+        engine = self._engines.get(key)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(key)
+                if engine is None:
+                    logger.info("Creating database engine for {}", make_url(key))
+                    engine = create_engine(key, **self.engine_options(key))
+                    install_query_timing(engine)
+                    install_pool_metrics(engine, "sync")
+                    self._engines[key] = engine
+        return engine
+
+    def reset_after_fork(self):
+        """
+        Drops the pooled connections inherited from the parent process.
+
+        Sockets opened before a fork must not be shared between workers, so the child discards
+        them without closing (closing would terminate the parent's connections) and opens its own.
+        """
+        self._lock = threading.Lock()
+        for engine in self._engines.values():
+            engine.dispose(close=False)
+
+    def dispose_all(self):
+        """
+        Closes all pooled connections and forgets the registered engines.
+        """
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+
+
+engine_registry = EngineRegistry(SQL_POOL, SQL_TIMEOUTS)
+
+# Health of the configured database as seen by this worker, shared by the sync and async adapters
+circuit_breaker = CircuitBreaker(SQL_CIRCUIT_BREAKER['FAILURE_THRESHOLD'], SQL_CIRCUIT_BREAKER['RESET_SECONDS'])
+
+retry_policy = RetryPolicy(SQL_RETRY['ATTEMPTS'], SQL_RETRY['BASE_DELAY_MS'], SQL_RETRY['MAX_DELAY_MS'])
+
+# uWSGI forks workers from the master after the application is loaded (unless lazy-apps is on),
+# so every worker has to start with its own, empty pools.
+os.register_at_fork(after_in_child=engine_registry.reset_after_fork)
+try:
+    from uwsgidecorators import postfork
+    postfork(engine_registry.reset_after_fork)
+except ImportError:
+    pass
+
+# The unit of work active in the current thread or coroutine, see UnitOfWork
+current_unit_of_work = ContextVar("current_unit_of_work", default=None)
+
+
+class UnitOfWork:
+    """
+    Request scoped unit of work holding one connection and one transaction.
+
+    While a unit of work is active every SQLDB operation on the same engine joins its connection
+    instead of checking out its own, and the transaction is committed once when the unit of work
+    ends (or rolled back if it ends with an exception). The connection is only checked out from
+    the pool when the first statement runs. Nested units of work join the outermost one.
+
+    Usage:
+        with UnitOfWork():
+            task_db.create_task(data)
+            task_db.update_task(task_id, data)
+    """
+
+    def __init__(self, engine=None):
+        """
+        Initializes the unit of work.
+
+        Args:
+            engine (Engine, optional): The engine to work on. Defaults to the configured database engine.
+        """
+        self._engine = engine
+        self._connection = None
+        self._token = None
+        self._outer = None
+        self._commit_callbacks = []
+        # Whether a statement succeeded in the current transaction, see restart
+        self._executed = False
+
+    @property
+    def engine(self):
+        """The engine this unit of work runs on."""
+        if self._engine is None:
+            self._engine = engine_registry.get_engine(build_db_url(SQL_DETAILS))
+        return self._engine
+
+    @property
+    def connected(self):
+        """Whether a connection has been checked out, i.e. whether ending the unit of work talks to the database."""
+        if self._outer is not None:
+            return self._outer.connected
+        return self._connection is not None
+
+    def connection(self):
+        """
+        Returns the connection of the unit of work, checking it out and beginning the transaction on first use.
+
+        Returns:
+            connection: SQLAlchemy connection object.
+        """
+        if self._outer is not None:
+            return self._outer.connection()
+        if self._connection is None:
+            logger.debug("Establishing the unit of work database connection.")
+            with pool_checkout():
+                self._connection = self.engine.connect()
+            self._connection.begin()
+        return self._connection
+
+    @property
+    def joined(self):
+        """Whether this unit of work joined an outer one, which owns the transaction."""
+        return self._outer is not None
+
+    def execute(self, statement, params=None):
+        """
+        Runs a statement in the transaction of the unit of work.
+
+        Args:
+            statement (Executable): The statement.
+            params (dict or list, optional): The parameters to bind.
+
+        Returns:
+            result: The result of the statement.
+        """
+        if self._outer is not None:
+            return self._outer.execute(statement, params)
+        result = self.connection().execute(statement, params)
+        self._executed = True
+        return result
+
+    def restart(self):
+        """
+        Rolls back and releases the connection after the first statement of the transaction failed, so
+        that the statement can be retried on a new connection. Once a statement succeeded the transaction
+        cannot be restarted without losing its work.
+
+        Returns:
+            bool: Whether the transaction was restarted.
+        """
+        if self._outer is not None:
+            return self._outer.restart()
+        if self._executed:
+            return False
+        if self._connection is not None:
+            try:
+                self._connection.rollback()
+            except SQLAlchemyError:
+                pass  # A broken connection was invalidated and is discarded by the pool
+            self._release()
+        return True
+
+    def joins(self, engine):
+        """
+        Tells whether statements on the given engine run inside this unit of work.
+
+        Args:
+            engine (Engine): The engine of the caller.
+
+        Returns:
+            bool: True if the caller should use this unit of work's connection.
+        """
+        return self.engine is engine
+
+    def on_commit(self, callback):
+        """
+        Registers a callback to run once the transaction has been committed, e.g. to update a cache.
+        The callback is dropped if the unit of work is rolled back.
+
+        Args:
+            callback (callable): Function without arguments.
+        """
+        if self._outer is not None:
+            self._outer.on_commit(callback)
+        else:
+            self._commit_callbacks.append(callback)
+
+    def commit(self):
+        """Commits the transaction and releases the connection. A joined unit of work leaves this to the outermost one."""
+        if self._outer is not None:
+            return
+        if self._connection is not None:
+            logger.debug("Committing the unit of work.")
+            try:
+                self._connection.commit()
+            finally:
+                self._release()
+        callbacks, self._commit_callbacks = self._commit_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        """Rolls back the transaction and releases the connection. A joined unit of work leaves this to the outermost one."""
+        if self._outer is not None:
+            return
+        self._commit_callbacks = []
+        if self._connection is not None:
+            logger.debug("Rolling back the unit of work.")
+            try:
+                self._connection.rollback()
+            finally:
+                self._release()
+
+    def _release(self):
+        self._connection.close()
+        self._connection = None
+        self._executed = False
+
+    def __enter__(self):
+        outer = current_unit_of_work.get()
+        if outer is not None and (self._engine is None or outer.joins(self._engine)):
+            self._outer = outer
+        self._token = current_unit_of_work.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        current_unit_of_work.reset(self._token)
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
+
+
+def on_commit(callback):
+    """
+    Runs the callback after the active unit of work commits, or right away outside of a unit of work.
+
+    Args:
+        callback (callable): Function without arguments.
+    """
+    unit_of_work = current_unit_of_work.get()
+    if unit_of_work is None:
+        callback()
+    else:
+        unit_of_work.on_commit(callback)
+
+
+# Search queries are cut to this many words, which bounds the number of LIKE fallback statement shapes
+SEARCH_MAX_TERMS = 8
+
+# Results of a full-text search, most relevant first with the id as tie-breaker
+SEARCH_ORDER_BY = [("relevance", True), ("id", True)]
+
+
+class SQLClauseBuilder:
+    """
+    Builds the SQLAlchemy Core statements shared by the sync and async DB adapters.
+
+    Statements are cached per shape in the StatementCache and only take bound parameters, so
+    table and column names are always validated identifiers. WHERE conditions bind their values
+    as ``where_<column>``, keyset positions as ``after_<column>``.
+    """
+
+    def reflection_bind(self):
+        """Returns where undeclared tables are reflected from, or None if tables must be declared."""
+        return None
+
+    def table(self, name):
+        """Returns the Table of the given name, see StatementCache.table."""
+        return statement_cache.table(name, self.reflection_bind())
+
+    def where_params(self, where):
+        """Returns the bound parameters of the conditions built by where_conditions."""
+        return {f"where_{column}": value for column, value in where.items()}
+
+    def where_conditions(self, table, columns, in_column=None):
+        """Builds the equality conditions on the given columns, and in_column IN the expanding list bound as values."""
+        conditions = [column == bindparam(f"where_{column.name}") for column in statement_cache.columns(table, columns)]
+        if in_column:
+            column, = statement_cache.columns(table, [in_column])
+            conditions.insert(0, column.in_(bindparam("values", expanding=True)))
+        return conditions
+
+    def order_columns(self, table, order_by):
+        """Resolves (column, descending) pairs to (Column, descending) pairs."""
+        columns = statement_cache.columns(table, [column for column, _ in order_by])
+        return [(column, descending) for column, (_, descending) in zip(columns, order_by)]
+
+    def seek_condition(self, order_columns):
+        """Builds the keyset condition selecting the rows after the position bound as after_<column>.
+
+        (a, b) > (:a, :b) is expanded to a > :a OR (a = :a AND b > :b), which also allows mixed directions.
+        """
+        conditions = []
+        for index, (column, descending) in enumerate(order_columns):
+            equal_to = [previous == bindparam(f"after_{previous.name}") for previous, _ in order_columns[:index]]
+            after = bindparam(f"after_{column.name}")
+            conditions.append(and_(*equal_to, column < after if descending else column > after))
+        return or_(*conditions)
+
+    def keyset_params(self, order_by, after):
+        """Returns the bound parameters of a seek condition built by seek_condition."""
+        if after and len(after) != len(order_by):
+            # A short position would leave parameters of the seek condition unbound
+            raise ValueError(f"Expected {len(order_by)} position values, got {len(after)}")
+        return {f"after_{column}": value for (column, _), value in zip(order_by, after)}
+
+    def insert_statement(self, table, columns):
+        """Returns the INSERT statement for the table after validating the columns.
+
+        The VALUES clause follows the keys of the bound parameters, which SQLAlchemy's compiled
+        cache already tells apart, so one construct serves every column set.
+        """
+        def build():
+            return insert(self.table(table))
+        statement_cache.columns(self.table(table), columns)
+        return statement_cache.statement(("insert", table), build)
+
+    def update_statement(self, table, columns, where, in_column=None, increment=()):
+        """Returns the UPDATE statement setting the given columns on the rows matching the where columns (and in_column IN :values).
+
+        The increment columns are additionally set to their current value plus one, e.g. a row version.
+        """
+        def build():
+            table_obj = self.table(table)
+            statement_cache.columns(table_obj, columns)
+            statement = update(table_obj).where(*self.where_conditions(table_obj, where, in_column))
+            if increment:
+                statement = statement.values({column: column + 1 for column in statement_cache.columns(table_obj, increment)})
+            return statement
+        key = ("update", table, tuple(columns), tuple(where), in_column, tuple(increment))
+        return statement_cache.statement(key, build)
+
+    def delete_statement(self, table, where, in_column=None):
+        """Returns the DELETE statement for the rows matching the where columns (and in_column IN :values)."""
+        def build():
+            table_obj = self.table(table)
+            return delete(table_obj).where(*self.where_conditions(table_obj, where, in_column))
+        return statement_cache.statement(("delete", table, tuple(where), in_column), build)
+
+    def archive_statements(self, table, archive_table, where, key, timestamp_column):
+        """Returns the statements moving a batch of rows into the archive table.
+
+        The SELECT picks up to :limit keys of rows matching the where columns whose timestamp column
+        is older than :before, in key order; the INSERT ... SELECT copies the rows with the keys
+        bound as values into the archive table and the DELETE removes them.
+
+        Args:
+            table (str): The name of the table.
+            archive_table (str): The name of the archive table, with the columns of the table.
+            where (iterable): The columns compared for equality with where_<column>.
+            key (str): The unique column identifying a row, e.g. 'id'.
+            timestamp_column (str): The column compared with :before, e.g. 'updated_at'.
+
+        Returns:
+            tuple: The (select, insert, delete) statements.
+        """
+        def build():
+            table_obj, archive_obj = self.table(table), self.table(archive_table)
+            key_column, timestamp = statement_cache.columns(table_obj, [key, timestamp_column])
+            columns = statement_cache.columns(table_obj, [column.name for column in table_obj.columns])
+            statement_cache.columns(archive_obj, [column.name for column in columns])
+            conditions = self.where_conditions(table_obj, where)
+            select_keys = (select(key_column).where(*conditions, timestamp < bindparam("before"))
+                           .order_by(key_column).limit(bindparam("limit")))
+            copy = insert(archive_obj).from_select(
+                [column.name for column in columns],
+                select(*columns).where(*self.where_conditions(table_obj, where, key)),
+            )
+            return select_keys, copy, delete(table_obj).where(*self.where_conditions(table_obj, where, key))
+        cache_key = ("archive", table, archive_table, tuple(where), key, timestamp_column)
+        return statement_cache.statement(cache_key, build)
+
+    def max_execution_time(self, statement, timeout_ms):
+        """Adds the MySQL optimizer hint aborting the SELECT after timeout_ms; other backends ignore it."""
+        if not timeout_ms:
+            return statement
+        return statement.prefix_with(f"/*+ MAX_EXECUTION_TIME({int(timeout_ms)}) */", dialect="mysql")
+
+    def select_statement(self, table, where, columns=None, order_by=None, paging=None, in_column=None, bounded=False,
+                         timeout_ms=0, for_update=False):
+        """Returns the SELECT statement for the rows matching the where columns.
+
+        Args:
+            table (str): The name of the table.
+            where (iterable): The columns compared for equality with where_<column>.
+            columns (list, optional): The columns to fetch. Defaults to all columns.
+            order_by (list, optional): (column, descending) pairs.
+            paging (str, optional): "offset" binds limit and offset, "limit" only limit, "keyset"
+                additionally seeks past the after_<column> position of order_by.
+            in_column (str, optional): Additionally match in_column against the expanding list bound as values.
+            bounded (bool): Only select rows whose first order_by column is below :until.
+            timeout_ms (int): Abort the statement after this many milliseconds (MySQL); 0 for no limit.
+            for_update (bool): Lock the selected rows until the transaction ends (SELECT ... FOR UPDATE).
+
+        Returns:
+            Select: The statement.
+        """
+        def build():
+            table_obj = self.table(table)
+            selected = statement_cache.columns(table_obj, columns) if columns else [table_obj]
+            statement = select(*selected).where(*self.where_conditions(table_obj, where, in_column))
+            if order_by:
+                order_columns = self.order_columns(table_obj, order_by)
+                if bounded:
+                    statement = statement.where(order_columns[0][0] < bindparam("until"))
+                if paging == "keyset":
+                    statement = statement.where(self.seek_condition(order_columns))
+                statement = statement.order_by(*[column.desc() if descending else column.asc()
+                                                 for column, descending in order_columns])
+            if paging:
+                statement = statement.limit(bindparam("limit"))
+            if paging == "offset":
+                statement = statement.offset(bindparam("offset"))
+            if for_update:
+                statement = statement.with_for_update()
+            return self.max_execution_time(statement, timeout_ms)
+        key = ("select", table, tuple(columns or ()), tuple(where), tuple(order_by or ()), paging, in_column, bounded,
+               timeout_ms, for_update)
+        return statement_cache.statement(key, build)
+
+    def search_terms(self, query):
+        """Splits a search query into at most SEARCH_MAX_TERMS words with the LIKE wildcards escaped."""
+        terms = query.split()[:SEARCH_MAX_TERMS]
+        return [term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") for term in terms]
+
+    def search_params(self, query):
+        """Returns the bound parameters of a statement built by search_statement for the query."""
+        if self.db_url.get_backend_name() == "mysql":
+            return {"q": query}
+        params = {}
+        for index, term in enumerate(self.search_terms(query)):
+            params[f"term_{index}"] = f"{term}%"  # The value starts with the term
+            params[f"word_{index}"] = f"% {term}%"  # A later word starts with the term
+        return params
+
+    def search_statement(self, table, where, columns, query, seek=False, timeout_ms=0):
+        """Returns the SELECT of the rows matching a search query, most relevant first, with a relevance column.
+
+        MySQL ranks with MATCH (columns) AGAINST (:q) on the FULLTEXT index of the columns. Other
+        backends (e.g. a local SQLite) fall back to LIKE prefix matching and rank by the number of
+        query terms that start a word of the columns.
+
+        Args:
+            table (str): The name of the table.
+            where (iterable): The columns compared for equality with where_<column>.
+            columns (list): The searched columns.
+            query (str): The search query; only its number of terms shapes the fallback statement.
+            seek (bool): Whether to seek past the after_relevance / after_id position.
+            timeout_ms (int): Abort the statement after this many milliseconds (MySQL); 0 for no limit.
 
+        Returns:
+            Select: The statement.
+        """
+        backend = self.db_url.get_backend_name()
+        term_count = 0 if backend == "mysql" else len(self.search_terms(query))
+
+        def build():
+            table_obj = self.table(table)
+            searched = statement_cache.columns(table_obj, columns)
+            if backend == "mysql":
+                relevance = mysql_match(*searched, against=bindparam("q")).in_natural_language_mode()
+            else:
+                relevance = literal(0)
+                for index in range(term_count):
+                    matches = or_(*[or_(column.like(bindparam(f"term_{index}"), escape="\\"),
+                                        column.like(bindparam(f"word_{index}"), escape="\\"))
+                                    for column in searched])
+                    relevance = relevance + case((matches, 1), else_=0)
+            relevance = relevance.label("relevance")
+            order_columns = [(relevance, True), (table_obj.c.id, True)]
+            statement = select(table_obj, relevance).where(*self.where_conditions(table_obj, where), relevance > 0)
+            if seek:
+                statement = statement.where(self.seek_condition(order_columns))
+            statement = statement.order_by(relevance.desc(), table_obj.c.id.desc()).limit(bindparam("limit"))
+            return self.max_execution_time(statement, timeout_ms)
+        key = ("search", table, tuple(where), tuple(columns), backend, term_count, seek, timeout_ms)
+        return statement_cache.statement(key, build)
 
-class SQLDB:
+
+class SQLDB(SQLClauseBuilder):
     """
     DB class responsible for managing database connection and session lifecycle.
     It provides methods for getting and closing sessions, as well as executing queries.
@@ -14,18 +599,11 @@ class SQLDB:
 
     def __init__(self):
         """
-        Initializes the SQLDB class with a given database URL and creates a connection engine.
+        Initializes the SQLDB class with the configured database URL and the shared connection engine.
         """
-        self.db_url = (
-            "mysql+pymysql://" +
-            SQL_DETAILS.get("USER", '') + ":" +
-            SQL_DETAILS.get("PASSWORD", '') + "@" +
-            SQL_DETAILS.get("HOST", '') + ":" +
-            SQL_DETAILS.get("PORT", '') + "/" +
-            SQL_DETAILS.get("DB_NAME", '')
-        )
-        logger.debug(f"Database URL: {self.db_url}")
-        self.engine = create_engine(self.db_url)
+        self.db_url = build_db_url(SQL_DETAILS)
+        logger.debug("Database URL: {}", self.db_url)
+        self.engine = engine_registry.get_engine(self.db_url)
 
     def get_connection(self):
         """
@@ -34,8 +612,9 @@ class SQLDB:
         Returns:
             connection: SQLAlchemy connection object.
         """
-        logger.info("Establishing a new database connection.")
-        return self.engine.connect()
+        logger.debug("Establishing a new database connection.")
+        with pool_checkout():
+            return self.engine.connect()
 
     def close_connection(self, connection):
         """
@@ -44,45 +623,118 @@ class SQLDB:
         Args:
             connection: SQLAlchemy connection object to be closed.
         """
-        logger.info("Closing the database connection.")
+        logger.debug("Closing the database connection.")
         connection.close()
 
-    def execute_query(self, query, params=None):
+    def unit_of_work(self):
+        """
+        Returns a unit of work on this adapter's engine, see UnitOfWork.
+
+        Returns:
+            UnitOfWork: The unit of work context manager.
+        """
+        return UnitOfWork(self.engine)
+
+    def reflection_bind(self):
+        """Undeclared tables are reflected from the engine on first use."""
+        return self.engine
+
+    def execute_query(self, query, params=None, idempotent=False):
         """
-        Executes a given SQL query with parameters, managing the connection manually.
+        Executes a given SQL query with parameters. Inside an active unit of work the query joins
+        its connection and transaction, otherwise the connection is managed manually.
+
+        Deadlocked statements, and idempotent statements on a broken connection, are retried with
+        backoff (see RetryPolicy) unless they ran in a transaction that already did other work.
+        While the circuit breaker is open the database is not called at all.
 
         Args:
-            query (str): The SQL query to execute.
-            params (dict, optional): The parameters to bind to the query.
+            query (str or Executable): The SQL query or the Core statement to execute.
+            params (dict or list, optional): The parameters to bind to the query; a list executes it once per item.
+            idempotent (bool): Whether the statement may run twice, e.g. a read.
 
         Returns:
-            result: The result of the query execution or an error message.
+            result: The result of the query execution.
+
+        Raises:
+            DatabaseError: The typed error of the statement, see common.db_adapters.errors.
         """
-        logger.debug(f"Executing query: {query} with params: {params}")
+        if query_log_sampler.sample():
+            logger.debug("Executing query: {} with params: {}", query, params)
+        statement = text(query) if isinstance(query, str) else query
+        attempt = 1
+        while True:
+            unit_of_work = current_unit_of_work.get()
+            if unit_of_work is not None and not unit_of_work.joins(self.engine):
+                unit_of_work = None
+            try:
+                return self.run_statement(statement, params, unit_of_work)
+            except DatabaseError as error:
+                if not retry_policy.should_retry(error, attempt, idempotent):
+                    raise
+                if unit_of_work is not None and not unit_of_work.restart():
+                    raise
+            time.sleep(retry_policy.delay(attempt))
+            attempt += 1
+
+    def run_statement(self, statement, params, unit_of_work=None):
+        """Runs one attempt of a statement through the circuit breaker, raising the typed error on failure."""
+        circuit_breaker.before_call()
+        try:
+            if unit_of_work is not None:
+                # Committed (or rolled back) once when the unit of work ends
+                result = unit_of_work.execute(statement, params)
+            else:
+                result = self.execute_autocommit(statement, params)
+        except SQLAlchemyError as e:
+            db_errors.labels(type(e).__name__).inc()
+            logger.error("SQLAlchemy error occurred: {}", str(e))
+            error = translate_error(e)
+            circuit_breaker.record(error)
+            raise error from e
+        except BaseException:
+            # Not an answer of the database: it must not close a half-open circuit
+            circuit_breaker.release()
+            raise
+        circuit_breaker.record()
+        return result
+
+    def execute_autocommit(self, statement, params):
+        """Runs a statement on a connection of its own and commits it."""
         connection = self.get_connection()
         try:
-            result = connection.execute(text(query), params)
+            result = connection.execute(statement, params)
             if result.rowcount > 0:
-                logger.info("Query executed successfully; committing changes.")
+                logger.debug("Query executed successfully; committing changes.")
                 connection.commit()
             return result
-        except SQLAlchemyError as e:
-            logger.error(f"SQLAlchemy error occurred: {str(e)}")
-            return str(e)  # Return the error message as a string
         finally:
             self.close_connection(connection)
 
-    def set_clause(self, data):
-        """Generates a SET clause string and parameters."""
-        set_clause = ', '.join([f"{key} = :{key}" for key in data.keys()])
-        logger.debug(f"Generated SET clause: {set_clause}")
-        return set_clause, data
+    def transaction(self, work):
+        """
+        Runs work() in a unit of work on this adapter's engine and returns its result.
+
+        A transaction of its own that loses a deadlock is rolled back and run again as a whole. Inside
+        an active unit of work the work joins it, and a deadlock is raised to its owner.
+
+        Args:
+            work (callable): Runs the statements of the transaction.
 
-    def where_clause(self, where):
-        """Generates a WHERE clause string and parameters."""
-        where_clause = ' AND '.join([f"{key} = :{key}" for key in where.keys()])
-        logger.debug(f"Generated WHERE clause: {where_clause}")
-        return where_clause, where
+        Returns:
+            The result of work().
+        """
+        attempt = 1
+        while True:
+            unit_of_work = self.unit_of_work()
+            try:
+                with unit_of_work:
+                    return work()
+            except DeadlockError as error:
+                if unit_of_work.joined or not retry_policy.should_retry(error, attempt, idempotent=False):
+                    raise
+            time.sleep(retry_policy.delay(attempt))
+            attempt += 1
 
     def insert(self, table, data):
         """Inserts a record into the specified table.
@@ -92,57 +744,56 @@ class SQLDB:
             data (dict): The data to insert.
 
         Returns:
-            tuple or str: The inserted row as a dictionary or an error message.
+            Row: The inserted row.
         """
-        logger.info(f"Inserting data into {table}: {data}")
+        logger.debug("Inserting data into {}: {}", table, data)
         data['created_at'] = datetime.now(timezone.utc)
         data['updated_at'] = datetime.now(timezone.utc)
+        statement = self.insert_statement(table, data.keys())
 
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join([f":{key}" for key in data.keys()])
+        # The insert and the read-back share one connection and one transaction
+        with self.unit_of_work():
+            result = self.execute_query(statement, data)
 
-        query = f'INSERT INTO {table} ({columns}) VALUES ({placeholders})'
+            # Fetch the inserted row based on the primary key (assuming the primary key is 'id')
+            inserted_id = result.inserted_primary_key[0]
 
-        # Execute the insert operation
-        result = self.execute_query(query, data)
+            logger.debug("Fetching the inserted row with ID: {}", inserted_id)
+            return self.fetch_one(table, {'id': inserted_id})  # Fetch and return the inserted row
 
-        if isinstance(result, str):  # If it's an error message
-            logger.error(f"Failed to insert data into {table}: {result}")
-            raise OperationalError(f"Failed to insert a new task: {result}")
-
-        # Fetch the last inserted row based on the primary key (assuming the primary key is 'id')
-        last_inserted_id = result.lastrowid  # Get the last inserted ID (for SQLite)
-
-        logger.info(f"Fetching the inserted row with ID: {last_inserted_id}")
-        return self.fetch_one(table, {'id': last_inserted_id})  # Fetch and return the inserted row
-
-    def update(self, table, data, where):
+    def update(self, table, data, where, increment=(), fetch=True):
         """Updates a record in the specified table.
 
+        A where condition on an increment column (e.g. version) makes the update conditional: it only
+        applies if no one changed the row since that version was read, without locking the row.
+
         Args:
             table (str): The name of the table.
             data (dict): The data to update.
             where (dict): The condition for the update.
+            increment (tuple, optional): Columns incremented by one, e.g. ("version",).
+            fetch (bool): Read the updated row back. Without it only the UPDATE is sent.
 
         Returns:
-            int: The number of updated rows or an error message.
+            Row or bool: The updated row, or None if no row matches the condition; without fetch
+                whether a row was updated.
         """
-        logger.info("Updating record in database.")
-        logger.debug(f"Update data: {data}, where condition: {where}")
+        logger.debug("Updating record in database.")
+        logger.debug("Update data: {}, where condition: {}", data, where)
         data['updated_at'] = datetime.now(timezone.utc)
-        set_clause, set_params = self.set_clause(data)
-        where_clause, where_params = self.where_clause(where)
+        statement = self.update_statement(table, data.keys(), where.keys(), increment=increment)
+        params = {**data, **self.where_params(where)}
 
-        query = f'UPDATE {table} SET {set_clause} WHERE {where_clause}'
-        params = {**set_params, **where_params}
-        logger.debug(f"Update DB query: {query} with params: {params}")
-
-        result = self.execute_query(query, params)
-        if isinstance(result, str):  # If it's an error message
-            logger.error(f"Failed to update record in {table}: {result}")
-            raise OperationalError(f"Failed to update the task with {where.get('task_id')} and {result}")
-        logger.info("Record updated successfully.")
-        return self.fetch_one(table, where)
+        # The update and the read-back share one connection and one transaction
+        with self.unit_of_work():
+            result = self.execute_query(statement, params)
+            logger.debug("Record updated successfully.")
+            if not fetch:
+                return result.rowcount > 0
+            if result.rowcount == 0:
+                return None
+            # The incremented columns no longer hold the values matched by the update
+            return self.fetch_one(table, {column: value for column, value in where.items() if column not in increment})
 
     def delete(self, table, where):
         """Deletes a record in the specified table.
@@ -152,58 +803,387 @@ class SQLDB:
             where (dict): The condition for the deletion.
 
         Returns:
-            int: The number of deleted rows or an error message.
+            bool: True if a row was deleted.
         """
-        logger.info("Deleting record from database.")
-        where_clause, where_params = self.where_clause(where)
+        logger.debug("Deleting record from database.")
+        statement = self.delete_statement(table, where.keys())
+        result = self.execute_query(statement, self.where_params(where))
+        logger.debug("Record deleted successfully.")
+        return result.rowcount > 0
+
+    def soft_delete(self, table, where, increment=()):
+        """Marks a record as deleted by setting its deleted flag, instead of removing the row.
 
-        query = f'DELETE FROM {table} WHERE {where_clause}'
-        logger.debug(f"Delete DB query: {query} with params: {where_params}")
-        result = self.execute_query(query, where_params)
-        if isinstance(result, str):  # If it's an error message
-            logger.error(f"No record found in table '{table}' with {where}: {result}")
-            raise NoResultFound(f"No record found in table '{table}' with {where}: {result}")
-        logger.info("Record deleted successfully.")
+        Args:
+            table (str): The name of the table.
+            where (dict): The condition for the deletion.
+            increment (tuple, optional): Columns incremented by one, e.g. ("version",).
+
+        Returns:
+            bool: True if a row was marked as deleted.
+        """
+        logger.debug("Soft deleting record in {} with {}.", table, where)
+        statement = self.update_statement(table, ("deleted", "updated_at"), where.keys(), increment=increment)
+        params = {"deleted": True, "updated_at": datetime.now(timezone.utc), **self.where_params(where)}
+        result = self.execute_query(statement, params)
         return result.rowcount > 0
 
-    def fetch_one(self, table, where):
+    def fetch_one(self, table, where, columns=None):
         """Fetches a single record from the specified table.
 
         Args:
             table (str): The name of the table.
             where (dict): The condition for fetching.
+            columns (list, optional): The columns to fetch. Defaults to all columns.
 
         Returns:
-            tuple or str: The fetched row or an error message.
+            Row: The fetched row, or None if no row matches.
         """
-        logger.info("Fetching a single record from the database.")
-        where_clause, where_params = self.where_clause(where)
-        query = f'SELECT * FROM {table} WHERE {where_clause}'
-        logger.debug(f"FETCH ONE DB query: {query} with params: {where_params}")
-        result = self.execute_query(query, where_params)
-        if isinstance(result, str):  # If it's an error message
-            logger.error(f"No record found in table '{table}' with {where}: {result}")
-            raise NoResultFound(f"No record found in table '{table}' with {where}: {result}")
-        logger.info("Record fetched successfully.")
+        logger.debug("Fetching a single record from the database.")
+        statement = self.select_statement(table, where.keys(), columns=columns, timeout_ms=SQL_TIMEOUTS['READ_MS'])
+        result = self.execute_query(statement, self.where_params(where), idempotent=True)
+        logger.debug("Record fetched successfully.")
         return result.fetchone()  # Return the fetched row
 
-    def fetch_all(self, table, where, page=1, limit=10):
+    def fetch_all(self, table, where, page=1, limit=10, order_by=None):
         """Fetches all records from the specified table.
 
         Args:
             table (str): The name of the table.
+            order_by (list, optional): (column, descending) pairs giving the pages a deterministic order.
 
         Returns:
-            list or str: The list of fetched rows or an error message.
+            list: The list of fetched rows.
         """
-        logger.info("Fetching all records from the database.")
-        offset = (page - 1) * limit
-        where_clause, where_params = self.where_clause(where)
-        query = f'SELECT * FROM {table} WHERE {where_clause} LIMIT {limit} OFFSET {offset}'
-        logger.debug(f"FETCH ALL DB query: {query} with params: {where_params}")
-        result = self.execute_query(query, where_params)
-        if isinstance(result, str):  # If it's an error message
-            logger.error(f"No records found in table '{table}': {result}")
-            raise NoResultFound(f"No record found in table '{table}': {result}")
-        logger.info("All records fetched successfully.")
+        logger.debug("Fetching all records from the database.")
+        statement = self.select_statement(table, where.keys(), order_by=order_by, paging="offset",
+                                          timeout_ms=SQL_TIMEOUTS['READ_MS'])
+        params = {**self.where_params(where), 'limit': limit, 'offset': (page - 1) * limit}
+        result = self.execute_query(statement, params, idempotent=True)
+        logger.debug("All records fetched successfully.")
         return result.fetchall()  # Return the fetched rows
+
+    def fetch_keyset(self, table, where, order_by, after=None, limit=10, until=None):
+        """Fetches the records following a position in a deterministic ordering (keyset pagination).
+
+        Unlike fetch_all this seeks directly to the position instead of scanning and discarding
+        OFFSET rows, so every page costs the same regardless of how deep it is.
+
+        Args:
+            table (str): The name of the table.
+            where (dict): The condition for fetching.
+            order_by (list): (column, descending) pairs; the last column must be unique (e.g. id).
+            after (list, optional): The order_by values of the last row of the previous page.
+            limit (int): The maximum number of rows to fetch.
+            until (optional): Only fetch records whose first order_by column is below this value.
+
+        Returns:
+            list: The list of fetched rows.
+        """
+        logger.debug("Fetching a keyset page of records from the database.")
+        statement = self.select_statement(table, where.keys(), order_by=order_by, paging="keyset" if after else "limit",
+                                          bounded=until is not None, timeout_ms=SQL_TIMEOUTS['READ_MS'])
+        params = {**self.where_params(where), **self.keyset_params(order_by, after or []), 'limit': limit}
+        if until is not None:
+            params['until'] = until
+        result = self.execute_query(statement, params, idempotent=True)
+        logger.debug("Keyset page fetched successfully.")
+        return result.fetchall()  # Return the fetched rows
+
+    def fetch_search(self, table, where, columns, query, after=None, limit=10):
+        """Fetches the records matching a search query, most relevant first (see search_statement).
+
+        Args:
+            table (str): The name of the table.
+            where (dict): The condition for fetching.
+            columns (list): The searched columns.
+            query (str): The search query.
+            after (list, optional): The relevance and id of the last row of the previous page.
+            limit (int): The maximum number of rows to fetch.
+
+        Returns:
+            list: The fetched rows, each with an additional relevance column.
+        """
+        logger.debug("Searching {} for {}.", table, query)
+        statement = self.search_statement(table, where.keys(), columns, query, seek=bool(after),
+                                          timeout_ms=SQL_TIMEOUTS['SEARCH_MS'])
+        params = {**self.where_params(where), **self.search_params(query),
+                  **self.keyset_params(SEARCH_ORDER_BY, after or []), 'limit': limit}
+        result = self.execute_query(statement, params, idempotent=True)
+        return result.fetchall()
+
+    def fetch_in(self, table, column, values, where=None):
+        """Fetches the records whose column matches any of the given values, in one query.
+
+        Args:
+            table (str): The name of the table.
+            column (str): The column to match, e.g. 'id'.
+            values (list): The values to match.
+            where (dict, optional): Additional conditions for fetching.
+
+        Returns:
+            list: The list of fetched rows, ordered by the matched column.
+        """
+        logger.debug("Fetching {} records by {} from the database.", len(values), column)
+        if not values:
+            return []
+        where = where or {}
+        # The IN list is one expanding parameter, so the statement is the same for any number of values
+        statement = self.select_statement(table, where.keys(), order_by=[(column, False)], in_column=column,
+                                          timeout_ms=SQL_TIMEOUTS['READ_MS'])
+        result = self.execute_query(statement, {**self.where_params(where), 'values': list(values)}, idempotent=True)
+        return result.fetchall()
+
+    def bulk_insert(self, table, rows):
+        """Inserts many records with multi-row INSERT statements in one transaction.
+
+        Rows are grouped by their column set and written SQL_BULK_CHUNK_SIZE rows per statement.
+        The statements return the generated ids where the database supports INSERT ... RETURNING,
+        otherwise they are read back (see inserted_ids). The inserted rows are then read with a single
+        IN query.
+
+        Args:
+            table (str): The name of the table.
+            rows (list): The records to insert as dictionaries.
+
+        Returns:
+            list: The inserted rows, ordered by id.
+        """
+        logger.debug("Bulk inserting {} records into {}.", len(rows), table)
+        now = datetime.now(timezone.utc)
+        groups = {}
+        for data in rows:
+            data['created_at'] = now
+            data['updated_at'] = now
+            groups.setdefault(tuple(data.keys()), []).append(data)
+
+        table_obj = self.table(table)
+        returning = self.engine.dialect.insert_returning
+
+        def insert_groups():
+            inserted_ids = []
+            first_ids = []
+            if not returning:
+                # Reading before inserting starts the snapshot of the transaction, see inserted_ids
+                self.execute_query(select(table_obj.c.id).limit(1))
+            for keys, group in groups.items():
+                # The cached INSERT validates the columns; the multi-row VALUES list of each chunk is added to it
+                statement = self.insert_statement(table, keys)
+                if returning:
+                    statement = statement.returning(table_obj.c.id)
+                for start in range(0, len(group), SQL_BULK_CHUNK_SIZE):
+                    chunk = group[start:start + SQL_BULK_CHUNK_SIZE]
+                    result = self.execute_query(statement.values(chunk))
+                    if returning:
+                        inserted_ids.extend(result.scalars())
+                    else:
+                        first_ids.append(self.first_inserted_id(result, len(chunk)))
+            if first_ids:
+                inserted_ids = self.inserted_ids(table_obj, min(first_ids))
+            return self.fetch_in(table, 'id', inserted_ids)
+
+        # A deadlocked transaction is rolled back as a whole and run again
+        return self.transaction(insert_groups)
+
+    def first_inserted_id(self, result, count):
+        """Returns the lowest auto increment id generated by a multi-row INSERT.
+
+        MySQL reports the first id of the statement as the last insert id, SQLite the last one of
+        its consecutive ids.
+
+        Args:
+            result: The result of the INSERT.
+            count (int): The number of inserted rows.
+
+        Returns:
+            int: The lowest generated id.
+        """
+        if self.engine.dialect.name == "sqlite":
+            return result.lastrowid - count + 1
+        return result.lastrowid
+
+    def inserted_ids(self, table_obj, first_id):
+        """Reads back the ids the transaction inserted into the table, from the lowest one on.
+
+        The ids of a multi-row INSERT are not consecutive when InnoDB interleaves concurrent inserts
+        (innodb_autoinc_lock_mode = 2), so they cannot be derived from the first one. The rows other
+        transactions commit after the snapshot of this one started are invisible to its reads
+        (REPEATABLE READ), and rows committed before it got lower ids, so every row from first_id on
+        that this transaction sees is one it inserted.
+
+        Args:
+            table_obj (Table): The table.
+            first_id (int): The lowest id generated by the inserts of the transaction.
+
+        Returns:
+            list: The inserted ids in ascending order.
+        """
+        statement = select(table_obj.c.id).where(table_obj.c.id >= first_id).order_by(table_obj.c.id)
+        return self.execute_query(statement).scalars().all()
+
+    def bulk_update(self, table, rows, where=None, key='id', increment=()):
+        """Updates many records in one transaction, one executemany per column set.
+
+        Args:
+            table (str): The name of the table.
+            rows (list): The records to update as dictionaries, each containing the key column.
+            where (dict, optional): Additional conditions every updated record must match.
+            key (str): The column identifying a record. Defaults to 'id'.
+            increment (tuple, optional): Columns incremented by one in every updated record, e.g. ("version",).
+
+        Returns:
+            list: The updated rows that still match the conditions, ordered by the key column.
+        """
+        logger.debug("Bulk updating {} records in {}.", len(rows), table)
+        where = where or {}
+        where_params = self.where_params(where)
+        now = datetime.now(timezone.utc)
+        groups = {}
+        for data in rows:
+            columns = tuple(column for column in data.keys() if column != key) + ('updated_at',)
+            params = {column: data[column] for column in columns if column != 'updated_at'}
+            groups.setdefault(columns, []).append({**params, 'updated_at': now, f"where_{key}": data[key], **where_params})
+
+        def update_groups():
+            for columns, group in groups.items():
+                statement = self.update_statement(table, columns, (key, *where.keys()), increment=increment)
+                self.execute_query(statement, group)  # executemany
+            return self.fetch_in(table, key, [data[key] for data in rows], where)
+
+        return self.transaction(update_groups)
+
+    def delete_in(self, table, column, values, where=None):
+        """Deletes the records whose column matches any of the given values, in one statement.
+
+        Args:
+            table (str): The name of the table.
+            column (str): The column to match, e.g. 'id'.
+            values (list): The values to match.
+            where (dict, optional): Additional conditions for the deletion.
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        logger.debug("Deleting {} records by {} from {}.", len(values), column, table)
+        if not values:
+            return 0
+        where = where or {}
+        statement = self.delete_statement(table, where.keys(), in_column=column)
+        result = self.execute_query(statement, {**self.where_params(where), 'values': list(values)})
+        return result.rowcount
+
+    def soft_delete_in(self, table, column, values, where=None, increment=()):
+        """Marks the records whose column matches any of the given values as deleted, in one transaction.
+
+        The matching records are selected and locked first, so that exactly the ones this call marks
+        as deleted are returned, also while other transactions delete some of them.
+
+        Args:
+            table (str): The name of the table.
+            column (str): The column to match, e.g. 'id'.
+            values (list): The values to match.
+            where (dict, optional): Additional conditions for the deletion.
+            increment (tuple, optional): Columns incremented by one in every deleted record, e.g. ("version",).
+
+        Returns:
+            list: The column values of the records marked as deleted, in ascending order.
+        """
+        logger.debug("Soft deleting {} records by {} in {}.", len(values), column, table)
+        if not values:
+            return []
+        where = where or {}
+        where_params = self.where_params(where)
+        locking = self.select_statement(table, where.keys(), columns=[column], order_by=[(column, False)],
+                                        in_column=column, for_update=True)
+        statement = self.update_statement(table, ("deleted", "updated_at"), where.keys(), in_column=column,
+                                          increment=increment)
+
+        def mark_deleted():
+            result = self.execute_query(locking, {**where_params, 'values': list(values)})
+            matched = [row[0] for row in result.fetchall()]
+            if matched:
+                params = {"deleted": True, "updated_at": datetime.now(timezone.utc), **where_params, 'values': matched}
+                self.execute_query(statement, params)
+            return matched
+
+        return self.transaction(mark_deleted)
+
+    def archive_batch(self, table, archive_table, where, before, batch_size, key='id', timestamp_column='updated_at'):
+        """Moves up to batch_size rows older than before into the archive table, in one transaction.
+
+        Keeping the moves small bounds the locks held on the table and the undo log every statement
+        produces, so the archiving can run next to the live traffic.
+
+        Args:
+            table (str): The name of the table.
+            archive_table (str): The name of the archive table, with the columns of the table.
+            where (dict): The condition the moved rows match, e.g. {"deleted": True}.
+            before (datetime): Only rows whose timestamp column is older are moved.
+            batch_size (int): The maximum number of rows to move.
+            key (str): The unique column identifying a row. Defaults to 'id'.
+            timestamp_column (str): The column compared with before. Defaults to 'updated_at'.
+
+        Returns:
+            int: The number of moved rows; fewer than batch_size once no older rows are left.
+        """
+        select_keys, copy, delete_rows = self.archive_statements(table, archive_table, where.keys(), key, timestamp_column)
+        where_params = self.where_params(where)
+
+        def move_batch():
+            result = self.execute_query(select_keys, {**where_params, 'before': before, 'limit': batch_size})
+            keys = list(result.scalars())
+            for statement in (copy, delete_rows) if keys else ():
+                self.execute_query(statement, {**where_params, 'values': keys})
+            return keys
+
+        keys = self.transaction(move_batch)
+        if not keys:
+            return 0
+        logger.debug("Archived {} records from {} into {}.", len(keys), table, archive_table)
+        return len(keys)
+
+    def stream_all(self, table, where, order_by=None, chunk_size=1000):
+        """Streams all matching records in fixed-size chunks through a server-side cursor.
+
+        The rows are read with an unbuffered cursor on a dedicated connection (outside any unit of
+        work), so memory stays flat regardless of the table size. The connection is held until the
+        generator is exhausted or closed.
+
+        Args:
+            table (str): The name of the table.
+            where (dict): The condition for fetching.
+            order_by (list, optional): (column, descending) pairs for a deterministic order.
+            chunk_size (int): The number of rows fetched from the server per chunk.
+
+        Yields:
+            list: The next chunk of rows.
+        """
+        logger.debug("Streaming records from {} in chunks of {}.", table, chunk_size)
+        statement = self.select_statement(table, where.keys(), order_by=order_by)
+        where_params = self.where_params(where)
+        logger.debug("STREAM ALL DB query: {} with params: {}", statement, where_params)
+        circuit_breaker.before_call()
+        connection = None
+        answered = False
+        try:
+            connection = self.get_connection()
+            result = connection.execution_options(stream_results=True, max_row_buffer=chunk_size).execute(
+                statement, where_params
+            )
+            circuit_breaker.record()
+            answered = True
+            for chunk in result.partitions(chunk_size):
+                yield chunk
+        except SQLAlchemyError as e:
+            db_errors.labels(type(e).__name__).inc()
+            logger.error("Failed to stream records from {}: {}", table, str(e))
+            error = translate_error(e)
+            circuit_breaker.record(error)
+            raise error from e
+        except BaseException:
+            if not answered:
+                circuit_breaker.release()
+            raise
+        finally:
+            if connection is not None:
+                self.close_connection(connection)
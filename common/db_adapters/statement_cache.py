@@ -0,0 +1,102 @@
+import math
+import threading
+
+from sqlalchemy import MetaData, Table
+from sqlalchemy.exc import ArgumentError, NoSuchTableError
+from loguru import logger
+
+from common.cache import LRUCache
+from server.settings import SQL_STATEMENT_CACHE_SIZE
+
+
+class StatementCache:
+    """
+    Process wide cache of the SQLAlchemy Core statements generated by the DB adapters.
+
+    A statement is built once per shape, e.g. (operation, table, where columns), and reused for
+    every later call with the same shape, so each call only binds new parameter values and
+    SQLAlchemy's compiled cache finds the same construct again. Table and column names are
+    resolved against the tables declared on ``metadata`` (see apps/tasks/db_adapters/tables.py),
+    or reflected from the database on first use, so unknown identifiers are rejected instead of
+    being pasted into SQL.
+    """
+
+    def __init__(self, max_size=512):
+        """
+        Initializes the cache.
+
+        Args:
+            max_size (int): Maximum number of statements kept; the least recently used one is evicted beyond it.
+        """
+        self.metadata = MetaData()
+        self.statements = LRUCache(max_size=max_size, ttl=math.inf)
+        self.statements.name = "sql_statements"
+        self._lock = threading.Lock()
+
+    def table(self, name, bind=None):
+        """
+        Returns the declared table of the given name, reflecting it from the database if needed.
+
+        Args:
+            name (str): The table name.
+            bind (Engine or Connection, optional): Where to reflect undeclared tables from.
+
+        Returns:
+            Table: The table.
+
+        Raises:
+            ArgumentError: If the table is neither declared nor found in the database.
+        """
+        table = self.metadata.tables.get(name)
+        if table is not None:
+            return table
+        if bind is None:
+            raise ArgumentError(f"Unknown table '{name}'")
+        with self._lock:
+            table = self.metadata.tables.get(name)
+            if table is None:
+                logger.info("Reflecting table {}", name)
+                try:
+                    table = Table(name, self.metadata, autoload_with=bind)
+                except NoSuchTableError:
+                    raise ArgumentError(f"Unknown table '{name}'")
+        return table
+
+    def columns(self, table, names):
+        """
+        Returns the columns of the table with the given names.
+
+        Args:
+            table (Table): The table.
+            names (iterable): The column names.
+
+        Returns:
+            list: The Column objects, in the given order.
+
+        Raises:
+            ArgumentError: If a name is not a column of the table.
+        """
+        unknown = [name for name in names if name not in table.c]
+        if unknown:
+            raise ArgumentError(f"Unknown column(s) {', '.join(map(str, unknown))} for table '{table.name}'")
+        return [table.c[name] for name in names]
+
+    def statement(self, key, build):
+        """
+        Returns the cached statement for the key, building and caching it on a miss.
+
+        Args:
+            key (tuple): The statement shape, e.g. ("select", "tasks", ("id", "deleted")).
+            build (callable): Function without arguments that builds the statement.
+
+        Returns:
+            Executable: The statement.
+        """
+        statement = self.statements.get(key)
+        if statement is None:
+            statement = build()
+            self.statements.set(key, statement)
+        return statement
+
+
+statement_cache = StatementCache(SQL_STATEMENT_CACHE_SIZE)
@@ -0,0 +1,33 @@
+from django.utils.module_loading import import_string
+
+from .transport import Event, EventTransport, FileTransport, LocalTransport
+from .broker import EventBroker, Subscription
+from .sse import EventStreamApp
+
+
+def build_broker(config):
+    """
+    Builds an event broker from a settings dictionary.
+
+    Args:
+        config (dict): TRANSPORT, the import path of the EventTransport class, TRANSPORT_OPTIONS, the keyword
+            arguments of the transport, QUEUE_SIZE and HISTORY_SIZE.
+
+    Returns:
+        EventBroker: The broker; its transport starts with EventBroker.start() or the first subscription.
+    """
+    transport_class = import_string(config.get("TRANSPORT", "common.events.LocalTransport"))
+    transport = transport_class(**config.get("TRANSPORT_OPTIONS", {}))
+    return EventBroker(transport, queue_size=config.get("QUEUE_SIZE", 100), history_size=config.get("HISTORY_SIZE", 1000))
+
+
+__all__ = [
+    "Event",
+    "EventTransport",
+    "LocalTransport",
+    "FileTransport",
+    "EventBroker",
+    "Subscription",
+    "EventStreamApp",
+    "build_broker",
+]
@@ -0,0 +1,134 @@
+import asyncio
+import threading
+from collections import deque
+
+from loguru import logger
+
+
+class Subscription:
+    """
+    The events pending for one client stream, queued on the event loop serving the stream.
+
+    The queue is bounded: a client that falls QUEUE_SIZE events behind is cut off instead of
+    buffering without limit, and resumes from the broker history when it reconnects.
+    """
+
+    def __init__(self, loop, max_size):
+        self.loop = loop
+        self.max_size = max_size
+        self.queue = asyncio.Queue()
+        self.overflowed = False
+
+    def offer(self, event):
+        """Queues the event; runs on the loop of the subscription."""
+        if self.overflowed:
+            return
+        if self.queue.qsize() >= self.max_size:
+            self.overflowed = True
+            self.queue.put_nowait(None)  # Ends the stream once the queued events are sent
+            return
+        self.queue.put_nowait(event)
+
+    async def get(self):
+        """Waits for the next event; None once the subscription overflowed."""
+        return await self.queue.get()
+
+    def get_nowait(self):
+        """Returns the next queued event, or raises asyncio.QueueEmpty."""
+        return self.queue.get_nowait()
+
+
+class EventBroker:
+    """
+    Fans the events delivered by a transport out to the subscribed client streams of this process.
+
+    Events are published from request threads and coroutines alike and handed to every
+    subscription on its own event loop. The latest HISTORY_SIZE events are kept so that a client
+    reconnecting with the ID of the last event it received gets the events it missed.
+
+    The transport is started by start(), at the latest by the first subscription, so that processes
+    that only publish (e.g. the uWSGI workers) never run the delivery side of the transport.
+    """
+
+    def __init__(self, transport, queue_size=100, history_size=1000):
+        """
+        Initializes the broker; the transport is started by start().
+
+        Args:
+            transport (EventTransport): Carries the published events to the brokers of all processes.
+            queue_size (int): Maximum number of events queued for one subscription.
+            history_size (int): Number of recent events kept for resuming streams.
+        """
+        self.transport = transport
+        self.queue_size = queue_size
+        self._history = deque(maxlen=history_size)
+        self._subscriptions = set()
+        # Guards the history and the subscriptions, so a new subscription misses no event and gets none twice
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        """Starts receiving the events of all processes from the transport, once per broker."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.transport.start(self.dispatch)
+
+    def publish(self, event_type, data):
+        """
+        Publishes an event to the subscribers of every process.
+
+        Args:
+            event_type (str): The type of the event, e.g. "task.updated".
+            data (dict): The JSON serializable payload.
+        """
+        self.transport.publish(event_type, data)
+
+    def dispatch(self, event):
+        """Hands an event delivered by the transport to every subscription; called from any thread."""
+        with self._lock:
+            self._history.append(event)
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:  # The loop of the subscription is closed
+                self.unsubscribe(subscription)
+
+    def subscribe(self, last_event_id=None):
+        """
+        Subscribes a client stream on the running event loop.
+
+        Args:
+            last_event_id (str, optional): The ID of the last event the client received.
+
+        Returns:
+            tuple: The Subscription and the events published after last_event_id, or None instead
+                of the events if they are no longer in the history.
+        """
+        self.start()
+        subscription = Subscription(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+            missed = self._events_after(last_event_id)
+        return subscription, missed
+
+    def unsubscribe(self, subscription):
+        """Stops delivering events to the subscription."""
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def subscriber_count(self):
+        """The number of subscribed client streams."""
+        with self._lock:
+            return len(self._subscriptions)
+
+    def _events_after(self, last_event_id):
+        if not last_event_id:
+            return []
+        for index, event in enumerate(self._history):
+            if event.id == last_event_id:
+                return list(self._history)[index + 1:]
+        logger.info("Event {} is no longer in the history, the stream restarts", last_event_id)
+        return None
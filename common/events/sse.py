@@ -0,0 +1,113 @@
+import asyncio
+from urllib.parse import parse_qs
+
+from loguru import logger
+
+# Sent instead of the missed events when they are no longer in the history: the client has to
+# reload its state (e.g. from the change feed) before applying further events
+RESET_EVENT = b"event: reset\ndata: {}\n\n"
+
+# Comment line keeping idle connections open through proxies and load balancers
+HEARTBEAT = b": keepalive\n\n"
+
+RESPONSE_HEADERS = [
+    (b"content-type", b"text/event-stream; charset=utf-8"),
+    (b"cache-control", b"no-cache"),
+    # Stops nginx from buffering the stream
+    (b"x-accel-buffering", b"no"),
+]
+
+
+def last_event_id(scope):
+    """
+    Returns the ID of the last event the client received: the Last-Event-ID header an EventSource
+    sends when it reconnects, or the lastEventId query parameter for the first connection of a page.
+    """
+    for name, value in scope.get("headers", []):
+        if name == b"last-event-id":
+            return value.decode("latin-1").strip() or None
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get("lastEventId", [None])[0]
+
+
+class EventStreamApp:
+    """
+    ASGI application streaming the events of a broker to clients as Server-Sent Events.
+
+    Every connection subscribes to the broker, first receives the events it missed since its
+    Last-Event-ID, then every new event as it is published, several at a time when they queue up.
+    A heartbeat comment is sent while no event arrives. A client too slow to keep up with its
+    bounded queue is disconnected and resumes with Last-Event-ID, which EventSource does on its own.
+
+    The streams are served next to Django rather than by a view, so that a connection open for
+    hours holds no request, middleware or database state.
+    """
+
+    def __init__(self, broker, heartbeat_seconds=15, retry_ms=3000):
+        """
+        Initializes the application.
+
+        Args:
+            broker (EventBroker): The broker publishing the events.
+            heartbeat_seconds (float): Seconds without events after which a heartbeat is sent.
+            retry_ms (int): Reconnection delay the clients are told to use.
+        """
+        self.broker = broker
+        self.heartbeat_seconds = heartbeat_seconds
+        self.retry_ms = retry_ms
+
+    async def __call__(self, scope, receive, send):
+        if scope["method"] != "GET":
+            await send({"type": "http.response.start", "status": 405, "headers": [(b"allow", b"GET")]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        subscription, missed = self.broker.subscribe(last_event_id(scope))
+        disconnected = asyncio.ensure_future(self.wait_for_disconnect(receive))
+        pending = None
+        try:
+            await send({"type": "http.response.start", "status": 200, "headers": RESPONSE_HEADERS})
+            preamble = [f"retry: {self.retry_ms}\n\n".encode()]
+            preamble += [RESET_EVENT] if missed is None else [event.encode() for event in missed]
+            await send({"type": "http.response.body", "body": b"".join(preamble), "more_body": True})
+
+            while True:
+                if pending is None:
+                    pending = asyncio.ensure_future(subscription.get())
+                done, _ = await asyncio.wait({pending, disconnected}, timeout=self.heartbeat_seconds,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if disconnected in done:
+                    break
+                if pending not in done:
+                    await send({"type": "http.response.body", "body": HEARTBEAT, "more_body": True})
+                    continue
+                events, closed = self.drain(pending.result(), subscription)
+                pending = None
+                if events:
+                    await send({"type": "http.response.body", "body": b"".join(events), "more_body": True})
+                if closed:
+                    logger.warning("Event stream fell more than {} events behind and was closed", subscription.max_size)
+                    await send({"type": "http.response.body", "body": b""})
+                    break
+        finally:
+            self.broker.unsubscribe(subscription)
+            disconnected.cancel()
+            if pending is not None:
+                pending.cancel()
+
+    def drain(self, event, subscription):
+        """Returns the encoded event and the ones queued behind it, and whether the subscription overflowed."""
+        events = []
+        while event is not None:
+            events.append(event.encode())
+            try:
+                event = subscription.get_nowait()
+            except asyncio.QueueEmpty:
+                return events, False
+        return events, True
+
+    async def wait_for_disconnect(self, receive):
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
@@ -0,0 +1,234 @@
+import fcntl
+import itertools
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import ujson
+from loguru import logger
+
+
+class Event:
+    """A published event: its ID in the stream of the transport, its type and its JSON payload."""
+    __slots__ = ("id", "type", "data")
+
+    def __init__(self, event_id, event_type, data):
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+
+    def encode(self):
+        """Returns the event in the Server-Sent Events wire format."""
+        return f"id: {self.id}\nevent: {self.type}\ndata: {ujson.dumps(self.data, ensure_ascii=False)}\n\n".encode()
+
+
+class EventTransport:
+    """
+    Carries published events to the EventBroker of every process that serves event streams.
+
+    A transport assigns the event IDs, which must increase in the order the events are delivered,
+    and delivers every event exactly once per process by calling the deliver callback given to
+    start(). An implementation on a message bus (e.g. Redis pub/sub or streams) lets processes that
+    only publish, like the uWSGI workers, reach the ASGI workers that hold the client connections.
+    """
+
+    def start(self, deliver):
+        """
+        Starts delivering the events published by any process.
+
+        Args:
+            deliver (callable): Called with every Event, from any thread.
+        """
+        raise NotImplementedError
+
+    def publish(self, event_type, data):
+        """
+        Publishes an event.
+
+        Args:
+            event_type (str): The type of the event, e.g. "task.updated".
+            data (dict): The JSON serializable payload.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Stops delivering events."""
+
+
+class LocalTransport(EventTransport):
+    """
+    In-process transport: events only reach the streams served by the publishing process.
+
+    Suits tests and single-process deployments (one ASGI worker publishing and serving the
+    streams); see FileTransport for several processes on one host. Event IDs are the start time
+    of the process and a sequence number, so an ID handed out before a restart is never taken
+    for one of the new process.
+    """
+
+    def __init__(self):
+        self._deliver = None
+        self._epoch = int(time.time() * 1000)
+        self._sequence = itertools.count(1)
+        # Assigning the ID and delivering is one step, so that events are delivered in ID order
+        self._lock = threading.Lock()
+
+    def start(self, deliver):
+        self._deliver = deliver
+
+    def publish(self, event_type, data):
+        with self._lock:
+            event = Event(f"{self._epoch}-{next(self._sequence)}", event_type, data)
+            if self._deliver is not None:
+                self._deliver(event)
+
+    def close(self):
+        self._deliver = None
+
+
+class FileTransport(EventTransport):
+    """
+    Cross-process transport over append-only log files shared by the processes of one host.
+
+    publish() appends the event as one JSON line to the current segment of the log while holding
+    an exclusive lock on <path>.lock, which also holds the number of the current segment. Every
+    process tails the segments in a background thread and delivers the lines appended after it
+    started, in file order. The ID of an event is the number of its segment and the byte offset
+    of its line, so IDs increase in delivery order. Once a segment reaches max_bytes the next
+    publisher starts a new one and removes the segment before the two previous ones; a reader
+    finishes a segment before it moves on to the next.
+
+    Stands in for a message bus when the processes run on one host, e.g. uWSGI workers serving the
+    writes and ASGI workers serving the streams. Processes on other hosts need a bus transport.
+    """
+
+    # Segments kept besides the current one, for readers still finishing them
+    KEPT_SEGMENTS = 2
+
+    def __init__(self, path=None, poll_interval=0.05, max_bytes=16 * 1024 * 1024):
+        """
+        Initializes the transport.
+
+        Args:
+            path (str, optional): The log, shared by all processes; its segments are <path>.<number>.
+                Defaults to task_events.log in the temp dir.
+            poll_interval (float): Seconds between checks for new lines while the log is idle.
+            max_bytes (int): Size after which a new segment is started.
+        """
+        self.path = path or os.path.join(tempfile.gettempdir(), "task_events.log")
+        self.poll_interval = poll_interval
+        self.max_bytes = max_bytes
+        self._deliver = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._log = None
+        self._segment = None
+        # Byte offset of the first byte not yet delivered
+        self._offset = 0
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def start(self, deliver):
+        self._deliver = deliver
+        self._stop.clear()
+        with self._locked() as lock:
+            self._open(self._current_segment(lock), at_end=True)
+        self._thread = threading.Thread(target=self._run, name="event-file-transport", daemon=True)
+        self._thread.start()
+
+    def publish(self, event_type, data):
+        line = ujson.dumps({"type": event_type, "data": data}, ensure_ascii=False).encode() + b"\n"
+        with self._locked() as lock:
+            segment = self._current_segment(lock)
+            try:
+                if os.path.getsize(self.segment_path(segment)) >= self.max_bytes:
+                    segment = self._next_segment(lock, segment)
+            except FileNotFoundError:
+                pass
+            # One write() to a file opened with O_APPEND: readers never see lines of two events mixed
+            with open(self.segment_path(segment), "ab", buffering=0) as log:
+                log.write(line)
+
+    def close(self):
+        self._deliver = None
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(self.poll_interval * 10)
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def segment_path(self, segment):
+        """The file of the given segment of the log."""
+        return f"{self.path}.{segment}"
+
+    @contextmanager
+    def _locked(self):
+        with open(self.path + ".lock", "a+b") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield lock
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _current_segment(self, lock):
+        lock.seek(0)
+        content = lock.read().strip()
+        return int(content) if content else 1
+
+    def _next_segment(self, lock, segment):
+        lock.seek(0)
+        lock.truncate()
+        lock.write(str(segment + 1).encode())
+        lock.flush()
+        stale = self.segment_path(segment - self.KEPT_SEGMENTS)
+        if os.path.exists(stale):
+            os.remove(stale)
+        return segment + 1
+
+    def _open(self, segment, at_end):
+        self._segment = segment
+        self._log = open(self.segment_path(segment), "a+b")  # Creates the segment if nothing was published yet
+        self._offset = self._log.seek(0, os.SEEK_END) if at_end else self._log.seek(0)
+
+    def _run(self):
+        pending = b""
+        while not self._stop.is_set():
+            try:
+                chunk = self._log.read()
+                if chunk:
+                    pending = self._dispatch(pending + chunk)
+                    continue
+                if os.path.exists(self.segment_path(self._segment + 1)):
+                    # The next segment is only started once no more lines are written to this one
+                    self._dispatch(pending + self._log.read())
+                    pending = b""
+                    self._log.close()
+                    self._open(self._segment + 1, at_end=False)
+                    continue
+            except Exception as e:  # noqa: BLE001 - the reader must outlive a bad line or a removed segment
+                logger.error("Reading the event log {} failed: {}", self.path, e)
+            self._stop.wait(self.poll_interval)
+
+    def _dispatch(self, data):
+        """Delivers the complete lines of data and returns the incomplete last line."""
+        *lines, rest = data.split(b"\n")
+        for line in lines:
+            event_id = f"{self._segment}-{self._offset}"
+            self._offset += len(line) + 1
+            deliver = self._deliver
+            if deliver is None:
+                continue
+            try:
+                message = ujson.loads(line)
+            except ValueError:
+                logger.error("Skipping malformed event {} in {}", event_id, self.path)
+                continue
+            deliver(Event(event_id, message["type"], message["data"]))
+        return rest
+
+    def _after_fork(self):
+        # The reader thread does not survive a fork; the child tails the log from where it is now
+        if self._deliver is not None and not self._stop.is_set():
+            self._log = None
+            self.start(self._deliver)
@@ -0,0 +1,27 @@
+from .request_timing import RequestTimings, current_request_timings, timed, install_query_timing
+from .metrics import (
+    request_latency, requests_in_progress, request_exceptions, db_errors, db_retries, db_circuit_state,
+    cache_events, cache_size, coalesced_requests, admission_rejections, metrics_registry, mark_process_dead,
+    pool_checkout, install_pool_metrics,
+)
+
+__all__ = [
+    "RequestTimings",
+    "current_request_timings",
+    "timed",
+    "install_query_timing",
+    "request_latency",
+    "requests_in_progress",
+    "request_exceptions",
+    "db_errors",
+    "db_retries",
+    "db_circuit_state",
+    "cache_events",
+    "cache_size",
+    "coalesced_requests",
+    "admission_rejections",
+    "metrics_registry",
+    "mark_process_dead",
+    "pool_checkout",
+    "install_pool_metrics",
+]
@@ -0,0 +1,125 @@
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, multiprocess
+from sqlalchemy import event
+
+from .request_timing import timed
+
+# Prometheus metrics of the worker process. Under uWSGI every worker writes its values to mmap files in
+# PROMETHEUS_MULTIPROC_DIR and /metrics aggregates the files of all workers, see metrics_registry.
+# The variable must be set before prometheus_client is imported, i.e. in the environment of the server.
+
+request_latency = Histogram(
+    "http_request_duration_seconds", "Latency of the HTTP requests by route, method and status.",
+    ["route", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0),
+)
+requests_in_progress = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled by the workers.", ["method"],
+    multiprocess_mode="livesum",
+)
+request_exceptions = Counter(
+    "http_request_exceptions_total", "Requests that raised an unhandled exception, by exception type.",
+    ["route", "method", "exception"],
+)
+db_errors = Counter("db_errors_total", "SQL statements that failed, by SQLAlchemy error type.", ["error"])
+db_retries = Counter("db_retries_total", "SQL statements retried after a deadlock or a broken connection.", ["error"])
+db_circuit_state = Gauge(
+    "db_circuit_state", "State of the database circuit breaker: 0 closed, 1 half-open, 2 open.",
+    multiprocess_mode="max",
+)
+db_pool_size = Gauge(
+    "db_pool_size", "Configured number of pooled connections.", ["engine"], multiprocess_mode="livesum",
+)
+db_pool_checked_out = Gauge(
+    "db_pool_checked_out", "Connections currently checked out of the pool.", ["engine"], multiprocess_mode="livesum",
+)
+db_pool_overflow = Gauge(
+    "db_pool_overflow", "Connections opened beyond the pool size (max_overflow).", ["engine"],
+    multiprocess_mode="livesum",
+)
+db_pool_wait = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+cache_events = Counter("cache_events_total", "Cache hits, misses, evictions and expirations.", ["cache", "event"])
+cache_size = Gauge("cache_size", "Entries held by the cache.", ["cache"], multiprocess_mode="livesum")
+coalesced_requests = Counter(
+    "coalesced_requests_total", "Reads answered by the in-flight call of an identical read.",
+    ["group"],
+)
+admission_rejections = Counter(
+    "admission_rejections_total", "Requests rejected by admission control, by route priority and exceeded budget.",
+    ["priority", "reason"],
+)
+
+
+def metrics_registry():
+    """
+    Returns the registry to expose on /metrics: the values aggregated from the files of all worker
+    processes when PROMETHEUS_MULTIPROC_DIR is set, otherwise the metrics of this process.
+
+    Returns:
+        CollectorRegistry: The registry to pass to generate_latest.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def mark_process_dead(pid=None):
+    """
+    Drops the live gauges (in-flight requests, pool state, cache sizes) of a stopped worker process
+    from the aggregation. Call it when a worker exits.
+
+    Args:
+        pid (int, optional): The process ID. Defaults to the current process.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+@contextmanager
+def pool_checkout():
+    """
+    Measures the wait for a pooled connection in the block, both for the current request (the pool
+    phase of Server-Timing) and in the db_pool_wait_seconds histogram.
+    """
+    started_at = time.perf_counter()
+    try:
+        with timed("pool"):
+            yield
+    finally:
+        db_pool_wait.observe(time.perf_counter() - started_at)
+
+
+def install_pool_metrics(engine, name):
+    """
+    Keeps the pool gauges of the engine up to date as connections are checked out and returned.
+
+    Args:
+        engine (Engine): The engine; for an AsyncEngine pass its sync_engine.
+        name (str): The value of the engine label, e.g. "sync" or "async".
+    """
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return  # e.g. NullPool, nothing is pooled
+
+    def on_checkout(*args):
+        db_pool_checked_out.labels(name).set(pool.checkedout())
+        db_pool_overflow.labels(name).set(max(pool.overflow(), 0))
+
+    def on_checkin(*args):
+        # Fired before the pool takes the connection back: it still counts as checked out, and
+        # it will be closed, reducing the overflow, if the pool already holds pool_size idle ones.
+        overflow = pool.overflow() - 1 if pool.checkedin() >= pool.size() else pool.overflow()
+        db_pool_checked_out.labels(name).set(max(pool.checkedout() - 1, 0))
+        db_pool_overflow.labels(name).set(max(overflow, 0))
+
+    db_pool_size.labels(name).set(pool.size())
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
@@ -0,0 +1,99 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# The timings of the request handled by the current thread or coroutine, see RequestTimingMiddleware
+current_request_timings = ContextVar("current_request_timings", default=None)
+
+
+class RequestTimings:
+    """
+    Durations collected while one request is handled: the SQL statements sent to the database,
+    the wait for a pooled connection and the named phases measured with ``timed`` (e.g. serialize,
+    render). Durations are kept in seconds.
+    """
+
+    # Statements kept per request for the slow request log; the counters include all of them
+    MAX_STATEMENTS = 100
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.durations = {}
+        self.queries = 0
+        self.statements = []
+
+    def add(self, name, seconds):
+        """Adds the duration to the named phase."""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def record_query(self, statement, seconds):
+        """Counts an executed statement and adds its duration to the db phase."""
+        self.queries += 1
+        self.add("db", seconds)
+        if len(self.statements) < self.MAX_STATEMENTS:
+            self.statements.append((statement, seconds))
+
+    def total(self):
+        """Seconds since the request started."""
+        return time.perf_counter() - self.started_at
+
+    def server_timing(self, total=None):
+        """
+        Formats the durations as a Server-Timing header value, e.g.
+        ``db;dur=3.1;desc="4 queries", pool;dur=0.2, serialize;dur=0.4, total;dur=9.8``.
+
+        Args:
+            total (float, optional): The total duration in seconds. Defaults to the time since the request started.
+
+        Returns:
+            str: The header value, durations in milliseconds.
+        """
+        metrics = [f'db;dur={self.durations.get("db", 0.0) * 1000:.2f};desc="{self.queries} queries"']
+        metrics += [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.durations.items() if name != "db"]
+        metrics.append(f"total;dur={(self.total() if total is None else total) * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+@contextmanager
+def timed(name):
+    """
+    Adds the duration of the block to the named phase of the current request, if one is timed.
+
+    Usage:
+        with timed("serialize"):
+            tasks_list = task_serializer.to_dicts(task_objs)
+    """
+    timings = current_request_timings.get()
+    if timings is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started_at)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_request_timings.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = current_request_timings.get()
+    if timings is not None and conn.info.get("query_started_at"):
+        timings.record_query(statement, time.perf_counter() - conn.info["query_started_at"].pop())
+
+
+def install_query_timing(engine):
+    """
+    Registers the cursor execute hooks that record every statement executed on the engine in the
+    timings of the current request.
+
+    Args:
+        engine (Engine): The engine; for an AsyncEngine pass its sync_engine.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
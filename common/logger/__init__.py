@@ -0,0 +1,7 @@
+from .logger_config import configure_logging, query_log_sampler, QueryLogSampler
+
+__all__ = [
+    "configure_logging",
+    "query_log_sampler",
+    "QueryLogSampler",
+]
@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+
+from loguru import logger
+
+DEFAULT_FORMAT = "{time} {level} {message}"
+
+
+class QueryLogSampler:
+    """
+    Decides which executed queries are logged, so per-query logs can be kept at a fraction of the
+    traffic. A rate of 1 logs every query and 0 none.
+    """
+
+    def __init__(self, rate=1.0):
+        self.rate = rate
+
+    def sample(self):
+        """Returns True if the current query should be logged."""
+        if self.rate >= 1:
+            return True
+        return self.rate > 0 and random.random() < self.rate
+
+
+query_log_sampler = QueryLogSampler()
+
+_fork_handler_registered = False
+
+
+def configure_logging(config):
+    """
+    Replaces the loguru handlers with the single sink described by the settings.
+
+    Messages below LEVEL are dropped by loguru before they are formatted, so log calls on the hot
+    path pass their values as arguments ("... {}", value) instead of pre-formatted f-strings. With
+    ENQUEUE the sink writes from a background thread and logging never blocks a request on stderr.
+
+    Args:
+        config (dict): LEVEL, FORMAT, ENQUEUE and QUERY_SAMPLE_RATE, see LOG_SETTINGS in the settings.
+    """
+    global _fork_handler_registered
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        level=config.get("LEVEL", "INFO"),
+        format=config.get("FORMAT", DEFAULT_FORMAT),
+        enqueue=config.get("ENQUEUE", False),
+        backtrace=False,
+        diagnose=False,
+    )
+    query_log_sampler.rate = config.get("QUERY_SAMPLE_RATE", 1.0)
+
+    # The writer thread of an enqueued sink does not survive the uWSGI fork, so every worker starts its own
+    if config.get("ENQUEUE", False) and not _fork_handler_registered:
+        os.register_at_fork(after_in_child=lambda: configure_logging(config))
+        _fork_handler_registered = True
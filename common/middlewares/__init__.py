@@ -0,0 +1,13 @@
+from .admission_control_middleware import AdmissionControlMiddleware
+from .compression_middleware import CompressionMiddleware
+from .metrics_middleware import MetricsMiddleware
+from .request_timing_middleware import RequestTimingMiddleware
+from .unit_of_work_middleware import UnitOfWorkMiddleware
+
+__all__ = [
+    "AdmissionControlMiddleware",
+    "CompressionMiddleware",
+    "MetricsMiddleware",
+    "RequestTimingMiddleware",
+    "UnitOfWorkMiddleware",
+]
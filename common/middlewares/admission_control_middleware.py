@@ -0,0 +1,204 @@
+import math
+import threading
+import time
+
+import ujson
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import Resolver404, resolve
+from loguru import logger
+
+from common.instrumentation import admission_rejections
+from .metrics_middleware import UNMATCHED_ROUTE
+
+try:
+    import uwsgi
+except ImportError:  # not running under uWSGI
+    uwsgi = None
+
+# Reasons a request is rejected, the reason label of admission_rejections_total
+CONCURRENCY = "concurrency"
+QUEUE_TIME = "queue_time"
+
+
+def request_queue_seconds(request, now):
+    """
+    Time the request waited between the proxy and the worker, from the X-Request-Start header the
+    proxy sets (nginx: "t=${msec}"), or 0 without the header. The timestamp may be in seconds,
+    milliseconds or microseconds since the epoch.
+    """
+    header = request.META.get("HTTP_X_REQUEST_START")
+    if not header:
+        return 0.0
+    try:
+        started_at = float(header.strip().removeprefix("t="))
+    except ValueError:
+        return 0.0
+    if started_at > 1e14:
+        started_at /= 1e6
+    elif started_at > 1e11:
+        started_at /= 1e3
+    return max(now - started_at, 0.0)
+
+
+def worker_threads():
+    """The threads of the uWSGI worker, or 1 outside uWSGI."""
+    if uwsgi is None:
+        return 1
+    return int(uwsgi.opt.get("threads") or 1)
+
+
+def listen_queue():
+    """
+    Requests waiting in the listen queue of the uWSGI socket, shared by all workers, or 0 outside uWSGI.
+    Unlike X-Request-Start it needs no proxy, e.g. behind the uWSGI http router.
+    """
+    if uwsgi is None:
+        return 0
+    return uwsgi.listen_queue()
+
+
+class AdmissionControlMiddleware:
+    """
+    Rejects requests with 503 and Retry-After when the worker cannot serve them in time, instead of
+    letting them wait until the client gave up while their work is still done.
+
+    Every route has a priority (ADMISSION_CONTROL['PRIORITIES']) with two budgets. A request is rejected
+    when the requests in flight in the worker reach the concurrency budget of its priority, or when its
+    expected queue time exceeds the queue time budget of its priority. The queue time is the time it
+    waited before reaching the worker (X-Request-Start, or without it the requests in the uWSGI listen
+    queue times the recent latency) plus the work in flight ahead of it, estimated from the recent
+    latency of the routes in flight and divided by the PARALLELISM of the worker.
+
+    The concurrency budgets are per unit of PARALLELISM, which is the threads of the uWSGI worker unless
+    set. A WSGI worker never has more requests in flight than threads, so there the queue time budget
+    does the shedding; the concurrency budgets matter on the asyncio path, where requests wait in the worker.
+    Cheap reads get larger budgets than list and bulk calls, so the expensive calls are shed first
+    and the reads keep being served.
+
+    Place it after MetricsMiddleware so that the rejections show up in the request metrics, and before
+    the others so that a rejection costs as little as possible.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = settings.ADMISSION_CONTROL
+        self.enabled = config['ENABLED']
+        self.parallelism = config['PARALLELISM'] or worker_threads()
+        self.max_in_flight = {
+            priority: max(math.ceil(per_slot * self.parallelism), 1)
+            for priority, per_slot in config['MAX_IN_FLIGHT_PER_SLOT'].items()
+        }
+        self.max_queue_seconds = {priority: ms / 1000 for priority, ms in config['MAX_QUEUE_MS'].items()}
+        self.priorities = config['PRIORITIES']
+        self.default_priority = config['DEFAULT_PRIORITY']
+        self.exempt_routes = set(config['EXEMPT_ROUTES'])
+        self.smoothing = config['LATENCY_SMOOTHING']
+        self.initial_latency = config['INITIAL_LATENCY_MS'] / 1000
+        # Moving average latency per "METHOD route", and of all requests
+        self.latencies = {}
+        self.latency = self.initial_latency
+        self.in_flight = 0
+        # Sum of the expected latencies of the requests in flight
+        self.work_in_flight = 0.0
+        self._lock = threading.Lock()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        key, expected, rejection = self.admit(request)
+        if rejection is not None:
+            return rejection
+        started_at = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            self.release(key, expected, time.perf_counter() - started_at)
+
+    async def __acall__(self, request):
+        key, expected, rejection = self.admit(request)
+        if rejection is not None:
+            return rejection
+        started_at = time.perf_counter()
+        try:
+            return await self.get_response(request)
+        finally:
+            self.release(key, expected, time.perf_counter() - started_at)
+
+    def route_of(self, request):
+        """The "METHOD route" key of the request, e.g. "GET api/tasks/<int:task_id>/"."""
+        try:
+            route = resolve(request.path_info, getattr(request, "urlconf", None)).route
+        except Resolver404:
+            route = UNMATCHED_ROUTE
+        return f"{request.method} {route}", route
+
+    def priority_of(self, key, route):
+        return self.priorities.get(key) or self.priorities.get(route) or self.default_priority
+
+    def admit(self, request):
+        """
+        Returns the route key of the request, its expected latency if it is admitted, and the 503
+        response if it is rejected. Exempt requests have no expected latency and are not accounted for.
+        """
+        key, route = self.route_of(request)
+        if not self.enabled or route in self.exempt_routes:
+            return key, None, None
+        priority = self.priority_of(key, route)
+        if "HTTP_X_REQUEST_START" in request.META:
+            queue_seconds = request_queue_seconds(request, time.time())
+        else:
+            queue_seconds = self.listen_queue_seconds()
+        with self._lock:
+            if self.in_flight >= self.parallelism:
+                queue_seconds += self.work_in_flight / self.parallelism
+            if self.in_flight >= self.max_in_flight[priority]:
+                reason = CONCURRENCY
+            elif queue_seconds > self.max_queue_seconds[priority]:
+                reason = QUEUE_TIME
+            else:
+                expected = self.latencies.get(key, self.initial_latency)
+                self.in_flight += 1
+                self.work_in_flight += expected
+                return key, expected, None
+            in_flight = self.in_flight
+        return key, None, self.reject(key, priority, reason, in_flight, queue_seconds)
+
+    def listen_queue_seconds(self):
+        """Expected wait of the requests in the uWSGI listen queue, which all workers of the server drain."""
+        queued = listen_queue()
+        if not queued:
+            return 0.0
+        return queued * self.latency / (self.parallelism * (uwsgi.numproc or 1))
+
+    def release(self, key, expected, seconds):
+        """Accounts for the end of an admitted request and adds its latency to the average of its route."""
+        if expected is None:
+            return
+        with self._lock:
+            self.in_flight -= 1
+            self.work_in_flight = max(self.work_in_flight - expected, 0.0)
+            latency = self.latencies.get(key)
+            self.latencies[key] = seconds if latency is None else latency + self.smoothing * (seconds - latency)
+            self.latency += self.smoothing * (seconds - self.latency)
+
+    def reject(self, key, priority, reason, in_flight, queue_seconds):
+        """The 503 response of a rejected request, telling the client to retry once the queue has drained."""
+        admission_rejections.labels(priority, reason).inc()
+        logger.debug(
+            "Rejected {} ({} priority): {} budget exceeded with {} requests in flight and {:.0f} ms queue time",
+            key, priority, reason, in_flight, queue_seconds * 1000,
+        )
+        retry_after = max(1, math.ceil(queue_seconds))
+        body = ujson.dumps({"error": "Server is overloaded, retry in {} s".format(retry_after)})
+        response = HttpResponse(
+            body, status=503, content_type="application/json", headers={"Retry-After": str(retry_after)}
+        )
+        # Counted in admission_rejections_total; django.request would log every rejection as an error
+        response._has_been_logged = True
+        return response
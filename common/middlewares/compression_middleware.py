@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from common.compression import build_codecs, negotiate
+from common.instrumentation import timed
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses response bodies with the best content coding the client accepts (Accept-Encoding):
+    zstd, brotli or gzip, see COMPRESSION in the settings.
+
+    Bodies smaller than COMPRESSION['MIN_SIZE'] are sent as they are, since the saved bytes do not
+    pay for the CPU time. Streaming responses (e.g. the task export) are compressed chunk by
+    chunk, and every chunk is flushed to the client. Responses that already have a
+    Content-Encoding (e.g. the pre-compressed OpenAPI schema), that are not of a textual
+    CONTENT_TYPES or that forbid transformations are left alone.
+
+    Like Django's GZipMiddleware, strong ETags of compressed responses are made weak (RFC 9110
+    section 8.8.1); If-None-Match compares them weakly, so revalidation keeps working.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        config = settings.COMPRESSION
+        self.codecs = build_codecs(config)
+        self.min_size = config.get("MIN_SIZE", 1024)
+        self.content_types = tuple(config.get("CONTENT_TYPES", ("application/json", "text/")))
+
+    def compressible(self, response):
+        """Whether the body of the response may be compressed, regardless of the client."""
+        if not self.codecs or response.has_header("Content-Encoding"):
+            return False
+        if not response.get("Content-Type", "").startswith(self.content_types):
+            return False
+        if "no-transform" in response.get("Cache-Control", ""):
+            return False
+        return response.streaming or len(response.content) >= self.min_size
+
+    def process_response(self, request, response):
+        if not self.compressible(response):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        codec = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""), self.codecs)
+        if codec is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = codec.astream(response.streaming_content)
+            else:
+                response.streaming_content = codec.stream(response.streaming_content)
+            # The compressed size is only known once the stream ends
+            del response.headers["Content-Length"]
+        else:
+            with timed("compress"):
+                compressed_content = codec.compress(response.content)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response.headers["Content-Length"] = str(len(compressed_content))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = codec.name
+        return response
@@ -0,0 +1,62 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from common.instrumentation import request_latency, requests_in_progress, request_exceptions
+
+# Route label of requests that did not match any URL pattern, so that scans do not create new series
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_label(request):
+    """The URL pattern the request was routed to, e.g. api/tasks/<int:task_id>/."""
+    match = getattr(request, "resolver_match", None)
+    return match.route if match is not None else UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Records the Prometheus request metrics exposed on /metrics: a latency histogram per route,
+    method and status, the number of requests in flight and the unhandled exceptions.
+
+    Routes are labelled with their URL pattern instead of the path, so the number of series stays bounded.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        in_progress = requests_in_progress.labels(request.method)
+        in_progress.inc()
+        started_at = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            in_progress.dec()
+        self.observe(request, response, time.perf_counter() - started_at)
+        return response
+
+    async def __acall__(self, request):
+        in_progress = requests_in_progress.labels(request.method)
+        in_progress.inc()
+        started_at = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            in_progress.dec()
+        self.observe(request, response, time.perf_counter() - started_at)
+        return response
+
+    def observe(self, request, response, seconds):
+        """Adds the request to the latency histogram."""
+        request_latency.labels(route_label(request), request.method, response.status_code).observe(seconds)
+
+    def process_exception(self, request, exception):
+        """Counts the exception; Django turns it into a 500 response afterwards."""
+        request_exceptions.labels(route_label(request), request.method, type(exception).__name__).inc()
@@ -0,0 +1,69 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from loguru import logger
+
+from common.instrumentation import RequestTimings, current_request_timings
+
+
+class RequestTimingMiddleware:
+    """
+    Measures every request: the number of SQL statements and the time spent in the database,
+    waiting for a pooled connection, serializing and rendering, and the total time.
+
+    The durations are returned in a Server-Timing header, so they show up in the browser's network
+    panel and in load test results, and are written as one structured log line per request.
+    Requests slower than REQUEST_TIMING['SLOW_REQUEST_MS'] are logged as a warning together
+    with the statements they executed.
+
+    Place it first in MIDDLEWARE so that the total includes the other middlewares.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing_header = settings.REQUEST_TIMING['SERVER_TIMING_HEADER']
+        self.slow_request_seconds = settings.REQUEST_TIMING['SLOW_REQUEST_MS'] / 1000
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings = RequestTimings()
+        token = current_request_timings.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request_timings.reset(token)
+        return self.report(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = RequestTimings()
+        token = current_request_timings.set(timings)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request_timings.reset(token)
+        return self.report(request, response, timings)
+
+    def report(self, request, response, timings):
+        """Adds the Server-Timing header and logs the timings of the request."""
+        total = timings.total()
+        if self.server_timing_header:
+            response["Server-Timing"] = timings.server_timing(total)
+        durations = timings.durations
+        logger.info(
+            "request method={} path={} status={} total_ms={:.2f} db_ms={:.2f} queries={} pool_ms={:.2f} "
+            "serialize_ms={:.2f} render_ms={:.2f}",
+            request.method, request.path, response.status_code, total * 1000, durations.get("db", 0.0) * 1000,
+            timings.queries, durations.get("pool", 0.0) * 1000, durations.get("serialize", 0.0) * 1000,
+            durations.get("render", 0.0) * 1000,
+        )
+        if total > self.slow_request_seconds:
+            logger.warning(
+                "Slow request {} {} took {:.2f} ms with {} queries:\n{}",
+                request.method, request.path, total * 1000, timings.queries,
+                "\n".join(f"{seconds * 1000:.2f} ms {statement}" for statement, seconds in timings.statements),
+            )
+        return response
@@ -0,0 +1,82 @@
+import math
+
+import ujson
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.http import HttpResponse
+from loguru import logger
+
+from common.db_adapters.errors import (
+    DatabaseConnectionError, DatabaseUnavailableError, DeadlockError, QueryTimeoutError,
+)
+from common.db_adapters.sql_db import UnitOfWork, current_unit_of_work
+
+# Errors of a database that is unavailable or overloaded for now, answered with 503 instead of 500
+TRANSIENT_ERRORS = (DatabaseUnavailableError, QueryTimeoutError, DatabaseConnectionError, DeadlockError)
+
+
+class UnitOfWorkMiddleware:
+    """
+    Runs every request inside one UnitOfWork, so all SQLDB operations of an API call share a
+    single pooled connection and are committed in one transaction when the response is ready.
+
+    Responses with a 5xx status are rolled back. The connection is only checked out if the
+    view actually talks to the database. A view failing with a transient database error (open
+    circuit, timeout, broken connection, deadlock) is answered with 503 and Retry-After.
+
+    Under ASGI the middleware runs on the event loop, so async views are not pushed into a
+    thread. Sync views still run in the unit of work, and the transaction they opened is finished
+    in the same thread they ran in.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        unit_of_work = UnitOfWork()
+        with unit_of_work:
+            response = self.get_response(request)
+            if response.status_code >= 500:
+                logger.error("Rolling back unit of work for {} with status {}", request.path, response.status_code)
+                unit_of_work.rollback()
+        return response
+
+    async def __acall__(self, request):
+        unit_of_work = UnitOfWork()
+        token = current_unit_of_work.set(unit_of_work)
+        try:
+            response = await self.get_response(request)
+        except Exception:
+            await self.finish(unit_of_work, unit_of_work.rollback)
+            raise
+        finally:
+            current_unit_of_work.reset(token)
+        if response.status_code >= 500:
+            logger.error("Rolling back unit of work for {} with status {}", request.path, response.status_code)
+            await self.finish(unit_of_work, unit_of_work.rollback)
+        else:
+            await self.finish(unit_of_work, unit_of_work.commit)
+        return response
+
+    async def finish(self, unit_of_work, end):
+        """Commits or rolls back on the loop when no connection was opened, otherwise in the sync thread."""
+        if unit_of_work.connected:
+            await sync_to_async(end)()
+        else:
+            end()
+
+    def process_exception(self, request, exception):
+        """Answers transient database errors with 503 and Retry-After; other errors are left to Django (500)."""
+        if not isinstance(exception, TRANSIENT_ERRORS):
+            return None
+        retry_after = max(1, math.ceil(getattr(exception, "retry_after", 0)))
+        logger.warning("Database unavailable for {}: {}", request.path, type(exception).__name__)
+        body = ujson.dumps({"error": "Database temporarily unavailable, retry in {} s".format(retry_after)})
+        return HttpResponse(
+            body, status=503, content_type="application/json", headers={"Retry-After": str(retry_after)}
+        )
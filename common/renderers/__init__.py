@@ -0,0 +1,5 @@
+from .ujson_renderer import UJSONRenderer
+
+__all__ = [
+    "UJSONRenderer",
+]
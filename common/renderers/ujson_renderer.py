@@ -0,0 +1,40 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+import ujson
+from django.utils.functional import Promise
+from rest_framework.renderers import JSONRenderer
+
+from common.instrumentation import timed
+from common.serializers import format_datetime
+
+
+def encode_default(obj):
+    """Encodes the non JSON native values the way DRF's JSON encoder does."""
+    if isinstance(obj, datetime):
+        return format_datetime(obj)
+    if isinstance(obj, (date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (Decimal, UUID, Promise)):
+        return str(obj)
+    if isinstance(obj, (set, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class UJSONRenderer(JSONRenderer):
+    """
+    JSON renderer encoding response data in one pass with ujson. Data produced by RowSerializer is
+    already JSON native, so nothing is converted again in Python.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, bytes):  # Already encoded
+            return data
+        with timed("render"):
+            return ujson.dumps(
+                data, ensure_ascii=False, escape_forward_slashes=False, default=encode_default
+            ).encode('utf-8')
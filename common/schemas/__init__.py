@@ -1,5 +1,8 @@
-from .pagination_schema import PaginationSchema
+from .pagination_schema import PaginationSchema, CursorPaginationSchema, SearchSchema, ChangeFeedSchema
 
 __all__ = [
     "PaginationSchema",
+    "CursorPaginationSchema",
+    "SearchSchema",
+    "ChangeFeedSchema",
 ]
\ No newline at end of file
@@ -1,5 +1,5 @@
-from typing import Optional
-from pydantic import BaseModel, conint
+from typing import Literal, Optional
+from pydantic import BaseModel, conint, constr
 
 class PaginationSchema(BaseModel):
     """
@@ -15,4 +15,65 @@ class PaginationSchema(BaseModel):
             Defaults to 10 if not provided.
     """
     page: Optional[conint(ge=0)] = 1  # Page must be 0 or greater
-    limit: Optional[conint(gt=0)] = 10  # Limit must be greater than 0
\ No newline at end of file
+    limit: Optional[conint(gt=0)] = 10  # Limit must be greater than 0
+
+
+class CursorPaginationSchema(BaseModel):
+    """
+    Schema for cursor (keyset) pagination parameters.
+
+    Attributes:
+        cursor (Optional[str]):
+            The opaque cursor returned as next_cursor by the previous page.
+            Omitted or empty for the first page.
+
+        limit (Optional[conint(gt=0)]):
+            The maximum number of items per page. Must be greater than 0.
+            Defaults to 10 if not provided.
+
+        ordering (Literal):
+            The deterministic ordering of the results: "id" / "-id" by ID, or
+            "created_at" / "-created_at" by creation time with the ID as tie-breaker.
+            A leading "-" means descending. Defaults to "id".
+    """
+    cursor: Optional[str] = None
+    limit: Optional[conint(gt=0)] = 10  # Limit must be greater than 0
+    ordering: Literal["id", "-id", "created_at", "-created_at"] = "id"
+
+
+class SearchSchema(BaseModel):
+    """
+    Schema for search parameters, paginated with a cursor in relevance order.
+
+    Attributes:
+        q (constr(min_length=1, max_length=255)):
+            The search query; surrounding whitespace is stripped.
+
+        cursor (Optional[str]):
+            The opaque cursor returned as next_cursor by the previous page.
+            Omitted or empty for the first page.
+
+        limit (Optional[conint(gt=0)]):
+            The maximum number of items per page. Must be greater than 0.
+            Defaults to 10 if not provided.
+    """
+    q: constr(strip_whitespace=True, min_length=1, max_length=255)
+    cursor: Optional[str] = None
+    limit: Optional[conint(gt=0)] = 10  # Limit must be greater than 0
+
+
+class ChangeFeedSchema(BaseModel):
+    """
+    Schema for change feed parameters.
+
+    Attributes:
+        since (Optional[str]):
+            The opaque cursor returned as next_cursor by the previous poll.
+            Omitted or empty to read the feed from the beginning.
+
+        limit (Optional[conint(gt=0)]):
+            The maximum number of changes per response. Must be greater than 0.
+            Defaults to 100 if not provided.
+    """
+    since: Optional[str] = None
+    limit: Optional[conint(gt=0)] = 100  # Limit must be greater than 0
@@ -0,0 +1,6 @@
+from .row_serializer import RowSerializer, format_datetime
+
+__all__ = [
+    "RowSerializer",
+    "format_datetime",
+]
@@ -0,0 +1,115 @@
+from datetime import date, datetime, time
+
+from pydantic.datetime_parse import parse_date, parse_datetime, parse_time
+
+from common.instrumentation import timed
+
+
+def format_datetime(value):
+    """Formats a datetime like DRF's JSON encoder (ISO 8601, UTC as "Z")."""
+    if not isinstance(value, datetime):
+        value = parse_datetime(value)
+    representation = value.isoformat()
+    if representation.endswith('+00:00'):
+        representation = representation[:-6] + 'Z'
+    return representation
+
+
+def format_date(value):
+    if not isinstance(value, date):
+        value = parse_date(value)
+    return value.isoformat()
+
+
+def format_time(value):
+    if not isinstance(value, time):
+        value = parse_time(value)
+    return value.isoformat()
+
+
+# Converters from DB column values to JSON native values, by the type of the schema field
+CONVERTERS = {
+    datetime: format_datetime,
+    date: format_date,
+    time: format_time,
+    bool: bool,
+}
+
+
+class RowSerializer:
+    """
+    Fast output path turning trusted DB rows into JSON native dictionaries.
+
+    The fields, their order and the value conversions are taken once from a Pydantic schema, and
+    for every column layout (the column names of a row) a plan mapping column positions to output
+    fields is compiled and reused. Rows are then converted with plain tuple indexing instead of
+    running Pydantic's from_orm and validation per row. The output matches
+    ``Schema.from_orm(row).dict()`` as encoded by DRF's JSON renderer.
+
+    Input from clients must still go through the schema's validation.
+    """
+
+    def __init__(self, schema):
+        """
+        Initializes the serializer.
+
+        Args:
+            schema (type): The Pydantic model describing the output fields.
+        """
+        self.schema = schema
+        self.fields = [(name, field, CONVERTERS.get(field.type_)) for name, field in schema.__fields__.items()]
+        self._plans = {}
+
+    def compile(self, columns):
+        """
+        Compiles the conversion plan for a column layout.
+
+        Args:
+            columns (tuple): The column names of a row, in order.
+
+        Returns:
+            list: (field name, column index or None, converter, field) per output field.
+        """
+        positions = {column: index for index, column in enumerate(columns)}
+        plan = [(name, positions.get(name), converter, field) for name, field, converter in self.fields]
+        self._plans[columns] = plan
+        return plan
+
+    def convert(self, plan, row):
+        data = {}
+        for name, index, converter, field in plan:
+            # Columns missing from the row get the schema default
+            value = field.get_default() if index is None else row[index]
+            data[name] = value if value is None or converter is None else converter(value)
+        return data
+
+    def to_dict(self, row):
+        """
+        Converts a row (SQLAlchemy Row or named tuple) into a JSON native dictionary.
+
+        Args:
+            row: The row to convert.
+
+        Returns:
+            dict: The serialized row.
+        """
+        with timed("serialize"):
+            plan = self._plans.get(row._fields) or self.compile(row._fields)
+            return self.convert(plan, row)
+
+    def to_dicts(self, rows):
+        """
+        Converts a list of rows sharing one column layout.
+
+        Args:
+            rows (list): The rows to convert.
+
+        Returns:
+            list: The serialized rows.
+        """
+        if not rows:
+            return []
+        with timed("serialize"):
+            plan = self._plans.get(rows[0]._fields) or self.compile(rows[0]._fields)
+            convert = self.convert
+            return [convert(plan, row) for row in rows]
@@ -0,0 +1,14 @@
+from .cursor import encode_cursor, decode_cursor, check_cursor_values, InvalidCursorError
+from .http import compute_etag, to_timestamp, validator_headers, version_etag, parse_version_etag
+
+__all__ = [
+    "encode_cursor",
+    "decode_cursor",
+    "check_cursor_values",
+    "InvalidCursorError",
+    "compute_etag",
+    "to_timestamp",
+    "validator_headers",
+    "version_etag",
+    "parse_version_etag",
+]
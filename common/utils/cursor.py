@@ -0,0 +1,84 @@
+import base64
+from datetime import datetime
+
+import ujson
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(ordering, values):
+    """
+    Encodes the position of a row in an ordering into an opaque, URL safe cursor.
+
+    Args:
+        ordering (str): The name of the ordering the cursor belongs to.
+        values (list): The values of the ordering columns of the last row of a page.
+
+    Returns:
+        str: The encoded cursor.
+    """
+    payload = ujson.dumps({"o": ordering, "v": [_encode_value(value) for value in values]})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): The encoded cursor.
+
+    Returns:
+        tuple: The ordering name and the list of column values.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = ujson.loads(base64.urlsafe_b64decode(padded.encode()))
+        return payload["o"], [_decode_value(value) for value in payload["v"]]
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+
+def _is_instance(value, expected):
+    if isinstance(value, bool):  # bool is an int, but never a value of an int column
+        return expected is bool
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def check_cursor_values(values, types):
+    """
+    Checks that the values of a decoded cursor match the columns of its ordering, so that a
+    tampered cursor is rejected before it reaches a query.
+
+    Args:
+        values (list): The column values decoded from the cursor.
+        types (list): The Python type of every ordering column, e.g. [datetime, int].
+
+    Raises:
+        InvalidCursorError: If the number or the types of the values do not match.
+    """
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursorError(f"Cursor has {len(values) if isinstance(values, list) else 'no'} values, "
+                                 f"expected {len(types)}")
+    for value, expected in zip(values, types):
+        if not _is_instance(value, expected):
+            raise InvalidCursorError(f"Cursor value {value!r} is not a {expected.__name__}")
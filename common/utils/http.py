@@ -0,0 +1,88 @@
+import hashlib
+from datetime import timezone
+
+from django.utils.http import http_date
+from pydantic.datetime_parse import parse_datetime
+
+
+def compute_etag(*parts):
+    """
+    Builds a strong ETag from the given parts (e.g. a resource ID and its update time).
+
+    Args:
+        *parts: Values identifying the version of a representation.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    digest = hashlib.blake2b(":".join([str(part) for part in parts]).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def to_timestamp(value):
+    """
+    Converts a datetime (or its string form) to a POSIX timestamp, treating naive values as UTC.
+
+    Args:
+        value (datetime or str): The datetime, e.g. an updated_at column.
+
+    Returns:
+        float: Seconds since the epoch, with microseconds.
+    """
+    value = parse_datetime(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def validator_headers(etag, last_modified):
+    """
+    Returns the ETag and Last-Modified response headers.
+
+    Args:
+        etag (str): The quoted ETag.
+        last_modified (float): The POSIX timestamp of the last modification, or None to send only the ETag.
+
+    Returns:
+        dict: The headers.
+    """
+    if last_modified is None:
+        return {"ETag": etag}
+    return {"ETag": etag, "Last-Modified": http_date(int(last_modified))}
+
+
+def version_etag(key, version):
+    """
+    Builds the strong ETag of a versioned resource, which clients send back in If-Match.
+
+    Args:
+        key: The ID of the resource.
+        version (int): The row version of the resource.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    return f'"{key}-{version}"'
+
+
+def parse_version_etag(etag):
+    """
+    Parses an ETag built by version_etag, e.g. the value of an If-Match header.
+
+    Args:
+        etag (str): The quoted ETag, optionally weak (W/).
+
+    Returns:
+        tuple: The key (str) and the version (int), or None if the ETag is not a version ETag.
+    """
+    etag = etag.strip()
+    # The version names the state of the resource whatever its encoding, so the weak form that
+    # CompressionMiddleware gives compressed responses identifies the same version
+    if etag.startswith("W/"):
+        etag = etag[2:]
+    if len(etag) < 2 or etag[0] != '"' or etag[-1] != '"':
+        return None
+    key, _, version = etag[1:-1].rpartition("-")
+    if not key or not version.isdigit():
+        return None
+    return key, int(version)
@@ -0,0 +1,9 @@
+from .lazy_view import lazy_view
+from .metrics_view import MetricsView
+from .openapi_schema_view import OpenAPISchemaView
+
+__all__ = [
+    "lazy_view",
+    "MetricsView",
+    "OpenAPISchemaView",
+]
@@ -0,0 +1,25 @@
+import threading
+
+
+def lazy_view(load):
+    """
+    Returns a view that builds the real view on its first request, so that the modules behind it
+    (e.g. drf_yasg for the API docs) are not imported while a worker boots.
+
+    Args:
+        load (callable): Function without arguments returning the view.
+
+    Returns:
+        callable: The view function.
+    """
+    lock = threading.Lock()
+    loaded = []
+
+    def view(request, *args, **kwargs):
+        if not loaded:
+            with lock:
+                if not loaded:
+                    loaded.append(load())
+        return loaded[0](request, *args, **kwargs)
+
+    return view
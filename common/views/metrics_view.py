@@ -0,0 +1,21 @@
+from django.http import HttpResponse
+from django.views import View
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from common.instrumentation import metrics_registry
+
+
+class MetricsView(View):
+    """
+    Exposes the Prometheus metrics in the text format, aggregated over all worker processes when
+    PROMETHEUS_MULTIPROC_DIR is set (see common.instrumentation.metrics).
+    """
+
+    def get(self, request):
+        """
+        Handles GET requests from the Prometheus scraper.
+
+        :param request: The HTTP request object.
+        :return: Response containing the metrics in the Prometheus text format.
+        """
+        return HttpResponse(generate_latest(metrics_registry()), content_type=CONTENT_TYPE_LATEST)
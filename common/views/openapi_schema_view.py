@@ -0,0 +1,86 @@
+import gzip
+import hashlib
+import os
+import threading
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.views import View
+from loguru import logger
+
+SCHEMA_CONTENT_TYPES = {
+    "json": "application/json",
+    "yaml": "application/yaml",
+}
+
+
+class SchemaDocument:
+    """A pre-generated schema file held in memory with its gzip encoding and ETag."""
+
+    def __init__(self, content):
+        self.content = content
+        self.gzipped = gzip.compress(content)
+        self.etag = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+class OpenAPISchemaView(View):
+    """
+    Serves the OpenAPI schema written by ``manage.py generate_openapi_schema`` as a static document.
+
+    The schema is not generated per request: each worker reads the file once and answers with the
+    same bytes, an ETag for If-None-Match revalidation and a gzip encoding for clients accepting it.
+    A missing file is generated on the first request instead (e.g. in local development).
+    """
+    documents = {}
+    lock = threading.Lock()
+
+    @classmethod
+    def document(cls, file_format):
+        """
+        Returns the schema document of the format, loading (or generating) it on first use.
+
+        Args:
+            file_format (str): "json" or "yaml".
+
+        Returns:
+            SchemaDocument: The document.
+        """
+        document = cls.documents.get(file_format)
+        if document is None:
+            with cls.lock:
+                document = cls.documents.get(file_format)
+                if document is None:
+                    path = os.path.join(settings.OPENAPI_SCHEMA['DIR'], f"swagger.{file_format}")
+                    if not os.path.exists(path):
+                        from swagger import write_schema_files
+                        logger.warning("OpenAPI schema {} not found; generating it", path)
+                        write_schema_files()
+                    with open(path, "rb") as schema_file:
+                        document = cls.documents[file_format] = SchemaDocument(schema_file.read())
+        return document
+
+    def get(self, request, format):
+        """
+        Handles GET requests for the schema.
+
+        :param request: The HTTP request object.
+        :param format: The file extension from the URL, ".json" or ".yaml".
+        :return: Response containing the schema, or 304 Not Modified if the ETag still matches.
+        """
+        file_format = format.lstrip(".")
+        if file_format not in SCHEMA_CONTENT_TYPES:
+            raise Http404(f"Unknown schema format {format}")
+        document = self.document(file_format)
+
+        response = get_conditional_response(request, etag=document.etag)
+        if response is None:
+            if "gzip" in request.headers.get("Accept-Encoding", ""):
+                response = HttpResponse(document.gzipped, content_type=SCHEMA_CONTENT_TYPES[file_format])
+                response["Content-Encoding"] = "gzip"
+            else:
+                response = HttpResponse(document.content, content_type=SCHEMA_CONTENT_TYPES[file_format])
+        response["ETag"] = document.etag
+        patch_vary_headers(response, ("Accept-Encoding",))
+        patch_cache_control(response, public=True, max_age=settings.OPENAPI_SCHEMA['MAX_AGE'])
+        return response
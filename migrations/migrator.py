@@ -0,0 +1,216 @@
+"""
+Versioned SQL migrations.
+
+Migration files live in the app folders under migrations/ and are named
+``<version>_<description>.sql`` (e.g. ``tasks/0001_add_soft_delete_indexes.sql``). Versions are
+unique across all apps and applied in ascending order. Every applied migration is recorded in the
+schema_version table together with a checksum of its file, so running the migrator again only
+applies the new ones and an edited, already applied migration is reported instead of re-run.
+
+Every statement of a migration runs and is recorded in its own transaction, as MySQL commits DDL
+implicitly anyway. A migration that fails half way therefore leaves its applied statements recorded
+in schema_version_progress, and the next run resumes it at the failed statement.
+
+A migration that only makes sense on one database backend names it before the extension, e.g.
+``tasks/0002_add_tasks_fulltext_index.mysql.sql``; it is skipped on every other backend. A version
+may therefore have one file per backend, e.g. ``tasks/0000_create_tasks_table.mysql.sql`` and
+``tasks/0000_create_tasks_table.sqlite.sql``.
+"""
+import hashlib
+import os
+import re
+
+import sqlparse
+from loguru import logger
+from sqlalchemy import text
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_(\w+)(?:\.(\w+))?\.sql$")
+
+SCHEMA_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INT NOT NULL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum CHAR(64) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# Statements applied of the migrations that failed half way, with a checksum of those statements
+SCHEMA_VERSION_PROGRESS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version_progress (
+    version INT NOT NULL PRIMARY KEY,
+    statements INT NOT NULL,
+    checksum CHAR(64) NOT NULL
+)
+"""
+
+
+class MigrationError(Exception):
+    """Raised when the migrations on disk and the recorded schema versions disagree."""
+
+
+class Migration:
+    """A single versioned SQL migration file."""
+
+    def __init__(self, version, name, path, dialect=None):
+        self.version = version
+        self.name = name
+        self.path = path
+        self.dialect = dialect
+        with open(path) as migration_file:
+            self.sql = migration_file.read()
+        self.checksum = hashlib.sha256(self.sql.encode()).hexdigest()
+
+    def statements(self):
+        """Splits the migration file into its individual SQL statements."""
+        statements = [sqlparse.format(statement, strip_comments=True).strip() for statement in sqlparse.split(self.sql)]
+        return [statement.rstrip(";") for statement in statements if statement]
+
+    def statements_checksum(self, count):
+        """Checksum of the first count statements, which tells whether the applied part of the file changed."""
+        return hashlib.sha256("\n;\n".join(self.statements()[:count]).encode()).hexdigest()
+
+    def __repr__(self):
+        return f"Migration({self.version:04d}_{self.name})"
+
+
+class Migrator:
+    """
+    Applies the pending versioned migrations to a database and records them in schema_version.
+    """
+
+    def __init__(self, engine, migrations_dir=MIGRATIONS_DIR):
+        """
+        Initializes the migrator.
+
+        Args:
+            engine (Engine): The SQLAlchemy engine of the database to migrate.
+            migrations_dir (str, optional): The folder containing the app migration folders.
+        """
+        self.engine = engine
+        self.migrations_dir = migrations_dir
+
+    def discover(self):
+        """
+        Finds the migration files that apply to the engine's backend, ordered by version.
+
+        Returns:
+            list: The Migration objects.
+
+        Raises:
+            MigrationError: If two migration files for the backend share a version.
+        """
+        dialect_name = self.engine.dialect.name
+        migrations = {}
+        for app in sorted(os.listdir(self.migrations_dir)):
+            app_dir = os.path.join(self.migrations_dir, app)
+            if not os.path.isdir(app_dir):
+                continue
+            for file_name in sorted(os.listdir(app_dir)):
+                match = MIGRATION_FILE_PATTERN.match(file_name)
+                if not match:
+                    continue
+                if match.group(3) is not None and match.group(3) != dialect_name:
+                    continue
+                version = int(match.group(1))
+                if version in migrations:
+                    raise MigrationError(f"Duplicate migration version {version}: {file_name} and {migrations[version].path}")
+                migrations[version] = Migration(
+                    version, f"{app}/{match.group(2)}", os.path.join(app_dir, file_name), dialect=match.group(3)
+                )
+        return [migrations[version] for version in sorted(migrations)]
+
+    def applied(self):
+        """
+        Reads the recorded schema versions, creating the schema_version table if needed.
+
+        Returns:
+            dict: Checksums of the applied migrations keyed by version.
+        """
+        with self.engine.begin() as connection:
+            connection.execute(text(SCHEMA_VERSION_TABLE))
+            connection.execute(text(SCHEMA_VERSION_PROGRESS_TABLE))
+            rows = connection.execute(text("SELECT version, checksum FROM schema_version")).fetchall()
+        return {row.version: row.checksum for row in rows}
+
+    def progress(self):
+        """
+        Reads the statements applied of the migrations that failed half way.
+
+        Returns:
+            dict: (number of applied statements, their checksum) keyed by version.
+        """
+        with self.engine.connect() as connection:
+            rows = connection.execute(text("SELECT version, statements, checksum FROM schema_version_progress"))
+            return {row.version: (row.statements, row.checksum) for row in rows}
+
+    def pending(self):
+        """
+        Returns the migrations that still have to be applied to the engine's backend.
+
+        Raises:
+            MigrationError: If an applied migration file was changed afterwards.
+        """
+        applied = self.applied()
+        pending = []
+        for migration in self.discover():
+            if migration.version not in applied:
+                pending.append(migration)
+            elif applied[migration.version] != migration.checksum:
+                raise MigrationError(f"{migration} was changed after it had been applied")
+        return pending
+
+    def migrate(self):
+        """
+        Applies all pending migrations in version order, resuming a migration that failed half way
+        after its last applied statement.
+
+        Returns:
+            list: The migrations that were applied.
+
+        Raises:
+            MigrationError: If the applied statements of a migration that failed half way were changed.
+        """
+        pending = self.pending()
+        progress = self.progress()
+        for migration in pending:
+            statements = migration.statements()
+            done, checksum = progress.get(migration.version, (0, None))
+            if done:
+                if migration.statements_checksum(done) != checksum:
+                    raise MigrationError(f"{migration} failed after {done} statements, which were changed since")
+                logger.info("Resuming {} at statement {} of {}", migration, done + 1, len(statements))
+            else:
+                logger.info("Applying {}", migration)
+            for index in range(done, len(statements)):
+                self.apply_statement(migration, statements[index], index + 1)
+            with self.engine.begin() as connection:
+                connection.execute(
+                    text("INSERT INTO schema_version (version, name, checksum) VALUES (:version, :name, :checksum)"),
+                    {"version": migration.version, "name": migration.name, "checksum": migration.checksum},
+                )
+                connection.execute(text("DELETE FROM schema_version_progress WHERE version = :version"),
+                                   {"version": migration.version})
+        if not pending:
+            logger.info("Database schema is up to date.")
+        return pending
+
+    def apply_statement(self, migration, statement, count):
+        """
+        Runs one statement of a migration and records that its first count statements are applied,
+        in one transaction where the backend has transactional DDL.
+        """
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(text(statement))
+                params = {"version": migration.version}
+                connection.execute(text("DELETE FROM schema_version_progress WHERE version = :version"), params)
+                connection.execute(
+                    text("INSERT INTO schema_version_progress (version, statements, checksum) "
+                         "VALUES (:version, :statements, :checksum)"),
+                    {**params, "statements": count, "checksum": migration.statements_checksum(count)},
+                )
+        except Exception:
+            logger.error("{} failed at statement {}; fix it and migrate again to resume there", migration, count)
+            raise
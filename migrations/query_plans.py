@@ -0,0 +1,58 @@
+"""
+EXPLAIN based checks that the hot queries are served by an index.
+"""
+from sqlalchemy import text
+
+
+def explain(connection, query, params=None):
+    """
+    Returns the plan of a query as a list of dictionaries, one per plan row.
+
+    Args:
+        connection: SQLAlchemy connection object.
+        query (str): The SQL query to explain.
+        params (dict, optional): The parameters to bind to the query.
+
+    Returns:
+        list: The plan rows.
+    """
+    prefix = "EXPLAIN QUERY PLAN" if connection.dialect.name == "sqlite" else "EXPLAIN"
+    result = connection.execute(text(f"{prefix} {query}"), params or {})
+    return [dict(row._mapping) for row in result]
+
+
+def plan_uses_index(dialect_name, plan):
+    """
+    Tells whether every table access of a plan goes through an index.
+
+    Args:
+        dialect_name (str): The SQLAlchemy dialect name, e.g. "mysql" or "sqlite".
+        plan (list): The plan rows returned by explain().
+
+    Returns:
+        bool: False if any table is read by a full table scan.
+    """
+    if dialect_name == "sqlite":
+        # "SCAN tasks" is a full scan, "SEARCH tasks USING INDEX ..." or "SCAN tasks USING INDEX ..." are not
+        return all(not row["detail"].startswith("SCAN") or "USING" in row["detail"] for row in plan)
+    return all(row["key"] is not None and row["type"] != "ALL" for row in plan)
+
+
+def check_query_plans(engine, queries):
+    """
+    Explains the given queries and collects the ones that do not use an index.
+
+    Args:
+        engine (Engine): The SQLAlchemy engine of the database.
+        queries (dict): (query, params) pairs keyed by a descriptive name.
+
+    Returns:
+        dict: The plans of the offending queries keyed by name; empty if all queries use an index.
+    """
+    failures = {}
+    with engine.connect() as connection:
+        for name, (query, params) in queries.items():
+            plan = explain(connection, query, params)
+            if not plan_uses_index(connection.dialect.name, plan):
+                failures[name] = plan
+    return failures
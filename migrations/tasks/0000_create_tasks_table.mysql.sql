@@ -1,8 +1,5 @@
--- Use the task_tracker database
-CREATE DATABASE IF NOT EXISTS task_tracker;
-USE task_tracker;
-
--- Create the tasks table
+-- Create the tasks table in the database of DATABASE_URL (the MySQL container creates it from MYSQL_DATABASE).
+-- IF NOT EXISTS keeps it a no-op on databases whose table was created before it was a versioned migration.
 CREATE TABLE IF NOT EXISTS tasks (
     id INT AUTO_INCREMENT PRIMARY KEY,               -- Primary key with auto increment
     title VARCHAR(255) NOT NULL,                     -- Title field with varchar type
@@ -0,0 +1,10 @@
+-- SQLite counterpart of 0000_create_tasks_table.mysql.sql, for local runs and the tests on a SQLite DATABASE_URL.
+-- updated_at has no ON UPDATE clause on SQLite; the adapters set it on every write.
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    deleted TINYINT(1) DEFAULT 0
+);
@@ -0,0 +1,6 @@
+-- Every read filters on deleted = 0; these indexes serve the list queries of TaskDB
+-- id ordering (offset pages, keyset pages on id, lookups of live tasks)
+CREATE INDEX idx_tasks_deleted_id ON tasks (deleted, id);
+
+-- created_at ordering with id as tie-breaker (keyset pages by recency)
+CREATE INDEX idx_tasks_deleted_created_at_id ON tasks (deleted, created_at, id);
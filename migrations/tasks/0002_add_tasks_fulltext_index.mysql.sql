@@ -0,0 +1,3 @@
+-- Serves GET /api/tasks/?q= with MATCH (title, description) AGAINST (...) ranked by relevance.
+-- Other backends fall back to LIKE prefix matching (see SQLClauseBuilder.search_statement).
+CREATE FULLTEXT INDEX idx_tasks_title_description ON tasks (title, description);
@@ -0,0 +1,11 @@
+-- Soft-deleted tasks are moved here in batches by manage.py archive_deleted_tasks, which keeps the
+-- hot tasks table and its indexes small. The batches find their rows through idx_tasks_deleted_id.
+CREATE TABLE IF NOT EXISTS tasks_archive (
+    id INT NOT NULL PRIMARY KEY,                           -- ID the task had in the tasks table
+    title VARCHAR(255) NOT NULL,
+    description TEXT,
+    created_at TIMESTAMP NULL,
+    updated_at TIMESTAMP NULL,                             -- time the task was deleted
+    deleted TINYINT(1) DEFAULT 1,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,6 @@
+-- Row version for optimistic concurrency: every update increments it, and an update sent with
+-- If-Match only applies WHERE id = :id AND version = :version instead of locking the row.
+ALTER TABLE tasks ADD COLUMN version INT NOT NULL DEFAULT 1;
+
+-- The archive keeps every column of the tasks it receives
+ALTER TABLE tasks_archive ADD COLUMN version INT NOT NULL DEFAULT 1;
@@ -0,0 +1,3 @@
+-- Change feed (GET /api/tasks/changes/): seeks past the (updated_at, id) position of the client,
+-- deleted tasks included, so a poll reads only the rows changed since the previous one
+CREATE INDEX idx_tasks_updated_at_id ON tasks (updated_at, id);
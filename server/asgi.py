@@ -13,4 +13,25 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up
+from django.conf import settings  # noqa: E402
+from common.events import EventStreamApp  # noqa: E402
+from tasks.usecases import task_events  # noqa: E402
+
+# Task change events as Server-Sent Events, served next to Django: a stream stays open for as long as
+# the client is connected and must not hold a request of the Django stack for that long.
+task_event_stream = EventStreamApp(
+    task_events,
+    heartbeat_seconds=settings.TASKS_EVENTS['HEARTBEAT_SECONDS'],
+    retry_ms=settings.TASKS_EVENTS['RETRY_MS'],
+)
+# Only the process serving the streams receives the events, from startup on so that its history is complete
+task_events.start()
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and scope["path"] == settings.TASKS_EVENTS['PATH']:
+        return await task_event_stream(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -8,5 +8,4 @@ if APP_ENV == "DEV":
     from .develop import *
 else:
     # settings file for production
-    pass
-
+    from .production import *
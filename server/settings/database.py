@@ -0,0 +1,58 @@
+"""
+MySQL database credentials and SQLAlchemy pool settings, read from the environment
+"""
+import os
+
+SQL_DETAILS = {
+    # 'SQL_USER' : os.environ.get("JWT_RESOURCE_ID"),
+    'DB_NAME': os.getenv('MYSQL_DATABASE'),
+    'USER': os.getenv('MYSQL_USER'),
+    'PASSWORD': os.getenv('MYSQL_PASSWORD'),
+    'HOST': os.getenv('MYSQL_HOST', 'mysql-db'),
+    'PORT': os.getenv('MYSQL_PORT', '3306'),
+    # Optional full SQLAlchemy URL, overrides the MySQL credentials above when set
+    'URL': os.getenv('DATABASE_URL'),
+}
+
+# Connection pool shared by all SQLDB instances of a worker process
+SQL_POOL = {
+    'POOL_SIZE': int(os.getenv('SQL_POOL_SIZE', '5')),
+    'MAX_OVERFLOW': int(os.getenv('SQL_POOL_MAX_OVERFLOW', '10')),
+    'POOL_TIMEOUT': int(os.getenv('SQL_POOL_TIMEOUT', '30')),  # seconds to wait for a free connection
+    'POOL_RECYCLE': int(os.getenv('SQL_POOL_RECYCLE', '1800')),  # recycle connections before MySQL wait_timeout
+    'POOL_PRE_PING': os.getenv('SQL_POOL_PRE_PING', 'true').lower() == 'true',
+}
+
+
+# Maximum number of rows written by one multi-row INSERT of a bulk operation
+SQL_BULK_CHUNK_SIZE = int(os.getenv('SQL_BULK_CHUNK_SIZE', '500'))
+
+# Maximum number of generated SQL statements (one per operation, table and column set) kept for reuse
+SQL_STATEMENT_CACHE_SIZE = int(os.getenv('SQL_STATEMENT_CACHE_SIZE', '512'))
+
+# Statement timeouts, so that a slow database fails requests fast instead of holding the workers until harakiri
+SQL_TIMEOUTS = {
+    # MAX_EXECUTION_TIME hint of the SELECTs of task and page reads (MySQL); 0 disables the hint
+    'READ_MS': int(os.getenv('SQL_READ_TIMEOUT_MS', '2000')),
+    # MAX_EXECUTION_TIME hint of the full-text searches
+    'SEARCH_MS': int(os.getenv('SQL_SEARCH_TIMEOUT_MS', '5000')),
+    # innodb_lock_wait_timeout of the connections: how long a write waits for a locked row
+    'LOCK_WAIT_S': int(os.getenv('SQL_LOCK_WAIT_TIMEOUT', '5')),
+    'CONNECT_S': int(os.getenv('SQL_CONNECT_TIMEOUT', '5')),
+    # driver read and write timeout (PyMySQL) and maximum await of a statement (asyncio adapter): the backstop
+    # for statements without a hint (writes, export chunks) and for a server that stopped answering
+    'SOCKET_S': int(os.getenv('SQL_SOCKET_TIMEOUT', '30')),
+}
+
+# Retries of deadlocked statements and of reads on a broken connection, with jittered exponential backoff
+SQL_RETRY = {
+    'ATTEMPTS': int(os.getenv('SQL_RETRY_ATTEMPTS', '3')),
+    'BASE_DELAY_MS': int(os.getenv('SQL_RETRY_BASE_DELAY_MS', '20')),
+    'MAX_DELAY_MS': int(os.getenv('SQL_RETRY_MAX_DELAY_MS', '500')),
+}
+
+# Fail fast with DatabaseUnavailableError after consecutive connection errors and timeouts
+SQL_CIRCUIT_BREAKER = {
+    'FAILURE_THRESHOLD': int(os.getenv('SQL_CIRCUIT_FAILURE_THRESHOLD', '5')),  # 0 disables the breaker
+    'RESET_SECONDS': float(os.getenv('SQL_CIRCUIT_RESET_SECONDS', '10')),
+}
@@ -0,0 +1,50 @@
+"""
+Production settings for the JSON API, selected with app_env set to anything but DEV.
+
+Only what the API needs is loaded: no admin, sessions, auth, messages, static files or API docs,
+and a middleware chain without the session, CSRF and auth layers (the API views are csrf_exempt
+and unauthenticated). Database credentials come from the environment, no .env file is read.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import LOG_SETTINGS
+from .database import *
+
+# Required: an empty or shared default key would make every signed value forgeable
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured("The DJANGO_SECRET_KEY environment variable must be set in production.")
+
+DEBUG = False
+
+ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '*').split(',')
+
+INSTALLED_APPS = [
+    'tasks',
+]
+
+MIDDLEWARE = [
+    'common.middlewares.MetricsMiddleware',
+    'common.middlewares.AdmissionControlMiddleware',
+    'common.middlewares.RequestTimingMiddleware',
+    'common.middlewares.CompressionMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'common.middlewares.UnitOfWorkMiddleware',
+]
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'common.renderers.UJSONRenderer',
+    ],
+    # no django.contrib.auth: requests are anonymous and request.user is None
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'DEFAULT_PERMISSION_CLASSES': [],
+    'UNAUTHENTICATED_USER': None,
+}
+
+LOG_SETTINGS = {**LOG_SETTINGS, 'LEVEL': os.environ.get('LOG_LEVEL', 'INFO')}
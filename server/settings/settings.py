@@ -12,18 +12,18 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 import os, sys
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 # BASE_DIR = Path(__file__).resolve().parent.parent
 # Base dir is pointing to main directory in which apps, common etc
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-print(BASE_DIR)
 # adding all your apps in apps folder
-sys.path.insert(0, os.path.join(BASE_DIR, 'apps'))
-print(sys.path)
+if os.path.join(BASE_DIR, 'apps') not in sys.path:
+    sys.path.insert(0, os.path.join(BASE_DIR, 'apps'))
 
 
-# Quick-start development settings - unsuitable for production
+# Quick-start development settings - unsuitable for production, see production.py
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
@@ -55,15 +55,24 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Prometheus request latency and in-flight metrics, see /metrics
+    'common.middlewares.MetricsMiddleware',
+    # 503 with Retry-After beyond the concurrency and queue time budgets, before the rest of the chain
+    'common.middlewares.AdmissionControlMiddleware',
+    # Server-Timing header and per-request timing log, ahead of the others so that it measures them
+    'common.middlewares.RequestTimingMiddleware',
+    # zstd/brotli/gzip response compression, inside the timing so that it is measured
+    'common.middlewares.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
     # 'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # one connection and one transaction per API call
+    'common.middlewares.UnitOfWorkMiddleware',
 ]
 
 
@@ -83,6 +92,14 @@ TEMPLATES = [
     },
 ]
 
+REST_FRAMEWORK = {
+    # ujson renderer first: task rows are serialized to JSON native dicts and encoded in one pass
+    'DEFAULT_RENDERER_CLASSES': [
+        'common.renderers.UJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
 ROOT_URLCONF = 'server.urls'
 
 # pointing it to server uwsgi package
@@ -112,6 +129,62 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Loguru configuration applied when the tasks app is ready, see common.logger.configure_logging
+LOG_SETTINGS = {
+    'LEVEL': os.environ.get('LOG_LEVEL', 'DEBUG' if DEBUG else 'INFO'),
+    'FORMAT': "{time} {level} {message}",
+    # write logs from a background thread instead of blocking the request on stderr
+    'ENQUEUE': os.environ.get('LOG_ENQUEUE', 'false').lower() == 'true',
+    # fraction of executed SQL queries that are logged at DEBUG level
+    'QUERY_SAMPLE_RATE': float(os.environ.get('LOG_QUERY_SAMPLE_RATE', '1.0')),
+}
+
+# Per-request performance instrumentation, see common.middlewares.RequestTimingMiddleware
+REQUEST_TIMING = {
+    # return the query count and the db, pool, serialize, render and total durations as a Server-Timing header
+    'SERVER_TIMING_HEADER': os.environ.get('SERVER_TIMING_HEADER', 'true').lower() == 'true',
+    # requests slower than this are logged as a warning together with their SQL statements
+    'SLOW_REQUEST_MS': float(os.environ.get('SLOW_REQUEST_MS', '500')),
+}
+
+# Load shedding, see common.middlewares.AdmissionControlMiddleware. Requests are rejected with 503 and
+# Retry-After when the budget of their route priority is exceeded, instead of queueing until clients time out.
+ADMISSION_CONTROL = {
+    'ENABLED': os.environ.get('ADMISSION_CONTROL', 'true').lower() == 'true',
+    # requests one worker serves at the same time, the DB pool size of an ASGI worker;
+    # unset, the threads of the uWSGI worker (1 outside uWSGI)
+    'PARALLELISM': int(os.environ['ADMISSION_PARALLELISM']) if os.environ.get('ADMISSION_PARALLELISM') else None,
+    # concurrency budget per unit of PARALLELISM: requests in flight in the worker at which requests
+    # of the priority are rejected, e.g. 4 threads and 2 per thread reject lists at 8 requests in flight
+    'MAX_IN_FLIGHT_PER_SLOT': {
+        'high': float(os.environ.get('ADMISSION_MAX_IN_FLIGHT_PER_SLOT_HIGH', '16')),
+        'normal': float(os.environ.get('ADMISSION_MAX_IN_FLIGHT_PER_SLOT_NORMAL', '8')),
+        'low': float(os.environ.get('ADMISSION_MAX_IN_FLIGHT_PER_SLOT_LOW', '2')),
+    },
+    # queue time budget: time waited before reaching the worker (X-Request-Start header of the proxy, or
+    # without it the uWSGI listen queue times the recent latency) plus the work in flight ahead of the
+    # request, estimated from the recent latency of its routes
+    'MAX_QUEUE_MS': {
+        'high': float(os.environ.get('ADMISSION_MAX_QUEUE_MS_HIGH', '2000')),
+        'normal': float(os.environ.get('ADMISSION_MAX_QUEUE_MS_NORMAL', '1000')),
+        'low': float(os.environ.get('ADMISSION_MAX_QUEUE_MS_LOW', '500')),
+    },
+    # priority by "METHOD route" or route pattern; cheap single task reads are shed last, lists and bulk calls first
+    'PRIORITIES': {
+        'GET api/tasks/<int:task_id>/': 'high',
+        'GET api/tasks/': 'low',
+        'api/tasks/bulk/': 'low',
+        'api/tasks/export/': 'low',
+    },
+    'DEFAULT_PRIORITY': 'normal',
+    # never rejected nor accounted for
+    'EXEMPT_ROUTES': ['metrics'],
+    # weight of the latest request in the moving average latency of its route
+    'LATENCY_SMOOTHING': 0.2,
+    # expected latency of a route before its first request completed
+    'INITIAL_LATENCY_MS': 20,
+}
+
 # LOG_LEVEL = "DEBUG" if DEBUG else "INFO"
 #
 #
@@ -166,3 +239,99 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# OpenAPI schema written by manage.py generate_openapi_schema and served at /swagger.json/ and /swagger.yaml/
+OPENAPI_SCHEMA = {
+    'DIR': os.environ.get('OPENAPI_SCHEMA_DIR', os.path.join(BASE_DIR, 'server', 'openapi')),
+    # seconds clients and proxies may reuse the schema before revalidating it with its ETag
+    'MAX_AGE': int(os.environ.get('OPENAPI_SCHEMA_MAX_AGE', '300')),
+}
+
+COMPRESSION = {
+    # Content-Encodings offered to clients in order of preference; zstd and br need the zstandard
+    # and brotli packages and are skipped without them. zstd level 3 saves about as many bytes as
+    # gzip level 6 in a tenth of the CPU time on task pages.
+    'ENCODINGS': os.environ.get('COMPRESSION_ENCODINGS', 'zstd,br,gzip').split(','),
+    # compression level per encoding, see manage.py benchmark_compression for the size/CPU trade-off
+    'LEVELS': {
+        'gzip': int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6')),
+        'br': int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '5')),
+        'zstd': int(os.environ.get('COMPRESSION_ZSTD_LEVEL', '3')),
+    },
+    # smaller bodies are sent uncompressed; streaming responses are always compressed
+    'MIN_SIZE': int(os.environ.get('COMPRESSION_MIN_SIZE', '1024')),
+    # Content-Type prefixes of the compressible responses
+    'CONTENT_TYPES': ['application/json', 'application/x-ndjson', 'application/yaml', 'text/'],
+}
+
+# The Swagger UI and ReDoc pages load the pre-generated schema instead of generating it
+SWAGGER_SETTINGS = {'SPEC_URL': '/swagger.json/'}
+REDOC_SETTINGS = {'SPEC_URL': '/swagger.json/'}
+
+# Serve the task CRUD routes with the asyncio views and database adapter. Only enable this when the
+# application runs behind an ASGI server (uvicorn server.asgi:application); uWSGI keeps the sync views.
+ASYNC_API = os.environ.get('ASYNC_API', 'false').lower() == 'true'
+
+# Maximum number of tasks accepted by one bulk create, update or delete request
+TASKS_BULK_MAX_ITEMS = 1000
+
+# Number of tasks read from the server-side cursor and written to the stream at a time by the export
+TASKS_EXPORT_CHUNK_SIZE = 1000
+
+# Batched move of soft-deleted tasks into tasks_archive, see manage.py archive_deleted_tasks
+TASKS_ARCHIVE = {
+    # tasks deleted longer ago than this are archived
+    'AFTER_DAYS': int(os.environ.get('TASKS_ARCHIVE_AFTER_DAYS', '30')),
+    # tasks moved per transaction; bounds the locks and undo log of each batch
+    'BATCH_SIZE': int(os.environ.get('TASKS_ARCHIVE_BATCH_SIZE', '500')),
+    # seconds to pause between batches, so that replication and the InnoDB purge keep up
+    'SLEEP': float(os.environ.get('TASKS_ARCHIVE_SLEEP', '0.5')),
+}
+
+# Cursor pagination and search of GET /api/tasks/
+TASKS_PAGINATION = {
+    # maximum number of tasks per cursor or search page
+    'MAX_LIMIT': int(os.environ.get('TASKS_PAGINATION_MAX_LIMIT', '100')),
+}
+
+# Change feed of GET /api/tasks/changes/
+TASKS_CHANGES = {
+    # changes are only served once they are this many seconds old, so that a write committed late or
+    # stamped by a worker with a slower clock cannot land behind a position already handed out
+    'SETTLE_SECONDS': float(os.environ.get('TASKS_CHANGES_SETTLE_SECONDS', '2')),
+    # maximum number of changes per response
+    'MAX_LIMIT': int(os.environ.get('TASKS_CHANGES_MAX_LIMIT', '1000')),
+}
+
+# Server-Sent Events stream of task changes on the ASGI entry point, see server/asgi.py
+TASKS_EVENTS_TRANSPORT = os.environ.get('TASKS_EVENTS_TRANSPORT', 'common.events.LocalTransport')
+
+TASKS_EVENTS = {
+    'PATH': '/api/tasks/events/',
+    # Carries the events between processes. LocalTransport only reaches the streams of the publishing process;
+    # set common.events.FileTransport to reach those of every process on the host (uWSGI and ASGI workers)
+    # through a shared log file. Deployments on several hosts plug in an EventTransport on a message bus.
+    'TRANSPORT': TASKS_EVENTS_TRANSPORT,
+    # keyword arguments of the transport: the shared log file and how often an idle log is checked
+    'TRANSPORT_OPTIONS': {
+        'path': os.environ.get('TASKS_EVENTS_LOG', os.path.join(tempfile.gettempdir(), 'task_events.log')),
+        'poll_interval': float(os.environ.get('TASKS_EVENTS_POLL_SECONDS', '0.05')),
+    } if TASKS_EVENTS_TRANSPORT == 'common.events.FileTransport' else {},
+    # events queued per client before a slow client is disconnected (it resumes with Last-Event-ID)
+    'QUEUE_SIZE': int(os.environ.get('TASKS_EVENTS_QUEUE_SIZE', '100')),
+    # recent events kept per process for clients resuming with Last-Event-ID
+    'HISTORY_SIZE': int(os.environ.get('TASKS_EVENTS_HISTORY_SIZE', '1000')),
+    'HEARTBEAT_SECONDS': float(os.environ.get('TASKS_EVENTS_HEARTBEAT_SECONDS', '15')),
+    # reconnection delay sent to the clients
+    'RETRY_MS': int(os.environ.get('TASKS_EVENTS_RETRY_MS', '3000')),
+}
+
+# Read-through cache in front of single task reads, written through or invalidated by every write.
+# BACKEND "lru" keeps a bounded in-process cache per worker (TTL bounds staleness across workers),
+# "django" uses the CACHES alias given in ALIAS (shared between workers), "none" disables caching.
+TASKS_CACHE = {
+    'BACKEND': os.environ.get('TASKS_CACHE_BACKEND', 'lru'),
+    'MAX_SIZE': int(os.environ.get('TASKS_CACHE_MAX_SIZE', '10000')),
+    'TTL': float(os.environ.get('TASKS_CACHE_TTL', '5')),
+    'ALIAS': 'default',
+}
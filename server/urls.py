@@ -13,15 +13,33 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
-from swagger import schema_view
+from common.views import MetricsView, OpenAPISchemaView, lazy_view
+
+
+def schema_ui_view(renderer, **kwargs):
+    """The drf_yasg docs UI view, imported by the first request to the docs."""
+    def load():
+        from swagger import schema_view
+        return schema_view.with_ui(renderer, **kwargs)
+    return lazy_view(load)
+
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/', include('tasks.urls'), name="tasks"),
-    path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
+
+# The admin and the API docs are only mounted by the settings that install them (not in production)
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+    urlpatterns.append(path('admin/', admin.site.urls))
+
+if apps.is_installed('drf_yasg'):
+    urlpatterns += [
+        # pre-generated by manage.py generate_openapi_schema, see OPENAPI_SCHEMA in the settings
+        path('swagger<format>/', OpenAPISchemaView.as_view(), name='schema-json'),
+        path('swagger/', schema_ui_view('swagger', cache_timeout=0), name='schema-swagger-ui'),
+        path('redoc/', schema_ui_view('redoc', cache_timeout=0), name='schema-redoc'),
+    ]
@@ -14,3 +14,14 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
 
 application = get_wsgi_application()
+
+try:
+    import uwsgi
+except ImportError:  # not running under uWSGI
+    uwsgi = None
+
+if uwsgi is not None:
+    from common.instrumentation import mark_process_dead
+
+    # drop the in-flight, pool and cache gauges of a worker from /metrics when it exits or is recycled
+    uwsgi.atexit = mark_process_dead
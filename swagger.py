@@ -1,17 +1,77 @@
+import os
+
+from django.conf import settings
 from rest_framework import permissions
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
 
+api_info = openapi.Info(
+   title="Snippets API",
+   default_version='v1',
+   description="Test description",
+   terms_of_service="https://www.google.com/policies/terms/",
+   contact=openapi.Contact(email="contact@snippets.local"),
+   license=openapi.License(name="BSD License"),
+)
+
+# Encoders of the pre-generated schema files by file extension
+SCHEMA_CODECS = {
+   "json": OpenAPICodecJson,
+   "yaml": OpenAPICodecYaml,
+}
+
+
+class UISchemaGenerator(OpenAPISchemaGenerator):
+   """
+   Schema generator of the Swagger UI and ReDoc pages. The pages only show the title and version of
+   the schema and load the spec itself from SPEC_URL, the pre-generated swagger.json, so rendering
+   them does not introspect the views.
+   """
+
+   def get_schema(self, request=None, public=False):
+      return openapi.Swagger(info=self.info, _prefix='/', paths=openapi.Paths(paths={}))
+
+
 schema_view = get_schema_view(
-   openapi.Info(
-      title="Snippets API",
-      default_version='v1',
-      description="Test description",
-      terms_of_service="https://www.google.com/policies/terms/",
-      contact=openapi.Contact(email="contact@snippets.local"),
-      license=openapi.License(name="BSD License"),
-   ),
+   api_info,
    public=True,
    permission_classes=(permissions.AllowAny,),
-)
\ No newline at end of file
+   generator_class=UISchemaGenerator,
+)
+
+
+def render_schema_files():
+   """
+   Introspects the API views once and encodes the schema in every format of SCHEMA_CODECS.
+
+   Returns:
+      dict: The encoded schema (bytes) by format.
+   """
+   schema = OpenAPISchemaGenerator(info=api_info).get_schema(request=None, public=True)
+   return {file_format: codec(validators=[]).encode(schema) for file_format, codec in SCHEMA_CODECS.items()}
+
+
+def write_schema_files(directory=None):
+   """
+   Generates the schema and writes it to swagger.json and swagger.yaml in the directory.
+
+   Args:
+      directory (str, optional): The target directory. Defaults to OPENAPI_SCHEMA['DIR'].
+
+   Returns:
+      list: The paths of the written files.
+   """
+   directory = directory or settings.OPENAPI_SCHEMA['DIR']
+   os.makedirs(directory, exist_ok=True)
+   paths = []
+   for file_format, content in render_schema_files().items():
+      path = os.path.join(directory, f"swagger.{file_format}")
+      # write and rename, so that a worker reading the file never sees it half written
+      with open(f"{path}.{os.getpid()}.tmp", "wb") as schema_file:
+         schema_file.write(content)
+      os.replace(f"{path}.{os.getpid()}.tmp", path)
+      paths.append(path)
+   return paths
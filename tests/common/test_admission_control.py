@@ -0,0 +1,144 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory
+
+from common.middlewares import AdmissionControlMiddleware
+from common.middlewares import admission_control_middleware
+from common.middlewares.admission_control_middleware import request_queue_seconds
+
+
+def ok_view(request):
+    return HttpResponse(b"{}", content_type="application/json")
+
+
+def arrived(seconds_ago):
+    """X-Request-Start header of a request that reached the proxy seconds_ago, in milliseconds."""
+    return {"HTTP_X_REQUEST_START": f"t={int((time.time() - seconds_ago) * 1000)}"}
+
+
+def uwsgi_worker(monkeypatch, threads, processes=2, queued=0):
+    """Runs the middleware as in a uWSGI worker with the given threads and requests in the listen queue."""
+    worker = SimpleNamespace(opt={"threads": str(threads).encode()}, numproc=processes, listen_queue=lambda: queued)
+    monkeypatch.setattr(admission_control_middleware, "uwsgi", worker)
+    return worker
+
+
+class TestAdmissionControl:
+    def test_concurrency_budget_sheds_lists_before_reads(self):
+        """Test that at the concurrency budget of the low priority lists are rejected and single task reads served."""
+        middleware = AdmissionControlMiddleware(ok_view)
+        middleware.in_flight = middleware.max_in_flight["low"]
+        factory = RequestFactory()
+
+        rejected = middleware(factory.get("/api/tasks/"))
+        served = middleware(factory.get("/api/tasks/1/"))
+
+        assert rejected.status_code == 503  # HTTP 503 Service Unavailable
+        assert int(rejected["Retry-After"]) >= 1
+        assert "error" in rejected.content.decode()
+        assert served.status_code == 200  # HTTP 200 OK
+        assert middleware.in_flight == middleware.max_in_flight["low"]
+
+    def test_queue_time_budget(self):
+        """Test that a request that waited longer than the queue time budget of its priority is rejected."""
+        middleware = AdmissionControlMiddleware(ok_view)
+        factory = RequestFactory()
+
+        assert middleware(factory.get("/api/tasks/", **arrived(1))).status_code == 503  # HTTP 503 Service Unavailable
+        assert middleware(factory.get("/api/tasks/1/", **arrived(1))).status_code == 200  # HTTP 200 OK
+        rejected = middleware(factory.get("/api/tasks/1/", **arrived(3)))
+        assert rejected.status_code == 503  # HTTP 503 Service Unavailable
+        assert int(rejected["Retry-After"]) >= 3
+
+    def test_work_in_flight_counts_as_queue_time(self, settings):
+        """Test that the recent latency of the requests in flight is added to the queue time once all slots are busy."""
+        settings.ADMISSION_CONTROL = {**settings.ADMISSION_CONTROL, 'PARALLELISM': 2}
+        middleware = AdmissionControlMiddleware(ok_view)
+        middleware.in_flight, middleware.work_in_flight = 2, 1.2  # two exports of 600 ms each
+
+        assert middleware(RequestFactory().get("/api/tasks/")).status_code == 503  # HTTP 503 Service Unavailable
+        assert middleware(RequestFactory().get("/api/tasks/1/")).status_code == 200  # HTTP 200 OK
+
+    def test_latency_per_route(self, settings):
+        """Test that completed requests update the moving average latency of their route and leave nothing in flight."""
+        settings.ADMISSION_CONTROL = {**settings.ADMISSION_CONTROL, 'LATENCY_SMOOTHING': 0.5}
+
+        def slow_view(request):
+            time.sleep(0.02)
+            return ok_view(request)
+
+        middleware = AdmissionControlMiddleware(slow_view)
+        for _ in range(2):
+            middleware(RequestFactory().get("/api/tasks/1/"))
+
+        assert middleware.latencies["GET api/tasks/<int:task_id>/"] >= 0.02
+        assert (middleware.in_flight, middleware.work_in_flight) == (0, 0.0)
+
+    def test_exempt_and_disabled(self, settings):
+        """Test that exempt routes and a disabled middleware admit every request."""
+        middleware = AdmissionControlMiddleware(ok_view)
+        middleware.in_flight = 1000
+
+        assert middleware(RequestFactory().get("/metrics")).status_code == 200  # HTTP 200 OK
+        settings.ADMISSION_CONTROL = {**settings.ADMISSION_CONTROL, 'ENABLED': False}
+        disabled = AdmissionControlMiddleware(ok_view)
+        assert disabled(RequestFactory().get("/api/tasks/", **arrived(60))).status_code == 200  # HTTP 200 OK
+
+    def test_async_requests(self):
+        """Test that the middleware admits and accounts for requests on the asyncio path."""
+        async def async_view(request):
+            return ok_view(request)
+
+        middleware = AdmissionControlMiddleware(async_view)
+        factory = AsyncRequestFactory()
+
+        async def scenario():
+            served = await middleware(factory.get("/api/tasks/1/"))
+            queued = {"X-Request-Start": f"t={time.time() - 5:.3f}"}
+            rejected = await middleware(factory.get("/api/tasks/", headers=queued))
+            return served.status_code, rejected.status_code
+
+        assert asyncio.run(scenario()) == (200, 503)
+        assert middleware.in_flight == 0
+
+    def test_request_queue_seconds(self):
+        """Test that X-Request-Start is read in seconds, milliseconds and microseconds."""
+        now = 1700000000.0
+        for header in ("t=1699999999.5", "t=1699999999500", "1699999999500000"):
+            request = RequestFactory().get("/", HTTP_X_REQUEST_START=header)
+            assert request_queue_seconds(request, now) == 0.5
+        assert request_queue_seconds(RequestFactory().get("/", HTTP_X_REQUEST_START="garbage"), now) == 0.0
+        assert request_queue_seconds(RequestFactory().get("/"), now) == 0.0
+
+    def test_overloaded_api_answers_503(self, client, create_task):
+        """Test that the API rejects a request that queued too long instead of serving it."""
+        response = client.get("/api/tasks/", **arrived(10))
+
+        assert response.status_code == 503  # HTTP 503 Service Unavailable
+        assert response.has_header("Retry-After")
+        assert client.get(f"/api/tasks/{create_task['id']}/").status_code == 200  # HTTP 200 OK
+
+    def test_budgets_follow_uwsgi_threads(self, monkeypatch, settings):
+        """Test that without PARALLELISM the budgets are derived from the threads of the uWSGI worker."""
+        settings.ADMISSION_CONTROL = {**settings.ADMISSION_CONTROL, 'PARALLELISM': None}
+        uwsgi_worker(monkeypatch, threads=4)
+        middleware = AdmissionControlMiddleware(ok_view)
+
+        per_slot = settings.ADMISSION_CONTROL['MAX_IN_FLIGHT_PER_SLOT']
+        assert middleware.parallelism == 4
+        assert middleware.max_in_flight == {priority: 4 * budget for priority, budget in per_slot.items()}
+
+    def test_listen_queue_counts_as_queue_time(self, monkeypatch, settings):
+        """Test that behind the uWSGI http router, without X-Request-Start, the listen queue trips the queue time budget."""
+        settings.ADMISSION_CONTROL = {**settings.ADMISSION_CONTROL, 'PARALLELISM': None}
+        worker = uwsgi_worker(monkeypatch, threads=1, processes=2, queued=10)
+        middleware = AdmissionControlMiddleware(ok_view)
+        middleware.latency = 0.2  # 10 requests of 200 ms ahead, drained by 2 workers: 1 s
+
+        assert middleware(RequestFactory().get("/api/tasks/")).status_code == 503  # HTTP 503 Service Unavailable
+        assert middleware(RequestFactory().get("/api/tasks/1/")).status_code == 200  # HTTP 200 OK
+        worker.listen_queue = lambda: 0
+        assert middleware(RequestFactory().get("/api/tasks/")).status_code == 200  # HTTP 200 OK
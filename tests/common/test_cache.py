@@ -0,0 +1,84 @@
+import time
+
+import pytest
+
+from common.cache import LRUCache, DjangoCacheAdapter, NullCache, build_cache
+
+
+class TestLRUCache:
+    def test_get_set_delete(self):
+        """Test that values are cached until deleted and counted as hits and misses."""
+        cache = LRUCache(max_size=10, ttl=60)
+        assert cache.get("a") is None
+        cache.set("a", {"id": 1})
+        assert cache.get("a") == {"id": 1}
+        cache.delete("a")
+        assert cache.get("a") is None
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+
+    def test_size_bound_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted beyond the size bound."""
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now the least recently used entry
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["size"] == 2
+
+    def test_add_keeps_live_entries(self):
+        """Test that add only stores a value for a missing or expired key."""
+        cache = LRUCache(max_size=10, ttl=0.01)
+
+        assert cache.add("a", 1)
+        assert not cache.add("a", 2)
+        assert cache.get("a") == 1
+        time.sleep(0.02)
+        assert cache.add("a", 3)
+        assert cache.get("a") == 3
+        assert not NullCache().add("a", 1)
+
+    def test_ttl_expires_entries(self):
+        """Test that entries expire after their time to live."""
+        cache = LRUCache(max_size=2, ttl=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+
+
+class TestDjangoCacheAdapter:
+    def test_get_set_delete(self):
+        """Test the adapter against the local memory Django cache backend."""
+        cache = DjangoCacheAdapter(alias="default", ttl=60, key_prefix="test")
+        cache.set("a", {"id": 1})
+        assert cache.get("a") == {"id": 1}
+        cache.delete("a")
+        assert cache.get("a") is None
+        assert cache.stats()["hits"] == 1
+
+    def test_add(self):
+        """Test that add does not replace a value of the backend."""
+        cache = DjangoCacheAdapter(alias="default", ttl=60, key_prefix="test")
+        cache.delete("b")
+
+        assert cache.add("b", 1)
+        assert not cache.add("b", 2)
+        assert cache.get("b") == 1
+
+
+class TestBuildCache:
+    def test_backends(self):
+        """Test building every cache backend from settings."""
+        assert isinstance(build_cache({"BACKEND": "lru", "MAX_SIZE": 5}), LRUCache)
+        assert isinstance(build_cache({"BACKEND": "django"}), DjangoCacheAdapter)
+        assert isinstance(build_cache({"BACKEND": "none"}), NullCache)
+        with pytest.raises(ValueError):
+            build_cache({"BACKEND": "unknown"})
@@ -0,0 +1,101 @@
+import gzip
+import json
+import zlib
+
+import brotli
+import zstandard
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+
+from common.compression import GzipCodec, BrotliCodec, ZstdCodec, negotiate
+from common.middlewares import CompressionMiddleware
+
+DECODERS = {
+    "gzip": gzip.decompress,
+    "br": brotli.decompress,
+    "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+def compress(response, accept_encoding="gzip, deflate, br, zstd"):
+    """Runs the response through CompressionMiddleware for a request with the given Accept-Encoding."""
+    request = RequestFactory().get("/api/tasks/", HTTP_ACCEPT_ENCODING=accept_encoding)
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+def json_body(size):
+    return json.dumps({"data": [{"id": index, "title": "Compressed task"} for index in range(size)]}).encode()
+
+
+class TestCompression:
+    def test_negotiate(self):
+        """Test that the coding with the highest q wins, ties going to the server preference."""
+        codecs = [ZstdCodec(3), BrotliCodec(5), GzipCodec(6)]
+
+        assert negotiate("gzip, br, zstd", codecs).name == "zstd"
+        assert negotiate("gzip, br", codecs).name == "br"
+        assert negotiate("gzip;q=1.0, br;q=0.5", codecs).name == "gzip"
+        assert negotiate("*", codecs).name == "zstd"
+        assert negotiate("*, zstd;q=0, br;q=0", codecs).name == "gzip"
+        assert negotiate("identity", codecs) is None
+        assert negotiate("", codecs) is None
+
+    def test_compress_response(self):
+        """Test that a JSON body is compressed with every encoding and decodes to the original."""
+        body = json_body(200)
+        for encoding, decode in DECODERS.items():
+            response = compress(HttpResponse(body, content_type="application/json"), accept_encoding=encoding)
+
+            assert response["Content-Encoding"] == encoding
+            assert response["Vary"] == "Accept-Encoding"
+            assert int(response["Content-Length"]) == len(response.content) < len(body)
+            assert decode(response.content) == body
+
+    def test_small_or_encoded_response_is_not_compressed(self):
+        """Test that small bodies, encoded bodies and binary content types are sent as they are."""
+        small = compress(HttpResponse(json_body(1), content_type="application/json"))
+        encoded = HttpResponse(gzip.compress(json_body(200)), content_type="application/json")
+        encoded["Content-Encoding"] = "gzip"
+        binary = compress(HttpResponse(json_body(200), content_type="application/octet-stream"))
+
+        assert not small.has_header("Content-Encoding")
+        assert compress(encoded).content == encoded.content
+        assert not binary.has_header("Content-Encoding")
+
+    def test_streaming_chunks_are_flushed(self):
+        """Test that every chunk of a stream can be decoded as soon as it is received."""
+        chunks = [json_body(20) + b"\n" for _ in range(3)]
+        response = compress(StreamingHttpResponse(iter(chunks), content_type="application/x-ndjson"),
+                            accept_encoding="gzip")
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+        streamed = iter(response.streaming_content)
+        for chunk in chunks:
+            assert decompressor.decompress(next(streamed)) == chunk
+        decompressor.decompress(b"".join(streamed))
+        assert decompressor.eof
+        assert response["Content-Encoding"] == "gzip"
+
+    def test_compressed_export(self, client, create_task):
+        """Test that the task export is streamed compressed."""
+        response = client.get("/api/tasks/export/", HTTP_ACCEPT_ENCODING="zstd")
+
+        assert response["Content-Encoding"] == "zstd"
+        lines = DECODERS["zstd"](b"".join(response.streaming_content)).decode().splitlines()
+        assert create_task["id"] in [json.loads(line)["id"] for line in lines]
+
+    def test_weak_etag_of_compressed_task(self, client):
+        """Test that the weak ETag of a compressed task is accepted by If-Match and If-None-Match."""
+        task_data = {"title": "Long task", "description": "Compressible description. " * 100}
+        task_id = client.post("/api/tasks/", data=json.dumps(task_data), content_type='application/json').json()["data"]["id"]
+
+        fetched = client.get(f"/api/tasks/{task_id}/", HTTP_ACCEPT_ENCODING="br")
+        etag = fetched["ETag"]
+
+        assert fetched["Content-Encoding"] == "br"
+        assert etag.startswith('W/"')
+        revalidated = client.get(f"/api/tasks/{task_id}/", HTTP_ACCEPT_ENCODING="br", HTTP_IF_NONE_MATCH=etag)
+        assert revalidated.status_code == 304  # HTTP 304 Not Modified
+        updated = client.patch(f"/api/tasks/{task_id}/", data={"title": "Renamed"},
+                               content_type='application/json', HTTP_IF_MATCH=etag)
+        assert updated.status_code == 200  # HTTP 200 OK
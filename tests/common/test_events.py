@@ -0,0 +1,207 @@
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from common.events import EventBroker, EventStreamApp, FileTransport, LocalTransport
+from tasks.usecases import task_events
+
+
+def run_stream(broker, publish=(), last_event_id=None, method="GET", **options):
+    """
+    Streams from an EventStreamApp until the app ends the response or the events are sent, then
+    disconnects the client; returns the response status and the body sent.
+    """
+    async def scenario():
+        disconnect = asyncio.Event()
+        messages = []
+
+        async def receive():
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+
+        headers = [(b"last-event-id", last_event_id.encode())] if last_event_id else []
+        scope = {"type": "http", "method": method, "path": "/api/tasks/events/", "headers": headers, "query_string": b""}
+        stream = asyncio.ensure_future(EventStreamApp(broker, **options)(scope, receive, send))
+        await asyncio.sleep(0)
+        for event_type, data in publish:
+            broker.publish(event_type, data)
+        await asyncio.sleep(0.05)
+        disconnect.set()
+        await asyncio.wait_for(stream, 1)
+        body = b"".join(message.get("body", b"") for message in messages[1:])
+        return messages[0]["status"], body.decode()
+
+    return asyncio.run(scenario())
+
+
+def receive(transport, count, publish):
+    """Subscribes to a broker on the transport, runs publish() and returns the next count events received."""
+    broker = EventBroker(transport)
+
+    async def scenario():
+        subscription, _ = broker.subscribe()
+        await asyncio.to_thread(publish)
+        return [await asyncio.wait_for(subscription.get(), 5) for _ in range(count)]
+
+    try:
+        return asyncio.run(scenario())
+    finally:
+        transport.close()
+
+
+def parse_events(body):
+    """Parses an event stream body into (id, type, data) tuples, skipping comments and the retry field."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith((":", "retry")))
+        if fields:
+            events.append((fields.get("id"), fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestEvents:
+    def test_fan_out_to_every_subscriber(self):
+        """Test that a published event is queued for every subscription in publish order."""
+        broker = EventBroker(LocalTransport())
+
+        async def scenario():
+            first, _ = broker.subscribe()
+            second, _ = broker.subscribe()
+            broker.publish("task.created", {"id": 1})
+            broker.publish("task.deleted", {"id": 1})
+            await asyncio.sleep(0)
+            return [[(await subscription.get()).type for _ in range(2)] for subscription in (first, second)]
+
+        assert asyncio.run(scenario()) == [["task.created", "task.deleted"]] * 2
+
+    def test_stream_events(self):
+        """Test that the stream sends the events published while the client is connected."""
+        broker = EventBroker(LocalTransport())
+
+        status, body = run_stream(broker, publish=[("task.created", {"id": 1}), ("task.updated", {"id": 1})])
+
+        assert status == 200
+        assert body.startswith("retry: 3000\n\n")
+        assert [(event_type, data) for _, event_type, data in parse_events(body)] == [
+            ("task.created", {"id": 1}), ("task.updated", {"id": 1}),
+        ]
+        assert broker.subscriber_count() == 0
+
+    def test_resume_from_last_event_id(self):
+        """Test that a reconnecting client first receives the events it missed."""
+        broker = EventBroker(LocalTransport())
+        _, body = run_stream(broker, publish=[("task.created", {"id": 1})])
+        (last_id, _, _), = parse_events(body)
+        broker.publish("task.updated", {"id": 1})
+        broker.publish("task.deleted", {"id": 1})
+
+        _, body = run_stream(broker, last_event_id=last_id)
+
+        assert [event_type for _, event_type, _ in parse_events(body)] == ["task.updated", "task.deleted"]
+
+    def test_reset_when_history_is_gone(self):
+        """Test that a client resuming from an event no longer in the history is told to reload."""
+        broker = EventBroker(LocalTransport(), history_size=2)
+        for task_id in range(3):
+            broker.publish("task.created", {"id": task_id})
+
+        _, body = run_stream(broker, last_event_id="0-1")
+
+        assert [event_type for _, event_type, _ in parse_events(body)] == ["reset"]
+
+    def test_slow_subscriber_is_disconnected(self):
+        """Test that a subscriber falling further behind than its queue size is cut off after the queued events."""
+        broker = EventBroker(LocalTransport(), queue_size=2)
+
+        async def scenario():
+            subscription, _ = broker.subscribe()
+            for task_id in range(5):
+                broker.publish("task.created", {"id": task_id})
+            await asyncio.sleep(0)
+            received = [await subscription.get() for _ in range(3)]
+            return [event and event.data["id"] for event in received], subscription.overflowed
+
+        assert asyncio.run(scenario()) == ([0, 1, None], True)
+
+    def test_heartbeat_and_method(self):
+        """Test that an idle stream sends heartbeats and that only GET is allowed."""
+        broker = EventBroker(LocalTransport())
+
+        _, body = run_stream(broker, heartbeat_seconds=0.01)
+
+        assert ": keepalive" in body
+        assert run_stream(broker, method="POST")[0] == 405
+
+    def test_task_changes_are_published(self, client):
+        """Test that creating, updating and deleting a task through the API publishes an event each."""
+        async def scenario():
+            subscription, _ = task_events.subscribe()
+            try:
+                task_id = await asyncio.to_thread(
+                    lambda: client.post("/api/tasks/", data=json.dumps({"title": "Evented"}),
+                                        content_type='application/json').json()["data"]["id"])
+                await asyncio.to_thread(client.patch, f"/api/tasks/{task_id}/", data={"title": "Renamed"},
+                                        content_type='application/json')
+                await asyncio.to_thread(client.delete, f"/api/tasks/{task_id}/")
+                events = [await asyncio.wait_for(subscription.get(), 1) for _ in range(3)]
+            finally:
+                task_events.unsubscribe(subscription)
+            return task_id, [(event.type, event.data["id"]) for event in events], events[1].data["title"]
+
+        task_id, events, title = asyncio.run(scenario())
+
+        assert events == [("task.created", task_id), ("task.updated", task_id), ("task.deleted", task_id)]
+        assert title == "Renamed"
+
+    def test_file_transport_across_processes(self, tmp_path):
+        """Test that an event published by another process reaches the streams of this one."""
+        log = str(tmp_path / "events.log")
+        script = (
+            "import sys; from common.events.transport import FileTransport; "
+            "FileTransport(sys.argv[1]).publish('task.created', {'id': 7, 'title': 'Elsewhere'})"
+        )
+
+        def publish():
+            subprocess.run([sys.executable, "-c", script, log], check=True, cwd=Path(__file__).parents[2])
+
+        event, = receive(FileTransport(log, poll_interval=0.01), 1, publish)
+
+        assert (event.type, event.data) == ("task.created", {"id": 7, "title": "Elsewhere"})
+
+    def test_transport_starts_on_first_subscription(self, tmp_path):
+        """Test that a broker that only publishes runs no reader thread, and that subscribing starts one."""
+        transport = FileTransport(str(tmp_path / "events.log"), poll_interval=0.01)
+        broker = EventBroker(transport)
+        broker.publish("task.created", {"id": 1})
+        assert transport._thread is None
+
+        async def scenario():
+            broker.subscribe()
+            broker.subscribe()
+
+        try:
+            asyncio.run(scenario())
+            assert transport._thread.is_alive()
+        finally:
+            transport.close()
+
+    def test_file_transport_rotation(self, tmp_path):
+        """Test that the events around a rotation of the log are delivered once each, in order, with new IDs."""
+        log = str(tmp_path / "events.log")
+        publisher = FileTransport(log, max_bytes=64)
+
+        def publish():
+            for task_id in range(7):
+                publisher.publish("task.updated", {"id": task_id})
+
+        events = receive(FileTransport(log, poll_interval=0.01), 7, publish)
+
+        assert [event.data["id"] for event in events] == list(range(7))
+        assert len({event.id for event in events}) == 7
+        assert not Path(log + ".1").exists()  # Only the current and the two previous segments are kept
+        assert Path(log + ".4").exists()
@@ -0,0 +1,29 @@
+from django.conf import settings
+from loguru import logger
+
+from common.logger import configure_logging, QueryLogSampler
+
+
+class TestLoggerConfig:
+    def test_disabled_level_is_not_formatted(self):
+        """Test that arguments of disabled log levels are never formatted."""
+        formatted = []
+
+        class Payload:
+            def __str__(self):
+                formatted.append(True)
+                return "payload"
+
+        configure_logging({"LEVEL": "INFO"})
+        try:
+            logger.debug("Request body: {}", Payload())
+            logger.opt(lazy=True).debug("Request body: {}", lambda: formatted.append(True))
+            assert formatted == []
+        finally:
+            configure_logging(settings.LOG_SETTINGS)
+
+    def test_query_log_sampling(self):
+        """Test that the sampler logs every query at rate 1 and none at rate 0."""
+        assert all(QueryLogSampler(1.0).sample() for _ in range(100))
+        assert not any(QueryLogSampler(0.0).sample() for _ in range(100))
+        assert 0 < sum(QueryLogSampler(0.5).sample() for _ in range(1000)) < 1000
@@ -0,0 +1,72 @@
+import json
+import subprocess
+import sys
+
+from prometheus_client.parser import text_string_to_metric_families
+
+from common.instrumentation import metrics_registry
+from common.views import MetricsView
+
+
+def scrape(client):
+    """Return the /metrics samples as {(name, labels): value}."""
+    response = client.get("/metrics")
+    assert response.status_code == 200  # HTTP 200 OK
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(response.content.decode())
+        for sample in family.samples
+    }
+
+
+def sample(samples, name, **labels):
+    return samples.get((name, tuple(sorted(labels.items()))), 0)
+
+
+class TestMetrics:
+    def test_request_latency_by_route(self, client, create_task):
+        """Test that requests are counted per route pattern, method and status."""
+        before = scrape(client)
+        client.get(f"/api/tasks/{create_task['id']}/")
+        after = scrape(client)
+
+        labels = {"route": "api/tasks/<int:task_id>/", "method": "GET", "status": "200"}
+        assert sample(after, "http_request_duration_seconds_count", **labels) == \
+            sample(before, "http_request_duration_seconds_count", **labels) + 1
+        assert sample(after, "http_requests_in_progress", method="GET") == 1  # the scrape itself
+
+    def test_pool_and_cache_metrics(self, client):
+        """Test that the pool state and the cache counters are exported."""
+        task_data = {"title": "Metrics task", "description": None}
+        task_id = client.post("/api/tasks/", data=json.dumps(task_data), content_type='application/json').json()["data"]["id"]
+        client.get(f"/api/tasks/{task_id}/")
+        samples = scrape(client)
+
+        assert sample(samples, "db_pool_size", engine="sync") > 0
+        assert sample(samples, "db_pool_checked_out", engine="sync") == 0
+        assert sample(samples, "db_pool_wait_seconds_count") > 0
+        assert sample(samples, "cache_events_total", cache="tasks", event="hits") > 0
+        assert sample(samples, "cache_events_total", cache="sql_statements", event="misses") > 0
+
+    def test_multiprocess_aggregation(self, tmp_path, monkeypatch):
+        """Test that /metrics adds up the values written by several worker processes."""
+        worker = (
+            "from common.instrumentation import cache_events, requests_in_progress;"
+            "cache_events.labels('tasks', 'hits').inc(2);"
+            "requests_in_progress.labels('GET').inc()"
+        )
+        for _ in range(2):
+            subprocess.run(
+                [sys.executable, "-c", worker], check=True, env={"PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+            )
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+        samples = {
+            (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+            for family in metrics_registry().collect()
+            for sample in family.samples
+        }
+
+        assert sample(samples, "cache_events_total", cache="tasks", event="hits") == 4
+        # the gauges of exited processes are not dropped until they are marked dead
+        assert sample(samples, "http_requests_in_progress", method="GET") == 2
@@ -0,0 +1,61 @@
+import gzip
+import json
+
+import pytest
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+from common.views import OpenAPISchemaView
+
+
+@pytest.fixture
+def schema_dir(settings, tmp_path):
+    """Writes the schema files to a temporary directory and forgets the documents loaded before."""
+    settings.OPENAPI_SCHEMA = {**settings.OPENAPI_SCHEMA, "DIR": str(tmp_path)}
+    OpenAPISchemaView.documents.clear()
+    yield tmp_path
+    OpenAPISchemaView.documents.clear()
+
+
+class TestOpenAPISchema:
+    def test_schema_is_generated_once(self, client, schema_dir, monkeypatch):
+        """Test that a missing schema file is generated by the first request and then served from memory."""
+        generated = []
+        get_schema = OpenAPISchemaGenerator.get_schema
+        monkeypatch.setattr(OpenAPISchemaGenerator, "get_schema",
+                            lambda *args, **kwargs: generated.append(True) or get_schema(*args, **kwargs))
+
+        first = client.get("/swagger.json/")
+        second = client.get("/swagger.json/")
+
+        assert first.status_code == second.status_code == 200  # HTTP 200 OK
+        assert "/tasks/" in json.loads(first.content)["paths"]
+        assert first.content == second.content == (schema_dir / "swagger.json").read_bytes()
+        assert len(generated) == 1
+
+    def test_etag_revalidation(self, client, schema_dir):
+        """Test that the schema carries an ETag and answers a matching If-None-Match with 304."""
+        response = client.get("/swagger.yaml/")
+        etag = response["ETag"]
+
+        assert response["Content-Type"] == "application/yaml"
+        assert "max-age=" in response["Cache-Control"]
+        assert client.get("/swagger.yaml/", HTTP_IF_NONE_MATCH=etag).status_code == 304  # HTTP 304 Not Modified
+
+    def test_gzip_encoding(self, client, schema_dir):
+        """Test that clients accepting gzip get the precompressed schema."""
+        plain = client.get("/swagger.json/")
+        compressed = client.get("/swagger.json/", HTTP_ACCEPT_ENCODING="gzip, br")
+
+        assert compressed["Content-Encoding"] == "gzip"
+        assert compressed["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(compressed.content) == plain.content
+        assert compressed["ETag"] == plain["ETag"]
+
+    def test_ui_does_not_generate_schema(self, client, monkeypatch):
+        """Test that the Swagger UI page loads the pre-generated schema instead of introspecting the views."""
+        monkeypatch.setattr(OpenAPISchemaGenerator, "get_schema", lambda *args, **kwargs: pytest.fail("generated"))
+
+        response = client.get("/swagger/")
+
+        assert response.status_code == 200  # HTTP 200 OK
+        assert b"/swagger.json/" in response.content
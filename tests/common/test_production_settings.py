@@ -0,0 +1,57 @@
+import importlib
+import sys
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import RequestFactory
+from django.utils.module_loading import import_string
+
+from common.views import lazy_view
+
+
+def load_production_settings():
+    """Imports the production settings module afresh, so it reads the current environment."""
+    sys.modules.pop("server.settings.production", None)
+    return importlib.import_module("server.settings.production")
+
+
+@pytest.fixture
+def production(monkeypatch):
+    """Provides the production settings loaded with a secret key in the environment."""
+    monkeypatch.setenv("DJANGO_SECRET_KEY", "test-secret-key")
+    return load_production_settings()
+
+
+class TestProductionSettings:
+    def test_secret_key_is_required(self, monkeypatch):
+        """Test that production settings refuse to load without DJANGO_SECRET_KEY."""
+        monkeypatch.delenv("DJANGO_SECRET_KEY", raising=False)
+        with pytest.raises(ImproperlyConfigured):
+            load_production_settings()
+
+    def test_minimal_middleware_chain(self, production):
+        """Test that production loads no session, CSRF, auth or messages middleware, and no duplicates."""
+        assert len(production.MIDDLEWARE) == len(set(production.MIDDLEWARE))
+        for name in production.MIDDLEWARE:
+            assert not name.startswith(("django.contrib.", "django.middleware.csrf"))
+            import_string(name)
+
+    def test_no_docs_or_admin(self, production):
+        """Test that the admin and the API docs are not installed in production."""
+        assert production.DEBUG is False
+        assert "django.contrib.admin" not in production.INSTALLED_APPS
+        assert "drf_yasg" not in production.INSTALLED_APPS
+
+    def test_lazy_view_loads_once(self):
+        """Test that a lazy view imports the real view on the first request only."""
+        loads = []
+
+        def load():
+            loads.append(True)
+            return lambda request: request.path
+
+        view = lazy_view(load)
+        assert loads == []
+        assert view(RequestFactory().get("/swagger/")) == "/swagger/"
+        assert view(RequestFactory().get("/redoc/")) == "/redoc/"
+        assert loads == [True]
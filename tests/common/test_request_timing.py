@@ -0,0 +1,66 @@
+import json
+import re
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+from loguru import logger
+
+from tasks.db_adapters import TaskDB
+from common.instrumentation import RequestTimings, current_request_timings, timed
+from common.middlewares import RequestTimingMiddleware
+
+
+class TestRequestTiming:
+    def test_server_timing_header(self, client):
+        """Test that API responses carry the query count and phase durations in a Server-Timing header."""
+        task_data = {"title": "Timed task", "description": "Server-Timing"}
+        response = client.post("/api/tasks/", data=json.dumps(task_data), content_type='application/json')
+
+        assert response.status_code == 201  # HTTP 201 Created
+        server_timing = response["Server-Timing"]
+        assert re.search(r'db;dur=[\d.]+;desc="[1-9]\d* queries"', server_timing)
+        assert re.search(r"pool;dur=[\d.]+", server_timing)
+        assert re.search(r"total;dur=[\d.]+$", server_timing)
+
+    def test_queries_are_recorded(self):
+        """Test that the cursor hooks record the statements executed while a request is timed."""
+        timings = RequestTimings()
+        token = current_request_timings.set(timings)
+        try:
+            TaskDB().create_task({"title": "Recorded task", "description": None})
+            with timed("serialize"):
+                pass
+        finally:
+            current_request_timings.reset(token)
+
+        assert timings.queries == len(timings.statements) >= 2
+        assert any(statement.startswith("INSERT INTO tasks") for statement, _ in timings.statements)
+        assert set(timings.durations) >= {"db", "pool", "serialize"}
+
+    def test_timed_outside_request(self):
+        """Test that timed blocks and statements outside a timed request are a no-op."""
+        with timed("serialize"):
+            task = TaskDB().create_task({"title": "Untimed task", "description": None})
+
+        assert task.title == "Untimed task"
+        assert current_request_timings.get() is None
+
+    def test_slow_request_logs_sql(self, settings):
+        """Test that requests over the slow threshold are logged with their statements."""
+        settings.REQUEST_TIMING = {"SERVER_TIMING_HEADER": False, "SLOW_REQUEST_MS": 0}
+        messages = []
+        sink = logger.add(messages.append, level="WARNING", format="{message}")
+
+        def view(request):
+            TaskDB().create_task({"title": "Slow task", "description": None})
+            return HttpResponse(status=201)
+
+        try:
+            response = RequestTimingMiddleware(view)(RequestFactory().post("/api/tasks/"))
+        finally:
+            logger.remove(sink)
+
+        assert "Server-Timing" not in response
+        assert len(messages) == 1
+        assert "Slow request POST /api/tasks/" in messages[0]
+        assert "INSERT INTO tasks" in messages[0]
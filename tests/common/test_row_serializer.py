@@ -0,0 +1,47 @@
+import json
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from rest_framework.renderers import JSONRenderer
+
+from common.renderers import UJSONRenderer
+from common.serializers import RowSerializer
+from tasks.schemas import TaskSchema
+
+# Column order of SELECT * FROM tasks
+TaskRow = namedtuple("TaskRow", ["id", "title", "description", "created_at", "updated_at", "deleted"])
+
+
+class TestRowSerializer:
+    def test_matches_schema_output(self):
+        """Test that the fast path renders exactly what from_orm + DRF's renderer produce."""
+        rows = [
+            TaskRow(1, "Task", "Description", datetime(2024, 1, 2, 3, 4, 5), datetime(2024, 1, 2, 3, 4, 6), 0),
+            TaskRow(2, "Task", None, datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+                    datetime(2024, 1, 2, 3, 4, 6, tzinfo=timezone.utc), 1),
+        ]
+        expected = JSONRenderer().render({"data": [TaskSchema.from_orm(row).dict() for row in rows]})
+
+        rendered = UJSONRenderer().render({"data": RowSerializer(TaskSchema).to_dicts(rows)})
+
+        assert json.loads(rendered) == json.loads(expected)
+
+    def test_converts_strings_and_booleans(self):
+        """Test that datetimes returned as strings and integer flags are normalized."""
+        row = TaskRow(1, "Task", None, "2024-01-02 03:04:05", "2024-01-02T03:04:06+00:00", 1)
+
+        data = RowSerializer(TaskSchema).to_dict(row)
+
+        assert data["created_at"] == "2024-01-02T03:04:05"
+        assert data["updated_at"] == "2024-01-02T03:04:06Z"
+        assert data["deleted"] is True
+        assert list(data) == list(TaskSchema.__fields__)
+
+    def test_missing_columns_use_defaults(self):
+        """Test that fields without a column get the schema default."""
+        PartialRow = namedtuple("PartialRow", ["id", "title"])
+
+        data = RowSerializer(TaskSchema).to_dict(PartialRow(1, "Task"))
+
+        assert data["description"] is None
+        assert data["deleted"] is False
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from common.cache import SingleFlight
+from tasks.usecases import TaskUsecase
+from tasks.usecases.task_usecase import task_cache, task_cache_key
+
+
+def blocking_call(release, calls, result="row"):
+    """A call that counts its runs and blocks until released, standing in for a slow query."""
+    def call():
+        calls.append(1)
+        release.wait(1)
+        return result
+    return call
+
+
+def wait_for_waiters(flight, count):
+    """Waits until count callers are coalesced onto the in-flight call."""
+    for _ in range(100):
+        if flight.stats()["coalesced"] >= count:
+            return
+        threading.Event().wait(0.01)
+
+
+class TestSingleFlight:
+    def test_concurrent_threads_share_one_call(self):
+        """Test that identical calls from concurrent threads run once and all get its result."""
+        flight, release, calls = SingleFlight(), threading.Event(), []
+
+        with ThreadPoolExecutor(max_workers=10) as pool:
+            results = [pool.submit(flight.do, "task:1", blocking_call(release, calls)) for _ in range(10)]
+            wait_for_waiters(flight, 9)
+            release.set()
+            results = [result.result() for result in results]
+
+        assert results == ["row"] * 10
+        assert len(calls) == 1
+        assert flight.stats() == {"calls": 1, "coalesced": 9, "in_flight": 0}
+
+    def test_error_is_shared(self):
+        """Test that the waiting callers get the exception of the call."""
+        flight, release = SingleFlight(), threading.Event()
+
+        def failing_call():
+            release.wait(1)
+            raise ValueError("database is gone")
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            results = [pool.submit(flight.do, "task:1", failing_call) for _ in range(3)]
+            wait_for_waiters(flight, 2)
+            release.set()
+            for result in results:
+                with pytest.raises(ValueError):
+                    result.result()
+
+    def test_concurrent_coroutines_share_one_call(self):
+        """Test that identical calls from concurrent coroutines run once, and that a cancelled caller does not cancel it."""
+        flight, calls = SingleFlight(), []
+
+        async def query():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "row"
+
+        async def scenario():
+            cancelled = asyncio.ensure_future(flight.ado("task:1", query))
+            waiters = [asyncio.ensure_future(flight.ado("task:1", query)) for _ in range(9)]
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            return await asyncio.gather(*waiters)
+
+        assert asyncio.run(scenario()) == ["row"] * 9
+        assert len(calls) == 1
+
+    def test_thread_waits_for_coroutine(self):
+        """Test that a thread joins the in-flight call of a coroutine."""
+        flight, release, calls = SingleFlight(), threading.Event(), []
+
+        async def query():
+            calls.append(1)
+            await asyncio.to_thread(release.wait, 1)
+            return "row"
+
+        async def scenario():
+            leader = asyncio.ensure_future(flight.ado("task:1", query))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(asyncio.to_thread(flight.do, "task:1", blocking_call(release, calls)))
+            await asyncio.to_thread(wait_for_waiters, flight, 1)
+            release.set()
+            return await asyncio.gather(leader, follower)
+
+        assert asyncio.run(scenario()) == ["row", "row"]
+        assert len(calls) == 1
+
+    def test_forget_starts_a_new_call(self):
+        """Test that a caller arriving after forget does not get the result of the call in flight."""
+        flight, release, calls = SingleFlight(), threading.Event(), []
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            stale = pool.submit(flight.do, "task:1", blocking_call(release, calls, "before write"))
+            while not calls:
+                threading.Event().wait(0.01)
+            flight.forget("task:1")
+            fresh = pool.submit(flight.do, "task:1", blocking_call(release, calls, "after write"))
+            release.set()
+
+            assert (stale.result(), fresh.result()) == ("before write", "after write")
+        assert len(calls) == 2
+
+    def test_concurrent_task_reads_are_coalesced(self, create_task, monkeypatch):
+        """Test that concurrent reads of an uncached task make one query."""
+        task_id = create_task["id"]
+        task_cache.delete(task_cache_key(task_id))
+        usecase, release, calls = TaskUsecase(), threading.Event(), []
+        get_task = usecase.task_db.get_task
+
+        def slow_get_task(task_id):
+            calls.append(1)
+            release.wait(1)
+            return get_task(task_id)
+
+        monkeypatch.setattr(usecase.task_db, "get_task", slow_get_task)
+        coalesced = usecase.task_reads.stats()["coalesced"]
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = [pool.submit(usecase.get_task, task_id) for _ in range(5)]
+            wait_for_waiters(usecase.task_reads, coalesced + 4)
+            release.set()
+            results = [result.result() for result in results]
+
+        assert [status for _, status in results] == [200] * 5
+        assert {response["data"]["id"] for response, _ in results} == {task_id}
+        assert len(calls) == 1
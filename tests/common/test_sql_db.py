@@ -0,0 +1,28 @@
+from common.db_adapters.sql_db import SQLDB, EngineRegistry, engine_registry
+
+
+class TestEngineRegistry:
+    def test_sql_db_instances_share_engine(self):
+        """Test that every SQLDB instance reuses the engine of its worker process."""
+        assert SQLDB().engine is SQLDB().engine
+        assert SQLDB().engine is engine_registry.get_engine(SQLDB().db_url)
+
+    def test_engine_per_url(self):
+        """Test that the registry builds one engine per connection URL."""
+        registry = EngineRegistry({"POOL_SIZE": 2, "MAX_OVERFLOW": 0})
+        first = registry.get_engine("sqlite:////tmp/registry_a.db")
+        assert registry.get_engine("sqlite:////tmp/registry_a.db") is first
+        assert registry.get_engine("sqlite:////tmp/registry_b.db") is not first
+        assert first.pool.size() == 2
+        registry.dispose_all()
+
+    def test_reset_after_fork_keeps_engine(self):
+        """Test that a fork reset drops pooled connections but keeps the engine registered."""
+        registry = EngineRegistry()
+        engine = registry.get_engine("sqlite:////tmp/registry_a.db")
+        with engine.connect():
+            pass
+        registry.reset_after_fork()
+        assert registry.get_engine("sqlite:////tmp/registry_a.db") is engine
+        assert engine.pool.checkedin() == 0
+        registry.dispose_all()
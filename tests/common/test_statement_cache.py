@@ -0,0 +1,47 @@
+import pytest
+from sqlalchemy.exc import ArgumentError
+
+from common.db_adapters.statement_cache import StatementCache, statement_cache
+from tasks.db_adapters import TaskDB
+
+
+class TestStatementCache:
+    def test_statement_reused_per_shape(self):
+        """Test that the same operation, table and column set returns the same statement object."""
+        task_db = TaskDB()
+        first = task_db.select_statement("tasks", ["id", "deleted"])
+        second = task_db.select_statement("tasks", ["id", "deleted"])
+
+        assert first is second
+        assert task_db.select_statement("tasks", ["deleted"]) is not first
+
+    def test_reads_hit_the_cache(self, create_task):
+        """Test that repeated reads build their statement only once."""
+        task_db = TaskDB()
+        task_db.get_task(create_task["id"])
+        hits = statement_cache.statements.stats()["hits"]
+
+        task_db.get_task(create_task["id"])
+
+        assert statement_cache.statements.stats()["hits"] > hits
+
+    def test_unknown_column_rejected(self):
+        """Test that dict keys which are not columns of the table never reach the SQL."""
+        with pytest.raises(ArgumentError):
+            TaskDB().fetch_one("tasks", {"id = 1 OR 1": 1})
+        with pytest.raises(ArgumentError):
+            TaskDB().update_task(1, {"title": "Injected", "deleted = 1, title": "x"})
+
+    def test_unknown_table_rejected(self):
+        """Test that a table which is neither declared nor in the database is rejected."""
+        with pytest.raises(ArgumentError):
+            TaskDB().fetch_one("tasks; DROP TABLE tasks", {"id": 1})
+
+    def test_bounded_size(self):
+        """Test that the least recently used statements are evicted beyond max_size."""
+        cache = StatementCache(max_size=2)
+        for index in range(3):
+            cache.statement(("select", index), lambda: object())
+
+        assert cache.statements.stats()["size"] == 2
+        assert cache.statements.stats()["evictions"] == 1
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.test import RequestFactory
+from sqlalchemy import event
+
+from tasks.db_adapters import TaskDB
+from common.db_adapters.sql_db import current_unit_of_work
+from common.middlewares import UnitOfWorkMiddleware
+
+
+@pytest.fixture
+def checkouts():
+    """Counts the pool checkouts of the shared engine while the test runs."""
+    engine = TaskDB().engine
+    counter = {"count": 0}
+
+    def on_checkout(*args):
+        counter["count"] += 1
+
+    event.listen(engine, "checkout", on_checkout)
+    yield counter
+    event.remove(engine, "checkout", on_checkout)
+
+
+class TestUnitOfWork:
+    def test_insert_uses_one_connection(self, checkouts):
+        """Test that an insert and its read-back share a single pool checkout."""
+        task = TaskDB().create_task({"title": "Unit of work task", "description": "one connection"})
+
+        assert task.title == "Unit of work task"
+        assert checkouts["count"] == 1
+
+    def test_operations_join_unit_of_work(self, checkouts):
+        """Test that all operations inside a unit of work share its connection."""
+        task_db = TaskDB()
+        with task_db.unit_of_work():
+            task = task_db.create_task({"title": "Joined task", "description": None})
+            task_db.update_task(task.id, {"title": "Joined task updated"})
+            assert task_db.get_task(task.id).title == "Joined task updated"
+
+        assert checkouts["count"] == 1
+        assert current_unit_of_work.get() is None
+
+    def test_rollback_on_error(self):
+        """Test that an exception inside a unit of work rolls back its writes."""
+        task_db = TaskDB()
+        with pytest.raises(RuntimeError):
+            with task_db.unit_of_work():
+                task = task_db.create_task({"title": "Rolled back task", "description": None})
+                raise RuntimeError("abort")
+
+        assert task_db.get_task(task.id) is None
+
+    def test_on_commit_callbacks(self):
+        """Test that commit callbacks run after a commit and are dropped on rollback."""
+        task_db = TaskDB()
+        calls = []
+        with task_db.unit_of_work() as unit_of_work:
+            unit_of_work.on_commit(lambda: calls.append("committed"))
+            assert calls == []
+        assert calls == ["committed"]
+
+        with pytest.raises(RuntimeError):
+            with task_db.unit_of_work() as unit_of_work:
+                unit_of_work.on_commit(lambda: calls.append("rolled back"))
+                raise RuntimeError("abort")
+        assert calls == ["committed"]
+
+    def test_async_middleware_commits_sync_view(self):
+        """Test that under ASGI a sync view still runs in the request's unit of work and is committed."""
+        task_db = TaskDB()
+        created = {}
+
+        def sync_view(request):
+            created["task"] = task_db.create_task({"title": "Async middleware task", "description": None})
+            created["connected"] = current_unit_of_work.get().connected
+            return HttpResponse(status=201)
+
+        async def get_response(request):
+            return await sync_to_async(sync_view)(request)
+
+        middleware = UnitOfWorkMiddleware(get_response)
+        response = asyncio.run(middleware(RequestFactory().post("/api/tasks/")))
+
+        assert response.status_code == 201
+        assert created["connected"] is True
+        assert current_unit_of_work.get() is None
+        assert task_db.get_task(created["task"].id).title == "Async middleware task"
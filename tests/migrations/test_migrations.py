@@ -0,0 +1,116 @@
+import pytest
+from django.core.management import call_command
+from sqlalchemy import create_engine, text
+
+from common.db_adapters.sql_db import SQLDB
+from migrations.migrator import Migrator, MigrationError
+
+
+@pytest.fixture
+def migrations_dir(tmp_path):
+    """Provides a migrations folder with two migrations for an in-memory database."""
+    app_dir = tmp_path / "notes"
+    app_dir.mkdir()
+    (app_dir / "0001_create_notes.sql").write_text("CREATE TABLE notes (id INT PRIMARY KEY, body TEXT);")
+    (app_dir / "0002_index_notes.sql").write_text("-- index\nCREATE INDEX idx_notes_body ON notes (body);")
+    (app_dir / "README.md").write_text("not a migration")
+    return app_dir
+
+
+class TestMigrator:
+    def test_migrate_applies_in_order_once(self, migrations_dir):
+        """Test that migrations are applied in version order and only once."""
+        engine = create_engine("sqlite://")
+        migrator = Migrator(engine, migrations_dir=str(migrations_dir.parent))
+
+        applied = migrator.migrate()
+        assert [migration.version for migration in applied] == [1, 2]
+        assert migrator.migrate() == []  # Running again is a no-op
+        with engine.connect() as connection:
+            versions = connection.execute(text("SELECT version FROM schema_version ORDER BY version")).fetchall()
+        assert [row.version for row in versions] == [1, 2]
+
+    def test_changed_migration_is_rejected(self, migrations_dir):
+        """Test that editing an applied migration is reported."""
+        engine = create_engine("sqlite://")
+        migrator = Migrator(engine, migrations_dir=str(migrations_dir.parent))
+        migrator.migrate()
+        (migrations_dir / "0001_create_notes.sql").write_text("CREATE TABLE notes (id INT PRIMARY KEY);")
+
+        with pytest.raises(MigrationError):
+            migrator.migrate()
+
+    def test_failed_migration_resumes_at_failed_statement(self, migrations_dir):
+        """Test that the statements applied before a failure are recorded and not run again."""
+        migration = migrations_dir / "0003_notes_columns.sql"
+        migration.write_text("ALTER TABLE notes ADD COLUMN title TEXT;\nALTER TABLE missing ADD COLUMN title TEXT;")
+        engine = create_engine("sqlite://")
+        migrator = Migrator(engine, migrations_dir=str(migrations_dir.parent))
+
+        with pytest.raises(Exception):
+            migrator.migrate()
+        assert migrator.progress()[3][0] == 1
+        migration.write_text("ALTER TABLE notes ADD COLUMN title TEXT;\nALTER TABLE notes ADD COLUMN author TEXT;")
+
+        assert [migration.version for migration in migrator.migrate()] == [3]
+        assert migrator.progress() == {}
+        with engine.connect() as connection:
+            connection.execute(text("SELECT title, author FROM notes"))
+
+    def test_changed_applied_statements_are_rejected(self, migrations_dir):
+        """Test that a failed migration whose applied statements were edited is not resumed."""
+        migration = migrations_dir / "0003_notes_columns.sql"
+        migration.write_text("ALTER TABLE notes ADD COLUMN title TEXT;\nALTER TABLE missing ADD COLUMN title TEXT;")
+        migrator = Migrator(create_engine("sqlite://"), migrations_dir=str(migrations_dir.parent))
+        with pytest.raises(Exception):
+            migrator.migrate()
+        migration.write_text("ALTER TABLE notes ADD COLUMN name TEXT;\nALTER TABLE notes ADD COLUMN author TEXT;")
+
+        with pytest.raises(MigrationError):
+            migrator.migrate()
+
+    def test_dialect_specific_migration(self, migrations_dir):
+        """Test that a migration for another backend is skipped and not recorded."""
+        (migrations_dir / "0003_fulltext_notes.mysql.sql").write_text("CREATE FULLTEXT INDEX idx_notes_ft ON notes (body);")
+        (migrations_dir / "0004_notes_title.sqlite.sql").write_text("ALTER TABLE notes ADD COLUMN title TEXT;")
+        migrator = Migrator(create_engine("sqlite://"), migrations_dir=str(migrations_dir.parent))
+
+        applied = migrator.migrate()
+
+        assert [migration.version for migration in applied] == [1, 2, 4]
+        assert migrator.pending() == []
+
+    def test_duplicate_version_is_rejected(self, migrations_dir):
+        """Test that two migrations with the same version are reported."""
+        (migrations_dir / "0002_other.sql").write_text("SELECT 1;")
+
+        with pytest.raises(MigrationError):
+            Migrator(create_engine("sqlite://"), migrations_dir=str(migrations_dir.parent)).discover()
+
+    def test_version_per_dialect(self, migrations_dir):
+        """Test that a version may have one migration file per backend."""
+        (migrations_dir / "0003_notes_title.mysql.sql").write_text("ALTER TABLE notes ADD COLUMN title VARCHAR(255);")
+        (migrations_dir / "0003_notes_title.sqlite.sql").write_text("ALTER TABLE notes ADD COLUMN title TEXT;")
+        migrator = Migrator(create_engine("sqlite://"), migrations_dir=str(migrations_dir.parent))
+
+        applied = migrator.migrate()
+
+        assert [migration.dialect for migration in applied] == [None, None, "sqlite"]
+
+    def test_fresh_sqlite_database(self):
+        """Test that the migrations create the tasks tables on an empty SQLite database."""
+        engine = create_engine("sqlite://")
+
+        Migrator(engine).migrate()
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT id, title, version, deleted FROM tasks"))
+            connection.execute(text("SELECT id FROM tasks_archive"))
+
+
+class TestQueryPlans:
+    def test_hot_queries_use_index(self):
+        """Test that the hot task queries are served by an index once the migrations are applied."""
+        Migrator(SQLDB().engine).migrate()
+
+        call_command("check_query_plans")  # Raises CommandError if a query does a full table scan
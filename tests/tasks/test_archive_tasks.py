@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+
+from django.core.management import call_command
+from sqlalchemy import select
+
+from tasks.db_adapters import TaskDB
+from tasks.db_adapters.tables import tasks_table, tasks_archive_table
+
+
+def fetch_row(table, task_id):
+    """Read a row directly, bypassing the deleted filter of TaskDB."""
+    with TaskDB().engine.connect() as connection:
+        return connection.execute(select(table).where(table.c.id == task_id)).fetchone()
+
+
+class TestSoftDelete:
+    def test_delete_sets_flag(self, client, create_task):
+        """Test that deleting a task flags the row instead of removing it."""
+        response = client.delete(f"/api/tasks/{create_task['id']}/")
+
+        assert response.status_code == 204  # HTTP 204 No Content
+        row = fetch_row(tasks_table, create_task["id"])
+        assert row is not None and row.deleted
+        assert client.get(f"/api/tasks/{create_task['id']}/").status_code == 404  # HTTP 404 Not Found
+        assert client.delete(f"/api/tasks/{create_task['id']}/").status_code == 404
+
+    def test_bulk_delete_sets_flag(self, client):
+        """Test that bulk deletes flag the rows."""
+        task_db = TaskDB()
+        task_ids = [task_db.create_task({"title": f"Bulk soft delete {index}"}).id for index in range(2)]
+
+        assert task_db.delete_tasks(task_ids) == task_ids
+        assert all(fetch_row(tasks_table, task_id).deleted for task_id in task_ids)
+
+    def test_delete_increments_version(self, client, create_task):
+        """Test that deletes change the version, so that an ETag of the live task no longer matches."""
+        task_db = TaskDB()
+        task_ids = [task_db.create_task({"title": f"Versioned delete {index}"}).id for index in range(2)]
+        versions = {task_id: fetch_row(tasks_table, task_id).version for task_id in [create_task["id"], *task_ids]}
+
+        client.delete(f"/api/tasks/{create_task['id']}/")
+        task_db.delete_tasks(task_ids)
+
+        assert all(fetch_row(tasks_table, task_id).version == version + 1 for task_id, version in versions.items())
+
+
+class TestArchiveDeletedTasks:
+    def test_archive_moves_old_deleted_tasks(self):
+        """Test that only tasks deleted before the cutoff are moved, in batches."""
+        task_db = TaskDB()
+        old_ids = [task_db.create_task({"title": f"Old deleted {index}"}).id for index in range(3)]
+        live_id = task_db.create_task({"title": "Live task"}).id
+        task_db.delete_tasks(old_ids)
+        single_id = task_db.create_task({"title": "Deleted alone"}).id
+
+        task_db.delete_task(single_id)
+        cutoff = datetime.now(timezone.utc) + timedelta(seconds=1)
+
+        batches = [task_db.archive_deleted_tasks(cutoff, batch_size=2)]
+        while batches[-1] == 2:
+            batches.append(task_db.archive_deleted_tasks(cutoff, batch_size=2))
+
+        assert batches[0] == 2 and len(batches) >= 3  # at least 4 rows, at most 2 per batch
+        for task_id in old_ids + [single_id]:
+            assert fetch_row(tasks_table, task_id) is None
+            archived = fetch_row(tasks_archive_table, task_id)
+            assert archived.deleted and archived.archived_at is not None
+        assert fetch_row(tasks_table, live_id) is not None
+
+    def test_command_keeps_recent_deletions(self):
+        """Test that the command leaves tasks deleted within the retention period in place."""
+        task_db = TaskDB()
+        task_id = task_db.create_task({"title": "Deleted today"}).id
+        task_db.delete_task(task_id)
+
+        call_command("archive_deleted_tasks", days=1, batch_size=10, sleep=0)
+
+        assert fetch_row(tasks_table, task_id).deleted
+        assert fetch_row(tasks_archive_table, task_id) is None
@@ -0,0 +1,100 @@
+import asyncio
+import json
+
+from django.test import AsyncRequestFactory
+
+from common.db_adapters.async_sql_db import async_engine_registry, build_async_db_url
+from tasks.views import AsyncTaskView
+
+
+def run_requests(*requests):
+    """Run the requests through AsyncTaskView on one event loop, as an ASGI worker would, and return the responses."""
+    factory = AsyncRequestFactory()
+    view = AsyncTaskView.as_view()
+
+    async def scenario():
+        responses = []
+        try:
+            for build, kwargs in requests:
+                request = build(factory)
+                responses.append(await view(request, **kwargs))
+        finally:
+            await async_engine_registry.dispose_all()
+        return responses
+
+    return asyncio.run(scenario())
+
+
+def post(data):
+    return lambda factory: factory.post("/api/tasks/", data=json.dumps(data), content_type="application/json"), {}
+
+
+class TestAsyncTasks:
+    def test_async_db_url_driver(self):
+        """Test that the async adapter swaps in the asyncio driver of the backend."""
+        assert build_async_db_url({"URL": "mysql+pymysql://user:pw@db/tasks"}).drivername == "mysql+aiomysql"
+        assert build_async_db_url({"URL": "sqlite:////tmp/tasks.db"}).drivername == "sqlite+aiosqlite"
+
+    def test_async_create_and_get_task(self):
+        """Test that a task created through the async view can be read back through it."""
+        created, = run_requests(post({"title": "Async Task", "description": "Created on the event loop"}))
+        assert created.status_code == 201  # HTTP 201 Created
+        task = json.loads(created.content)["data"]
+
+        fetched, = run_requests((lambda factory: factory.get(f"/api/tasks/{task['id']}/"), {"task_id": task["id"]}))
+
+        assert fetched.status_code == 200  # HTTP 200 OK
+        assert json.loads(fetched.content)["data"]["title"] == "Async Task"
+        assert fetched.headers["ETag"].startswith('"')
+
+    def test_async_update_and_delete_task(self, create_task):
+        """Test updating and then deleting a task through the async view."""
+        task_id = create_task["id"]
+        updated, deleted, missing = run_requests(
+            (lambda factory: factory.put(f"/api/tasks/{task_id}/", data=json.dumps({"title": "Async Updated"}),
+                                         content_type="application/json"), {"task_id": task_id}),
+            (lambda factory: factory.delete(f"/api/tasks/{task_id}/"), {"task_id": task_id}),
+            (lambda factory: factory.get(f"/api/tasks/{task_id}/"), {"task_id": task_id}),
+        )
+
+        assert updated.status_code == 200  # HTTP 200 OK
+        assert json.loads(updated.content)["data"]["title"] == "Async Updated"
+        assert deleted.status_code == 204  # HTTP 204 No Content
+        assert missing.status_code == 404  # HTTP 404 Not Found
+
+    def test_async_conditional_patch(self, create_task):
+        """Test that the async view applies If-Match and Prefer: return=minimal like the sync view."""
+        task_id = create_task["id"]
+        etag = f'"{task_id}-{create_task["version"]}"'
+
+        def patch(title):
+            return (lambda factory: factory.patch(f"/api/tasks/{task_id}/", data=json.dumps({"title": title}),
+                                                  content_type="application/json",
+                                                  headers={"If-Match": etag, "Prefer": "return=minimal"}),
+                    {"task_id": task_id})
+
+        updated, conflict, fetched = run_requests(
+            patch("Async Patched"),
+            patch("Async Stale"),
+            (lambda factory: factory.get(f"/api/tasks/{task_id}/"), {"task_id": task_id}),
+        )
+
+        assert updated.status_code == 204  # HTTP 204 No Content
+        assert updated.headers["ETag"] == f'"{task_id}-{create_task["version"] + 1}"'
+        assert conflict.status_code == 412  # HTTP 412 Precondition Failed
+        assert json.loads(fetched.content)["data"]["title"] == "Async Patched"
+
+    def test_async_get_tasks_by_cursor(self, create_task):
+        """Test that cursor pagination works on the async view."""
+        response, = run_requests((lambda factory: factory.get("/api/tasks/", {"ordering": "-id", "limit": 1}), {}))
+
+        assert response.status_code == 200  # HTTP 200 OK
+        body = json.loads(response.content)
+        assert len(body["data"]) == 1
+        assert "next_cursor" in body
+
+    def test_async_create_task_invalid(self):
+        """Test that the async view validates the request body like the sync view."""
+        response, = run_requests(post({"description": "No title"}))
+
+        assert response.status_code == 400  # HTTP 400 Bad Request
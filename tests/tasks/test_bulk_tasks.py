@@ -0,0 +1,103 @@
+import json
+
+from tasks.db_adapters import TaskDB
+from tasks.usecases import task_events
+
+
+class TestBulkTasks:
+    def bulk_create(self, client, count):
+        tasks_data = [{"title": f"Bulk Task {index}", "description": "Bulk task"} for index in range(count)]
+        response = client.post("/api/tasks/bulk/", data=json.dumps(tasks_data), content_type='application/json')
+        assert response.status_code == 201  # HTTP 201 Created
+        return response.json()['data']
+
+    def test_bulk_create_success(self, client):
+        """Test creating many tasks in one request."""
+        created = self.bulk_create(client, 3)
+
+        assert [task['title'] for task in created] == ["Bulk Task 0", "Bulk Task 1", "Bulk Task 2"]
+        assert len({task['id'] for task in created}) == 3
+        for task in created:
+            response = client.get(f"/api/tasks/{task['id']}/")
+            assert response.json()['data']['title'] == task['title']
+
+    def test_bulk_create_invalid_item(self, client):
+        """Test that one invalid item rejects the whole batch."""
+        tasks_data = [{"title": "Valid"}, {"description": "Missing title"}]
+        response = client.post("/api/tasks/bulk/", data=json.dumps(tasks_data), content_type='application/json')
+
+        assert response.status_code == 400  # HTTP 400 Bad Request
+        assert "title" in response.json()["error"][0]["loc"]
+
+    def test_bulk_create_not_a_list(self, client):
+        """Test case for when the body is not a list of tasks."""
+        response = client.post("/api/tasks/bulk/", data=json.dumps({"title": "x"}), content_type='application/json')
+
+        assert response.status_code == 400  # HTTP 400 Bad Request
+        assert "error" in response.json()
+
+    def test_bulk_update_success(self, client):
+        """Test partially updating many tasks and reporting missing IDs."""
+        created = self.bulk_create(client, 2)
+        patch_data = [
+            {"id": created[0]['id'], "title": "Bulk Updated"},
+            {"id": created[1]['id'], "description": "Only description"},
+            {"id": 999999, "title": "Missing"},
+        ]
+        response = client.patch("/api/tasks/bulk/", data=json.dumps(patch_data), content_type='application/json')
+
+        assert response.status_code == 200  # HTTP 200 OK
+        response_data = response.json()
+        updated = {task['id']: task for task in response_data['data']}
+        assert updated[created[0]['id']]['title'] == "Bulk Updated"
+        assert updated[created[1]['id']]['title'] == created[1]['title']
+        assert updated[created[1]['id']]['description'] == "Only description"
+        assert response_data['not_found'] == [999999]
+
+    def test_bulk_update_missing_id(self, client):
+        """Test case for when an item of a bulk update has no ID."""
+        response = client.patch("/api/tasks/bulk/", data=json.dumps([{"title": "No id"}]),
+                                content_type='application/json')
+
+        assert response.status_code == 400  # HTTP 400 Bad Request
+        assert "id" in response.json()["error"][0]["loc"]
+
+    def test_bulk_delete_success(self, client):
+        """Test deleting many tasks in one request."""
+        created = self.bulk_create(client, 2)
+        ids = [task['id'] for task in created]
+        response = client.delete("/api/tasks/bulk/", data=json.dumps({"ids": ids + [999999]}),
+                                 content_type='application/json')
+
+        assert response.status_code == 200  # HTTP 200 OK
+        assert response.json()['data']['deleted'] == 2
+        for task_id in ids:
+            assert client.get(f"/api/tasks/{task_id}/").status_code == 404
+
+    def test_bulk_create_without_returning(self, client, monkeypatch):
+        """Test that the inserted tasks are read back on databases without INSERT ... RETURNING."""
+        monkeypatch.setattr(TaskDB().engine.dialect, "insert_returning", False)
+        created = self.bulk_create(client, 3)
+
+        assert [task['title'] for task in created] == ["Bulk Task 0", "Bulk Task 1", "Bulk Task 2"]
+        assert len({task['id'] for task in created}) == 3
+
+    def test_bulk_delete_publishes_deleted_only(self, client, monkeypatch):
+        """Test that delete events are published only for the tasks the request deleted."""
+        published = []
+        monkeypatch.setattr(task_events, "publish", lambda event_type, data: published.append((event_type, data)))
+        gone, live = [task['id'] for task in self.bulk_create(client, 2)]
+        client.delete(f"/api/tasks/{gone}/")
+        published.clear()
+
+        response = client.delete("/api/tasks/bulk/", data=json.dumps({"ids": [gone, live, 999999]}),
+                                 content_type='application/json')
+
+        assert response.json()['data']['deleted'] == 1
+        assert published == [("task.deleted", {"id": live})]
+
+    def test_bulk_delete_empty(self, client):
+        """Test case for when no IDs are provided for deletion."""
+        response = client.delete("/api/tasks/bulk/", data=json.dumps({"ids": []}), content_type='application/json')
+
+        assert response.status_code == 400  # HTTP 400 Bad Request
@@ -0,0 +1,71 @@
+import json
+
+
+class TestConditionalGet:
+    def test_get_task_returns_validators(self, client, create_task):
+        """Test that a task response carries ETag and Last-Modified headers."""
+        response = client.get(f"/api/tasks/{create_task['id']}/")
+
+        assert response.status_code == 200  # HTTP 200 OK
+        assert response.headers["ETag"].startswith('"')
+        assert "Last-Modified" in response.headers
+
+    def test_get_task_if_none_match(self, client, create_task):
+        """Test that revalidating an unchanged task returns 304 without a body."""
+        task_id = create_task["id"]
+        etag = client.get(f"/api/tasks/{task_id}/").headers["ETag"]
+
+        response = client.get(f"/api/tasks/{task_id}/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304  # HTTP 304 Not Modified
+        assert response.content == b""
+
+    def test_get_task_if_modified_since(self, client, create_task):
+        """Test that revalidating with the Last-Modified date returns 304."""
+        task_id = create_task["id"]
+        last_modified = client.get(f"/api/tasks/{task_id}/").headers["Last-Modified"]
+
+        response = client.get(f"/api/tasks/{task_id}/", HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        assert response.status_code == 304  # HTTP 304 Not Modified
+
+    def test_get_task_changed_after_update(self, client, create_task):
+        """Test that a stale ETag gets the full, updated task."""
+        task_id = create_task["id"]
+        etag = client.get(f"/api/tasks/{task_id}/").headers["ETag"]
+        task_data = {"title": "Conditional Task Updated"}
+        client.put(f"/api/tasks/{task_id}/", data=json.dumps(task_data), content_type='application/json')
+
+        response = client.get(f"/api/tasks/{task_id}/", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 200  # HTTP 200 OK
+        assert response.headers["ETag"] != etag
+        assert response.json()['data']['title'] == "Conditional Task Updated"
+
+    def test_get_task_not_found_with_etag(self, client):
+        """Test that revalidating a missing task still returns 404."""
+        response = client.get("/api/tasks/999999/", HTTP_IF_NONE_MATCH='"stale"')
+
+        assert response.status_code == 404  # HTTP 404 Not Found
+
+    def test_get_tasks_if_none_match(self, client, create_task):
+        """Test that revalidating an unchanged list page returns 304."""
+        etag = client.get("/api/tasks/?ordering=-id&limit=5").headers["ETag"]
+
+        response = client.get("/api/tasks/?ordering=-id&limit=5", HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304  # HTTP 304 Not Modified
+
+    def test_get_tasks_without_last_modified(self, client, create_task):
+        """Test that a list page has no Last-Modified, and that deleting one of its tasks changes its ETag."""
+        other = client.post("/api/tasks/", data=json.dumps({"title": "Conditional Other"}),
+                            content_type='application/json').json()["data"]
+        response = client.get("/api/tasks/?ordering=-id&limit=5")
+        assert "Last-Modified" not in response.headers
+
+        client.delete(f"/api/tasks/{other['id']}/")
+        by_date = client.get("/api/tasks/?ordering=-id&limit=5", HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+        by_etag = client.get("/api/tasks/?ordering=-id&limit=5", HTTP_IF_NONE_MATCH=response.headers["ETag"])
+
+        assert by_date.status_code == by_etag.status_code == 200  # HTTP 200 OK
+        assert other["id"] not in [task["id"] for task in by_etag.json()["data"]]
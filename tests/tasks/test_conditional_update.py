@@ -0,0 +1,77 @@
+class TestConditionalUpdate:
+    def test_update_increments_version(self, client, create_task):
+        """Test that an update returns the next version and its ETag."""
+        task_id = create_task["id"]
+        etag = client.get(f"/api/tasks/{task_id}/").headers["ETag"]
+
+        response = client.put(f"/api/tasks/{task_id}/", data={"title": "Versioned"},
+                              content_type='application/json', HTTP_IF_MATCH=etag)
+
+        assert response.status_code == 200  # HTTP 200 OK
+        assert response.json()["data"]["version"] == create_task["version"] + 1
+        assert response.headers["ETag"] == f'"{task_id}-{create_task["version"] + 1}"'
+        assert client.get(f"/api/tasks/{task_id}/").headers["ETag"] == response.headers["ETag"]
+
+    def test_stale_if_match(self, client, create_task):
+        """Test that an update with the ETag of an older version fails without changing the task."""
+        task_id = create_task["id"]
+        etag = client.get(f"/api/tasks/{task_id}/").headers["ETag"]
+        client.put(f"/api/tasks/{task_id}/", data={"title": "First"}, content_type='application/json')
+
+        response = client.put(f"/api/tasks/{task_id}/", data={"title": "Second"},
+                              content_type='application/json', HTTP_IF_MATCH=etag)
+
+        assert response.status_code == 412  # HTTP 412 Precondition Failed
+        assert "error" in response.json()
+        assert client.get(f"/api/tasks/{task_id}/").json()["data"]["title"] == "First"
+
+    def test_if_match_of_other_task(self, client, create_task):
+        """Test that an ETag of another task or a malformed ETag is rejected."""
+        task_id = create_task["id"]
+
+        for etag in [f'"{task_id + 1}-1"', '"not-a-version"', f'{task_id}-1']:
+            response = client.put(f"/api/tasks/{task_id}/", data={"title": "Other"},
+                                  content_type='application/json', HTTP_IF_MATCH=etag)
+            assert response.status_code == 412  # HTTP 412 Precondition Failed
+
+    def test_if_match_missing_task(self, client):
+        """Test that a conditional update of a task that does not exist is not found."""
+        response = client.put("/api/tasks/999999/", data={"title": "Missing"},
+                              content_type='application/json', HTTP_IF_MATCH='"999999-1"')
+
+        assert response.status_code == 404  # HTTP 404 Not Found
+
+    def test_patch_updates_sent_fields(self, client, create_task):
+        """Test that PATCH only changes the fields in the request body."""
+        task_id = create_task["id"]
+
+        response = client.patch(f"/api/tasks/{task_id}/", data={"description": "Patched"},
+                                content_type='application/json')
+
+        assert response.status_code == 200  # HTTP 200 OK
+        assert response.json()["data"]["title"] == create_task["title"]
+        assert response.json()["data"]["description"] == "Patched"
+
+    def test_version_is_read_only(self, client, create_task):
+        """Test that a version in the request body is ignored."""
+        task_id = create_task["id"]
+
+        response = client.patch(f"/api/tasks/{task_id}/", data={"version": 100},
+                                content_type='application/json')
+
+        assert response.json()["data"]["version"] == create_task["version"] + 1
+
+    def test_prefer_return_minimal(self, client, create_task):
+        """Test that Prefer: return=minimal answers 204 with the ETag of the new version."""
+        task_id = create_task["id"]
+        etag = client.get(f"/api/tasks/{task_id}/").headers["ETag"]
+
+        response = client.patch(f"/api/tasks/{task_id}/", data={"title": "Minimal"}, content_type='application/json',
+                                HTTP_IF_MATCH=etag, HTTP_PREFER="return=minimal")
+
+        assert response.status_code == 204  # HTTP 204 No Content
+        assert response.content == b""
+        assert response.headers["Preference-Applied"] == "return=minimal"
+        fetched = client.get(f"/api/tasks/{task_id}/")
+        assert fetched.json()["data"]["title"] == "Minimal"
+        assert fetched.headers["ETag"] == response.headers["ETag"]
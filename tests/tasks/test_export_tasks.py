@@ -0,0 +1,33 @@
+import csv
+import io
+import json
+
+
+class TestExportTasks:
+    def test_export_ndjson(self, client, create_task):
+        """Test streaming all tasks as NDJSON."""
+        response = client.get("/api/tasks/export/")
+
+        assert response.status_code == 200  # HTTP 200 OK
+        assert response.streaming
+        assert response["Content-Type"] == "application/x-ndjson"
+        tasks = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        ids = [task['id'] for task in tasks]
+        assert create_task['id'] in ids
+        assert ids == sorted(ids)
+
+    def test_export_csv(self, client, create_task):
+        """Test streaming all tasks as CSV with a header row."""
+        response = client.get("/api/tasks/export/?file_format=csv")
+
+        assert response.status_code == 200  # HTTP 200 OK
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        assert {"id", "title", "description", "deleted", "created_at", "updated_at", "version"} == set(rows[0].keys())
+        assert str(create_task['id']) in [row['id'] for row in rows]
+
+    def test_export_invalid_format(self, client):
+        """Test case for when an unsupported export format is requested."""
+        response = client.get("/api/tasks/export/?file_format=xml")
+
+        assert response.status_code == 400  # HTTP 400 Bad Request
+        assert "error" in response.json()
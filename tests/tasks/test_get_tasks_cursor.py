@@ -0,0 +1,94 @@
+import json
+
+from common.utils import encode_cursor
+
+
+class TestGetTasksCursor:
+    def create_tasks(self, client, count):
+        ids = []
+        for index in range(count):
+            task_data = {"title": f"Cursor Task {index}", "description": "Cursor pagination task"}
+            response = client.post("/api/tasks/", data=json.dumps(task_data), content_type='application/json')
+            assert response.status_code == 201
+            ids.append(response.json()['data']['id'])
+        return ids
+
+    def test_cursor_first_page(self, client):
+        """Test that passing an empty cursor starts cursor pagination."""
+        self.create_tasks(client, 3)
+        response = client.get("/api/tasks/?cursor=&limit=2")
+
+        assert response.status_code == 200  # HTTP 200 OK
+        response_data = json.loads(response.content)
+        assert len(response_data['data']) == 2
+        assert response_data['next_cursor']  # More tasks follow
+
+    def test_cursor_walks_all_pages(self, client):
+        """Test that following next_cursor visits every task exactly once in order."""
+        created_ids = self.create_tasks(client, 5)
+        seen_ids = []
+        url = "/api/tasks/?ordering=-id&limit=2"
+        while True:
+            response_data = client.get(url).json()
+            seen_ids.extend(task['id'] for task in response_data['data'])
+            if not response_data['next_cursor']:
+                break
+            url = f"/api/tasks/?ordering=-id&limit=2&cursor={response_data['next_cursor']}"
+
+        assert seen_ids == sorted(seen_ids, reverse=True)
+        assert len(seen_ids) == len(set(seen_ids))
+        assert set(created_ids) <= set(seen_ids)
+
+    def test_cursor_created_at_ordering(self, client):
+        """Test paging by recency with the created_at, id ordering."""
+        self.create_tasks(client, 3)
+        first_page = client.get("/api/tasks/?ordering=-created_at&limit=2").json()
+        second_page = client.get(
+            f"/api/tasks/?ordering=-created_at&limit=2&cursor={first_page['next_cursor']}"
+        ).json()
+
+        first_ids = [task['id'] for task in first_page['data']]
+        second_ids = [task['id'] for task in second_page['data']]
+        assert not set(first_ids) & set(second_ids)
+        assert first_page['data'][-1]['created_at'] >= second_page['data'][0]['created_at']
+
+    def test_cursor_invalid(self, client):
+        """Test case for when a malformed cursor is provided."""
+        response = client.get("/api/tasks/?cursor=not-a-cursor")
+
+        assert response.status_code == 400  # HTTP 400 Bad Request
+        assert response.json()['error'] == "Invalid cursor"
+
+    def test_cursor_ordering_mismatch(self, client):
+        """Test case for when a cursor is reused with another ordering."""
+        self.create_tasks(client, 2)
+        first_page = client.get("/api/tasks/?ordering=id&limit=1").json()
+        response = client.get(f"/api/tasks/?ordering=-id&cursor={first_page['next_cursor']}")
+
+        assert response.status_code == 400  # HTTP 400 Bad Request
+
+    def test_cursor_invalid_ordering(self, client):
+        """Test case for when an unsupported ordering is provided."""
+        response = client.get("/api/tasks/?ordering=title")
+
+        assert response.status_code == 400  # HTTP 400 Bad Request
+        assert "ordering" in response.json()["error"][0]["loc"]
+
+    def test_cursor_values_must_match_ordering(self, client):
+        """Test that a cursor whose values do not fit the columns of its ordering is rejected before querying."""
+        for ordering, values in [("created_at", ["yesterday", 1]), ("created_at", [1]), ("id", [True]),
+                                 ("-id", ["1 OR 1=1"]), ("id", [1, 2])]:
+            response = client.get(f"/api/tasks/?ordering={ordering}&cursor={encode_cursor(ordering, values)}")
+
+            assert response.status_code == 400  # HTTP 400 Bad Request
+            assert response.json()['error'] == "Invalid cursor"
+
+    def test_limit_is_capped(self, client, settings):
+        """Test that a cursor page holds at most TASKS_PAGINATION['MAX_LIMIT'] tasks."""
+        settings.TASKS_PAGINATION = {'MAX_LIMIT': 2}
+        self.create_tasks(client, 3)
+
+        response_data = client.get("/api/tasks/?ordering=id&limit=1000").json()
+
+        assert len(response_data['data']) == 2
+        assert response_data['next_cursor']
@@ -0,0 +1,92 @@
+import json
+import uuid
+
+from common.utils import encode_cursor
+
+
+def create_tasks(client, *tasks):
+    """Create the given (title, description) tasks and return their IDs."""
+    task_ids = []
+    for title, description in tasks:
+        task_data = {"title": title, "description": description}
+        response = client.post("/api/tasks/", data=json.dumps(task_data), content_type='application/json')
+        task_ids.append(response.json()["data"]["id"])
+    return task_ids
+
+
+class TestSearchTasks:
+    def test_search_matches_title_and_description(self, client):
+        """Test that a search finds tasks by words in the title or the description."""
+        word = f"kw{uuid.uuid4().hex[:8]}"
+        title_id, description_id, _ = create_tasks(
+            client, (f"{word} in title", None), ("Other", f"mentions {word} here"), ("Unrelated", "nothing")
+        )
+
+        response = client.get("/api/tasks/", {"q": word})
+
+        assert response.status_code == 200  # HTTP 200 OK
+        assert sorted(task["id"] for task in response.json()["data"]) == sorted([title_id, description_id])
+
+    def test_search_prefix(self, client):
+        """Test that a term matches words starting with it."""
+        word = f"pre{uuid.uuid4().hex[:8]}"
+        task_id, = create_tasks(client, (f"Plan {word}suffix", None))
+
+        response = client.get("/api/tasks/", {"q": word})
+
+        assert [task["id"] for task in response.json()["data"]] == [task_id]
+
+    def test_search_relevance_order(self, client):
+        """Test that tasks matching more of the terms come first."""
+        first, second = f"a{uuid.uuid4().hex[:8]}", f"b{uuid.uuid4().hex[:8]}"
+        one_id, both_id = create_tasks(client, (f"{first} only", None), (f"{first} and {second}", None))
+
+        response = client.get("/api/tasks/", {"q": f"{first} {second}"})
+
+        assert [task["id"] for task in response.json()["data"]] == [both_id, one_id]
+
+    def test_search_cursor_pagination(self, client):
+        """Test that search results are paged with next_cursor without repeating tasks."""
+        word = f"pg{uuid.uuid4().hex[:8]}"
+        task_ids = create_tasks(client, *[(f"{word} {index}", None) for index in range(5)])
+
+        seen = []
+        params = {"q": word, "limit": 2}
+        while True:
+            body = client.get("/api/tasks/", params).json()
+            seen.extend(task["id"] for task in body["data"])
+            if not body["next_cursor"]:
+                break
+            params["cursor"] = body["next_cursor"]
+
+        assert seen == sorted(task_ids, reverse=True)  # Equal relevance, newest first
+
+    def test_search_escapes_wildcards(self, client):
+        """Test that LIKE wildcards in the query are matched literally."""
+        response = client.get("/api/tasks/", {"q": "%"})
+
+        assert response.status_code == 200  # HTTP 200 OK
+        assert all("%" in (task["title"] + (task["description"] or "")) for task in response.json()["data"])
+
+    def test_search_empty_query(self, client):
+        """Test that an empty search query is rejected."""
+        response = client.get("/api/tasks/", {"q": "  "})
+
+        assert response.status_code == 400  # HTTP 400 Bad Request
+
+    def test_search_invalid_cursor(self, client):
+        """Test that a cursor of another ordering is rejected."""
+        create_tasks(client, ("Cursor task", None), ("Cursor task", None))
+        cursor = client.get("/api/tasks/", {"ordering": "id", "limit": 1}).json()["next_cursor"]
+
+        response = client.get("/api/tasks/", {"q": "Cursor", "cursor": cursor})
+
+        assert response.status_code == 400  # HTTP 400 Bad Request
+
+    def test_search_cursor_values_must_match(self, client):
+        """Test that a relevance cursor without exactly a relevance and an id is rejected."""
+        for values in ([1.5], [1.5, 3, 4], ["high", 3], [1.5, None]):
+            response = client.get("/api/tasks/", {"q": "Cursor", "cursor": encode_cursor("relevance", values)})
+
+            assert response.status_code == 400  # HTTP 400 Bad Request
+            assert response.json()["error"] == "Invalid cursor"
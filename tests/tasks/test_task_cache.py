@@ -0,0 +1,56 @@
+import json
+
+from tasks.usecases import TaskUsecase
+from tasks.usecases.task_usecase import task_cache, task_cache_key
+
+
+class TestTaskCache:
+    def test_repeated_get_is_served_from_cache(self, client, create_task):
+        """Test that a second read of a task is a cache hit."""
+        task_id = create_task["id"]
+        client.get(f"/api/tasks/{task_id}/")
+        hits = task_cache.stats()["hits"]
+
+        response = client.get(f"/api/tasks/{task_id}/")
+
+        assert response.status_code == 200  # HTTP 200 OK
+        assert response.json()['data']['id'] == task_id
+        assert task_cache.stats()["hits"] == hits + 1
+
+    def test_update_writes_through(self, client, create_task):
+        """Test that a read after an update returns the updated task."""
+        task_id = create_task["id"]
+        client.get(f"/api/tasks/{task_id}/")
+        task_data = {"title": "Cached Task Updated", "description": "Updated"}
+        client.put(f"/api/tasks/{task_id}/", data=json.dumps(task_data), content_type='application/json')
+
+        response = client.get(f"/api/tasks/{task_id}/")
+
+        assert response.json()['data']['title'] == "Cached Task Updated"
+
+    def test_delete_invalidates(self, client, create_task):
+        """Test that a read after a delete does not return the cached task."""
+        task_id = create_task["id"]
+        client.get(f"/api/tasks/{task_id}/")
+        client.delete(f"/api/tasks/{task_id}/")
+
+        response = client.get(f"/api/tasks/{task_id}/")
+
+        assert response.status_code == 404  # HTTP 404 Not Found
+
+    def test_stale_read_does_not_overwrite_write(self, create_task):
+        """Test that a row read before a concurrent update does not replace the task the update cached."""
+        task_id = create_task["id"]
+        task_cache.delete(task_cache_key(task_id))
+        usecase = TaskUsecase()
+        read_task = usecase.task_db.get_task
+
+        def read_then_update(task_id):
+            stale = read_task(task_id=task_id)
+            usecase.write_tasks([{**create_task, "title": "Updated meanwhile", "version": stale.version + 1}])
+            return stale
+
+        usecase.task_db.get_task = read_then_update
+        assert usecase.load_task(task_id)["version"] == create_task["version"]
+
+        assert task_cache.get(task_cache_key(task_id))["title"] == "Updated meanwhile"
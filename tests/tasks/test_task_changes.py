@@ -0,0 +1,92 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from common.utils import encode_cursor
+
+
+@pytest.fixture
+def settled(settings):
+    """Serve changes right away instead of after the settle delay."""
+    settings.TASKS_CHANGES = {**settings.TASKS_CHANGES, 'SETTLE_SECONDS': 0}
+
+
+def drain(client, since=None, limit=100):
+    """Poll the change feed until it is caught up; return the changes and the cursor to poll with next."""
+    changes = []
+    while True:
+        response = client.get("/api/tasks/changes/", {"since": since or "", "limit": limit})
+        assert response.status_code == 200  # HTTP 200 OK
+        body = response.json()
+        changes += body["data"]
+        since = body["next_cursor"]
+        if not body["has_more"]:
+            return changes, since
+
+
+class TestTaskChanges:
+    def test_changes_since_cursor(self, client, settled):
+        """Test that creates, updates and deletions after the cursor are returned, deletions as tombstones."""
+        _, since = drain(client)
+        created = client.post("/api/tasks/", data=json.dumps({"title": "Synced"}), content_type='application/json').json()["data"]
+        updated = client.post("/api/tasks/", data=json.dumps({"title": "To update"}), content_type='application/json').json()["data"]
+        deleted = client.post("/api/tasks/", data=json.dumps({"title": "To delete"}), content_type='application/json').json()["data"]
+        client.patch(f"/api/tasks/{updated['id']}/", data={"title": "Updated"}, content_type='application/json')
+        client.delete(f"/api/tasks/{deleted['id']}/")
+
+        changes, since = drain(client, since)
+
+        by_id = {change["id"]: change for change in changes}
+        assert by_id[created["id"]]["title"] == "Synced"
+        assert by_id[updated["id"]]["title"] == "Updated"
+        assert by_id[deleted["id"]] == {"id": deleted["id"], "deleted": True, "updated_at": by_id[deleted["id"]]["updated_at"]}
+        assert drain(client, since)[0] == []
+
+    def test_resume_with_small_pages(self, client, settled):
+        """Test that paging through the feed returns every change once, in change order."""
+        _, since = drain(client)
+        task_ids = [
+            client.post("/api/tasks/", data=json.dumps({"title": f"Page {index}"}), content_type='application/json').json()["data"]["id"]
+            for index in range(5)
+        ]
+
+        changes, _ = drain(client, since, limit=2)
+
+        assert [change["id"] for change in changes] == task_ids
+
+    def test_unsettled_changes_are_held_back(self, client, settings):
+        """Test that changes younger than the settle delay are not returned yet."""
+        settings.TASKS_CHANGES = {**settings.TASKS_CHANGES, 'SETTLE_SECONDS': 0}
+        _, since = drain(client)
+        settings.TASKS_CHANGES = {**settings.TASKS_CHANGES, 'SETTLE_SECONDS': 3600}
+        client.post("/api/tasks/", data=json.dumps({"title": "Unsettled"}), content_type='application/json')
+
+        assert drain(client, since)[0] == []
+
+    def test_invalid_cursor(self, client):
+        """Test that a malformed cursor or a cursor of another ordering is rejected."""
+        assert client.get("/api/tasks/changes/?since=not-a-cursor").status_code == 400  # HTTP 400 Bad Request
+        other = encode_cursor("id", [1])
+        assert client.get(f"/api/tasks/changes/?since={other}").status_code == 400  # HTTP 400 Bad Request
+
+    def test_tampered_cursor(self, client):
+        """Test that a changes cursor whose values are not an updated_at and an id is rejected."""
+        cursors = [encode_cursor("changes", values)
+                   for values in (["yesterday", 1], [1], [datetime(2030, 1, 1), 1, 2], [datetime(2030, 1, 1), "1"])]
+        payload = json.dumps({"o": "changes", "v": [{"dt": "yesterday"}, 1]}).encode()
+        cursors.append(base64.urlsafe_b64encode(payload).decode().rstrip("="))
+        for since in cursors:
+            response = client.get(f"/api/tasks/changes/?since={since}")
+
+            assert response.status_code == 400  # HTTP 400 Bad Request
+            assert response.json()["error"] == "Invalid cursor"
+
+    def test_expired_cursor(self, client):
+        """Test that a cursor older than the retention of deleted tasks asks for a full resync."""
+        since = encode_cursor("changes", [datetime(2000, 1, 1), 0])
+        response = client.get(f"/api/tasks/changes/?since={since}")
+
+        assert response.status_code == 410  # HTTP 410 Gone
+        assert "error" in response.json()